@@ -1,13 +1,28 @@
 import time
 import random
 
+from bitboard import STANDARD, board_geometry
+from search_stats import SearchStats
+
 class Agent:
-    def __init__(self, env, player_name=None):
+    # Approfondissement itératif borné par time_limit
+    stochastic = False
+    time_dependent = True
+
+    def __init__(self, env, player_name=None, collect_stats=False, tracer=None, connect=4):
         self.env = env
+        self.player_name = player_name or "Agent"
         self.time_limit = 0.95  
         self.transposition_table = {}
         self.start_time = 0
-        self.column_order = [3, 2, 4, 1, 5, 0, 6]
+        # Nombre de pions à aligner ; la taille du plateau vient de l'observation
+        self.connect = connect
+        self._geometry = STANDARD
+        # Statistiques de recherche (None = désactivées, aucun coût)
+        self.stats = SearchStats() if collect_stats else None
+        # Traceur échantillonné de l'arbre de recherche (voir search_trace)
+        self.tracer = tracer
+        self._trace = None
 
         
     def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
@@ -17,23 +32,34 @@ class Agent:
         """
         self.start_time = time.time()
         self.transposition_table = {} 
+        if self.stats is not None:
+            self.stats.reset()
         
         # 1. Conversion de l'observation en Bitboards
         # channel 0 = current player, channel 1 = opponent
         obs = observation['observation'] if isinstance(observation, dict) else observation
-        mask = action_mask if action_mask is not None else [1]*7
+        self._geometry = board_geometry(obs.shape[0], obs.shape[1], self.connect)
+        mask = action_mask if action_mask is not None else [1] * self._geometry.cols
         
         position, mask_board = self._numpy_to_bitboard(obs)
+        if self.tracer is not None:
+            self._trace = self.tracer.sample(self.player_name, bin(mask_board).count('1'))
         
         # 2. Recherche avec approfondissement itératif (Iterative Deepening)
         best_move = self._iterative_deepening(position, mask_board, mask)
         
+        if self.stats is not None:
+            self.stats.stop()
         return best_move
 
+    def get_stats(self):
+        """Statistiques du dernier choose_action sous forme de dict ({} si désactivées)."""
+        return self.stats.as_dict() if self.stats is not None else {}
+
     def _numpy_to_bitboard(self, obs):
         """
         Convertit la grille numpy (6, 7, 2) en deux entiers
-        Connect 4 est 7 colonnes x 6 lignes.
+        Connect 4 est 7 colonnes x 6 lignes (autres tailles : rows + 1 bits par colonne).
         Bitboard format: 
         .  .  .  .  .  .  .
         5 12 19 26 33 40 47
@@ -51,17 +77,18 @@ class Agent:
         # obs[:, :, 1] est l'adversaire
         current_player_grid = obs[:, :, 0]
         opponent_grid = obs[:, :, 1]
+        rows, cols, h1 = self._geometry.rows, self._geometry.cols, self._geometry.h1
        
-        for col in range(7):
-            for row in range(6):
+        for col in range(cols):
+            for row in range(rows):
                 # Calcul de l'index dans le bitboard
                 # Chaque colonne prend 7 bits (6 cases + 1 buffer pour éviter les débordements horizontaux)
-                bit_index = col * 7 + row
+                bit_index = col * h1 + row
                 
-                if current_player_grid[5-row][col] == 1: 
+                if current_player_grid[rows-1-row][col] == 1: 
                     position |= (1 << bit_index)
                     mask_board |= (1 << bit_index)
-                elif opponent_grid[5-row][col] == 1:
+                elif opponent_grid[rows-1-row][col] == 1:
                     mask_board |= (1 << bit_index)
                     
         return position, mask_board
@@ -78,20 +105,26 @@ class Agent:
             return valid_moves[0]
             
         # Trier les coups pour prioriser le centre dès le début
-        valid_moves.sort(key=lambda x: abs(x - 3))
+        valid_moves.sort(key=self._geometry.center_order.index)
         best_move = valid_moves[0]
         
-        # Profondeur maximale théorique (42 cases)
-        max_depth = 42 
+        # Profondeur maximale théorique (42 cases sur le plateau standard)
+        max_depth = self._geometry.size
         
         for depth in range(1, max_depth + 1):
             if time.time() - self.start_time > self.time_limit:
                 break
                 
+            if self._trace is not None:
+                self._trace.begin(depth)
             try:
                 # Appel à Negamax
                 # Scores attendus entre -42 et 42 (victoire rapide = score haut)
                 score, move = self._negamax(position, mask, depth, -float('inf'), float('inf'), valid_moves)
+                if self._trace is not None:
+                    self._trace.end(completed=True)
+                if self.stats is not None:
+                    self.stats.max_depth = depth
                 
                 # Si on trouve une victoire forcée, on arrête et on joue
                 if score >= 40: # Victoire quasi certaine
@@ -101,6 +134,8 @@ class Agent:
                     best_move = move
                     
             except TimeoutError:
+                if self._trace is not None:
+                    self._trace.end(completed=False)
                 break
                 
         return best_move
@@ -113,6 +148,11 @@ class Agent:
         # Vérification du temps
         if self._check_timeout():
             raise TimeoutError()
+        if self.stats is not None:
+            self.stats.nodes += 1
+        trace = self._trace
+        if trace is not None:
+            trace.node(depth)
             
         state_key = (position, mask)
         
@@ -124,26 +164,33 @@ class Agent:
         # Vérification victoire immédiate (si nous venons de jouer un coup gagnant avant l'appel récursif, 
         
         if depth == 0:
+            if self.stats is not None:
+                self.stats.leaf_evals += 1
             return self._evaluate_heuristic(position, mask), None
 
         # Générer les coups possibles via bitboards
         # Un coup est possible si la colonne n'est pas pleine (top bit non set)
+        geometry = self._geometry
+        tops = geometry.tops
+        has_won = geometry.has_won  # _check_win_bitboard sans l'appel intermédiaire
         possible_moves = []
-        for col in self.column_order:
+        for col in geometry.center_order:
             if col in valid_moves:
                 # Vérifier si colonne jouable bitboard 
                 # Mask indique les cases occupées. 
-                # Si (mask & (1 << (col*7 + 5))) == 0, alors il y a de la place.
-                if (mask & (1 << (col * 7 + 5))) == 0:
+                # Si la case du haut (bit tops[col] - 1, col*7 + 5 en 6 x 7) est libre, il y a de la place.
+                if (mask & (1 << (tops[col] - 1))) == 0:
                     possible_moves.append(col)
         
         if not possible_moves:
             return 0, None # Match nul ou pas de coups
+        if trace is not None:
+            trace.expand(depth, len(possible_moves))
 
         best_score = -float('inf')
         best_move = possible_moves[0]
         
-        for col in possible_moves:
+        for index, col in enumerate(possible_moves):
             # Faire le coup
             # Le coup consiste à ajouter un bit au-dessus du top bit actuel de la colonne dans le mask
             # mask | (mask + (1 << (col*7)))
@@ -151,21 +198,22 @@ class Agent:
             
             # (mask + bottom_mask(col)) & column_mask(col)
             
+            bottom = col * geometry.h1
             height = 0
-            for r in range(6):
-                if (mask >> (col*7 + r)) & 1:
+            for r in range(geometry.rows):
+                if (mask >> (bottom + r)) & 1:
                     height += 1
                 else:
                     break
             
             # Bit à jouer
-            played_bit = 1 << (col*7 + height)
+            played_bit = 1 << (bottom + height)
             
             new_position = position ^ played_bit # Le joueur actuel joue
             new_mask = mask | played_bit
             
             # Vérifier si ce coup gagne
-            if self._check_win_bitboard(new_position):
+            if has_won(new_position):
                 return 100 + depth, col # Victoire préférée si rapide (+depth)
             
             # Appel récursif
@@ -186,29 +234,18 @@ class Agent:
                 
             alpha = max(alpha, score)
             if alpha >= beta:
+                if self.stats is not None:
+                    self.stats.cutoff(index)
+                if trace is not None:
+                    trace.cutoff(depth, index)
                 break # Élagage
                 
         return best_score, best_move
 
     def _check_win_bitboard(self, pos):
-        """Vérifie s'il y a 4 alignés dans le bitboard 'pos'."""
-        # Horizontal
-        m = pos & (pos >> 7)
-        if m & (m >> 14): return True
-        
-        # Diagonal \
-        m = pos & (pos >> 6)
-        if m & (m >> 12): return True
-        
-        # Diagonal /
-        m = pos & (pos >> 8)
-        if m & (m >> 16): return True
-        
-        # Vertical
-        m = pos & (pos >> 1)
-        if m & (m >> 2): return True
-        
-        return False
+        """Vérifie s'il y a `connect` pions alignés dans le bitboard 'pos'."""
+        # Décalages dérivés de la géométrie : (1, 2), (7, 14), (6, 12), (8, 16) pour le 6 x 7
+        return self._geometry.has_won(pos)
 
     def _evaluate_heuristic(self, position, mask):
         """
@@ -218,8 +255,8 @@ class Agent:
         score = 0
         opponent = mask ^ position
         
-        # Colonne centrale (3)
-        center_col = (position >> (3*7)) & 0x3F
+        # Colonne centrale (3 sur le plateau standard)
+        center_col = position & self._geometry.center_mask
         score += bin(center_col).count('1') * 3
         
         # Un vrai solveur utiliserait ici des masques pour compter les 'menaces' (3 alignés + vide)
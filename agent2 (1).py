@@ -2,210 +2,336 @@
 Ultra-Optimized Hybrid Smart Agent for Connect Four
 Rule-based + Adaptive Minimax + Mini MCTS
 Optimized for top ranking on ML-Arena
+
+Minimax and Mini-MCTS both run on a single BitBoard with make/unmake,
+so no board is allocated per node or per rollout.
 """
 
 import random
-import numpy as np
 import math
+import time
 
-ROWS = 6
-COLS = 7
+from bitboard import BitBoard, completes_line
+from search_stats import SearchStats
+
+WIN_SCORE = 1000
+MCTS_SCALE = 5  # taux de victoire des rollouts ramené à l'échelle historique (5 rollouts par colonne)
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the minimax share of the move time is spent."""
+
+
+# Puits des rapports de répartition du temps : sink(player_name, report) après chaque coup chronométré
+REPORT_SINKS = []
 
-# ===============================
-# Vectorized Win Checks
-# ===============================
 
-def check_horizontal_wins(board, channel):
-    for row in range(ROWS):
-        row_slice = board[row, :, channel]
-        for col in range(COLS - 3):
-            if np.sum(row_slice[col:col+4]) == 4:
-                return True
-    return False
-
-def check_vertical_wins(board, channel):
-    for col in range(COLS):
-        col_slice = board[:, col, channel]
-        for row in range(ROWS - 3):
-            if np.sum(col_slice[row:row+4]) == 4:
-                return True
-    return False
-
-def check_diagonal_down(board, channel):
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            if np.sum([board[row+i, col+i, channel] for i in range(4)]) == 4:
-                return True
-    return False
-
-def check_diagonal_up(board, channel):
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            if np.sum([board[row-i, col+i, channel] for i in range(4)]) == 4:
-                return True
-    return False
-
-def check_win_optimized(board, channel):
-    return (
-        check_horizontal_wins(board, channel) or
-        check_vertical_wins(board, channel) or
-        check_diagonal_down(board, channel) or
-        check_diagonal_up(board, channel)
-    )
+def loguru_report_sink(player_name, report):
+    """Sink logging a time split report through loguru (DEBUG)."""
+    from loguru import logger
+    logger.debug("{}: time split {}", player_name, report)
+
+
+def enable_report_logs():
+    """Log the time split of every anytime move (off by default: loguru is slow to import)."""
+    if loguru_report_sink not in REPORT_SINKS:
+        REPORT_SINKS.append(loguru_report_sink)
+
+
+def disable_report_logs():
+    if loguru_report_sink in REPORT_SINKS:
+        REPORT_SINKS.remove(loguru_report_sink)
+
 
 # ===============================
 # Ultra-Optimized Hybrid Agent
 # ===============================
 
 class Agent:
-    def __init__(self, env, player_name=None):
+    stochastic = True  # simulations MCTS aléatoires
+
+    @property
+    def time_dependent(self):
+        return self.time_limit is not None
+
+    def __init__(self, env, player_name=None, time_limit=None, collect_stats=False, connect=4):
+        """
+        Parameters:
+            env: PettingZoo environment (optional)
+            player_name: Optional name for the agent
+            time_limit: seconds per move. None keeps the fixed depth / fixed
+                rollouts search; otherwise the anytime scheduler is used.
+            collect_stats: fill a SearchStats on every choose_action (see get_stats)
+            connect: pieces to align (the board size comes from the observation)
+        """
         self.env = env
         self.player_name = player_name or "UltraOptHybrid"
+        self.connect = connect
 
         # Minimax & MCTS parameters
-        self.minimax_depth = 3
-        self.mcts_simulations = 15
+        self.minimax_depth = 5
+        self.mcts_simulations = 50
+        self.rollout_length = 10
         self.alpha = 0.7
         self.beta = 0.3
 
+        # Anytime scheduler parameters
+        self.time_limit = time_limit
+        self.minimax_share = 0.6   # part du temps réservée à l'approfondissement itératif
+        self.mcts_candidates = 4   # colonnes gardées pour le successive halving
+        self.last_report = None
+        self._deadline = None
+        self._nodes = 0
+        self.stats = SearchStats() if collect_stats else None
+
         if env is not None:
             self.action_space = env.action_space(env.agents[0])
 
     def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
-        board = observation
-        valid_actions = [i for i, valid in enumerate(action_mask) if valid==1]
+        if self.stats is not None:
+            self.stats.reset()
+        action = self._choose_action(observation, action_mask)
+        if self.stats is not None:
+            self.stats.stop()
+        return action
+
+    def get_stats(self):
+        """Statistics of the last choose_action call as a dict ({} if collect_stats is off)."""
+        return self.stats.as_dict() if self.stats is not None else {}
+
+    def _choose_action(self, observation, action_mask):
+        state = BitBoard.from_observation(observation, self.connect)
+        valid_actions = [i for i, valid in enumerate(action_mask) if valid==1 and state.can_play(i)]
+        if not valid_actions:
+            return random.choice([i for i, valid in enumerate(action_mask) if valid==1])
 
         # --- 1. Victory / block check ---
-        for ch in [0, 1]:
-            for col in valid_actions:
-                row = self._get_next_row(board, col)
-                if row is None:
-                    continue
-                board[row, col, ch] = 1
-                if check_win_optimized(board, ch):
-                    board[row, col, ch] = 0
-                    return col
-                board[row, col, ch] = 0
+        for col in valid_actions:
+            if state.is_winning_move(col):
+                return col
+        for col in valid_actions:
+            if state.is_opponent_winning_move(col):
+                return col
 
         # --- 2. Safe actions (no double threat) ---
-        safe_actions = [c for c in valid_actions if not self._creates_double_threat(board, c, 1)]
+        safe_actions = [c for c in valid_actions if not self._creates_double_threat(state, c)]
         if not safe_actions:
             safe_actions = valid_actions
 
         # --- 3. Evaluate with Minimax + Mini-MCTS ---
+        root_player = state.ply & 1
+        if self.time_limit is not None:
+            return self._anytime_search(state, safe_actions, root_player)
+
         scores = {}
         for col in safe_actions:
-            row = self._get_next_row(board, col)
-            if row is None:
-                continue
-            board_copy = board.copy()
-            board_copy[row, col, 0] = 1
+            state.play(col)
+            minimax_score = self._minimax(state, self.minimax_depth, False, -10000, 10000, root_player)
+            wins = self._simulate_mcts(state, self.mcts_simulations, root_player)
+            state.undo()
 
-            minimax_score = self._minimax(board_copy, self.minimax_depth, False, -10000, 10000)
-            mcts_score = self._simulate_mcts(board, col, 5)  # only 5 short simulations for speed
-
-            scores[col] = self.alpha * minimax_score + self.beta * mcts_score
+            scores[col] = self._blend(minimax_score, wins, self.mcts_simulations)
 
+        if self.stats is not None:
+            self.stats.max_depth = self.minimax_depth + 1
         return max(scores, key=scores.get)
 
     # Alias
     def act(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
         return self.choose_action(observation, reward, terminated, truncated, info, action_mask)
 
+    # ===============================
+    # Anytime scheduler
+    # ===============================
+    def _anytime_search(self, state, candidates, root_player):
+        """
+        Spend the move time in two phases: iterative deepening minimax on
+        every candidate, then successive-halving rollouts on the best ones
+        with whatever time is left. The split is stored in self.last_report
+        and handed to the REPORT_SINKS (see enable_report_logs).
+        """
+        start = time.time()
+        deadline = start + self.time_limit
+        self._deadline = start + self.time_limit * self.minimax_share
+        self._nodes = 0
+
+        # --- Phase 1: iterative deepening ---
+        minimax_scores = {col: 0 for col in candidates}
+        depth_reached = 0
+        empties = state.geometry.size - state.ply
+        iteration_times = []
+        base_ply = state.ply
+        for depth in range(empties):
+            iter_start = time.time()
+            if iteration_times:
+                # Estimer la prochaine itération avec le facteur de branchement observé
+                growth = 4.0
+                if len(iteration_times) > 1 and iteration_times[-2] > 0:
+                    growth = iteration_times[-1] / iteration_times[-2]
+                if iter_start + iteration_times[-1] * growth > self._deadline:
+                    break
+            try:
+                scores = {}
+                for col in candidates:
+                    state.play(col)
+                    scores[col] = self._minimax(state, depth, False, -10000, 10000, root_player)
+                    state.undo()
+            except SearchTimeout:
+                # Itération interrompue : défaire les coups restés sur la pile
+                while state.ply > base_ply:
+                    state.undo()
+                break
+            minimax_scores = scores
+            depth_reached = depth + 1
+            if self.stats is not None:
+                self.stats.max_depth = depth_reached
+            iteration_times.append(time.time() - iter_start)
+            if max(scores.values()) >= WIN_SCORE:
+                break  # victoire forcée : pas besoin de rollouts
+        self._deadline = None
+        minimax_time = time.time() - start
+
+        ranked = sorted(candidates, key=lambda c: minimax_scores[c], reverse=True)
+        # Les coups perdants forcés ne méritent pas de rollouts
+        survivors = [c for c in ranked if minimax_scores[c] > -WIN_SCORE] or ranked
+        survivors = survivors[:self.mcts_candidates]
+
+        # --- Phase 2: successive halving on the top candidates ---
+        mcts_start = time.time()
+        wins = {col: 0 for col in survivors}
+        playouts = {col: 0 for col in survivors}
+        rounds = max(1, math.ceil(math.log2(len(survivors)))) if len(survivors) > 1 else 0
+        if minimax_scores[ranked[0]] >= WIN_SCORE:
+            rounds = 0
+        for round_index in range(rounds):
+            round_deadline = mcts_start + (deadline - mcts_start) * (round_index + 1) / rounds
+            while time.time() < round_deadline:
+                for col in survivors:
+                    state.play(col)
+                    wins[col] += self._simulate_mcts(state, 1, root_player)
+                    state.undo()
+                    playouts[col] += 1
+            if len(survivors) > 1:
+                survivors.sort(key=lambda c: self._blend(minimax_scores[c], wins[c], playouts[c]), reverse=True)
+                survivors = survivors[:max(1, len(survivors) // 2)]
+        mcts_time = time.time() - mcts_start
+
+        best = max(survivors, key=lambda c: self._blend(minimax_scores[c], wins[c], playouts[c]))
+        self.last_report = {
+            "move": best,
+            "time_limit": self.time_limit,
+            "minimax_time": minimax_time,
+            "mcts_time": mcts_time,
+            "depth_reached": depth_reached,
+            "minimax_nodes": self._nodes,
+            "playouts": sum(playouts.values()),
+            "mcts_candidates": len(playouts),
+        }
+        for sink in REPORT_SINKS:
+            sink(self.player_name, self.last_report)
+        return best
+
+    def _blend(self, minimax_score, wins, playouts):
+        # Le poids des rollouts ne dépend pas de leur nombre : seul le taux de victoire compte
+        rate = wins / playouts if playouts else 0.0
+        return self.alpha * minimax_score + self.beta * rate * MCTS_SCALE
+
     # ===============================
     # Helper methods
     # ===============================
-    def _get_next_row(self, board, col):
-        for row in range(ROWS-1, -1, -1):
-            if board[row, col, 0] == 0 and board[row, col, 1] == 0:
-                return row
-        return None
-
-    def _creates_double_threat(self, board, col, channel):
-        row = self._get_next_row(board, col)
-        if row is None:
-            return False
-        board[row, col, channel] = 1
+    def _creates_double_threat(self, state, col):
+        """
+        True if the opponent playing col would leave it two winning replies.
+        """
+        opp = state.opponent | (1 << state.heights[col])
+        tops, lines_through = state.tops, state.lines_through
         threat_count = 0
-        for c in range(COLS):
-            r = self._get_next_row(board, c)
-            if r is not None:
-                board[r, c, channel] = 1
-                if check_win_optimized(board, channel):
-                    threat_count += 1
-                board[r, c, channel] = 0
-        board[row, col, channel] = 0
+        for c in state.geometry.columns:
+            bit = state.heights[c] + (c == col)
+            if bit < tops[c] and completes_line(opp, bit, lines_through):
+                threat_count += 1
         return threat_count >= 2
 
     # ===============================
     # Minimax + alpha-beta pruning
     # ===============================
-    def _minimax(self, board, depth, maximizing, alpha, beta):
+    def _minimax(self, state, depth, maximizing, alpha, beta, root_player):
+        stats = self.stats
+        if stats is not None:
+            stats.nodes += 1
+        if self._deadline is not None:
+            self._nodes += 1
+            if not self._nodes & 255 and time.time() > self._deadline:
+                raise SearchTimeout()
         if depth == 0:
-            return self._evaluate_board(board)
-        valid_actions = [c for c in range(COLS) if self._get_next_row(board, c) is not None]
+            if stats is not None:
+                stats.leaf_evals += 1
+            return self._evaluate_board(state, root_player)
+        valid_actions = state.legal_moves(state.geometry.columns)
+        if not valid_actions:
+            return 0  # plateau plein : match nul
         if maximizing:
             max_eval = -math.inf
-            for col in valid_actions:
-                row = self._get_next_row(board, col)
-                board_copy = board.copy()
-                board_copy[row, col, 0] = 1
-                if check_win_optimized(board_copy, 0):
-                    return 1000
-                eval = self._minimax(board_copy, depth-1, False, alpha, beta)
+            for index, col in enumerate(valid_actions):
+                state.play(col)
+                if state.last_move_wins():
+                    state.undo()
+                    return WIN_SCORE
+                eval = self._minimax(state, depth-1, False, alpha, beta, root_player)
+                state.undo()
                 max_eval = max(max_eval, eval)
                 alpha = max(alpha, eval)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(index)
                     break
             return max_eval
         else:
             min_eval = math.inf
-            for col in valid_actions:
-                row = self._get_next_row(board, col)
-                board_copy = board.copy()
-                board_copy[row, col, 1] = 1
-                if check_win_optimized(board_copy, 1):
-                    return -1000
-                eval = self._minimax(board_copy, depth-1, True, alpha, beta)
+            for index, col in enumerate(valid_actions):
+                state.play(col)
+                if state.last_move_wins():
+                    state.undo()
+                    return -WIN_SCORE
+                eval = self._minimax(state, depth-1, True, alpha, beta, root_player)
+                state.undo()
                 min_eval = min(min_eval, eval)
                 beta = min(beta, eval)
                 if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(index)
                     break
             return min_eval
 
-    def _evaluate_board(self, board):
-        score = 0
-        center_col = COLS//2
-        for r in range(ROWS):
-            for c in range(COLS):
-                if board[r, c, 0] == 1:
-                    score += 3 if c == center_col else 1
-                elif board[r, c, 1] == 1:
-                    score -= 3 if c == center_col else 1
-        return score
+    def _evaluate_board(self, state, root_player):
+        # +1 par pion, +3 dans la colonne centrale
+        center = state.geometry.center_mask
+        me = state.stones[root_player]
+        opp = state.stones[root_player ^ 1]
+        return (me.bit_count() + 2 * (me & center).bit_count()
+                - opp.bit_count() - 2 * (opp & center).bit_count())
 
     # ===============================
     # Mini-MCTS simulation (short)
     # ===============================
-    def _simulate_mcts(self, board, col, simulations):
+    def _simulate_mcts(self, state, simulations, root_player):
+        """Random playouts from `state`, undone in place; counts root player wins."""
         wins = 0
+        if self.stats is not None:
+            self.stats.playouts += simulations
+        columns = state.geometry.columns
         for _ in range(simulations):
-            board_copy = board.copy()
-            row = self._get_next_row(board_copy, col)
-            if row is None:
-                continue
-            board_copy[row, col, 0] = 1
-            player = 1
-            for _ in range(10):
-                valid_moves = [c for c in range(COLS) if self._get_next_row(board_copy, c) is not None]
+            played = 0
+            for _ in range(self.rollout_length):
+                valid_moves = state.legal_moves(columns)
                 if not valid_moves:
                     break
-                move = random.choice(valid_moves)
-                r = self._get_next_row(board_copy, move)
-                board_copy[r, move, player] = 1
-                if check_win_optimized(board_copy, player):
-                    if player == 0:
+                state.play(random.choice(valid_moves))
+                played += 1
+                if state.last_move_wins():
+                    if state.ply & 1 != root_player:
                         wins += 1
                     break
-                player = 1 - player
+            for _ in range(played):
+                state.undo()
         return wins
@@ -0,0 +1,118 @@
+"""
+Agent registry
+
+Builds agents from short text specs so that command line tools and worker
+processes can describe an agent without pickling it:
+
+    "smart"                      SmartAgent
+    "random"                     RandomAgent
+    "minimax:depth=6"            MinimaxAgent(depth=6)
+    "minimax:depth=42,time_limit=0.1"
+    "hybrid:time_limit=0.2"      hybrid Agent of agent2
+    "search:time_limit=0.1"      agent.Agent (bitboard negamax)
+    "mcts:time_limit=0.1"        MCTSAgent
+    "minimax:depth=6,connect=5"  connect-5 variant (board size comes from the observation)
+
+Extra keyword arguments passed to make_agent (player_name, collect_stats, tracer)
+override the spec.
+
+Agent modules stay cheap to import, which matters for short-lived worker
+processes: no agent module imports numpy or loguru at import time (the
+referee's board is the only numpy user on the hot path, and loguru is an
+optional log sink). `python benchmark.py startup` measures time to first
+move and checks this against HEAVY_MODULES.
+"""
+
+import importlib
+import sys
+
+# nom -> (module, classe, paramètres acceptés par le constructeur)
+AGENTS = {
+    "smart": ("smart_agent", "SmartAgent", ("player_name", "connect")),
+    "random": ("random_agent", "RandomAgent", ("player_name",)),
+    "minimax": ("minimax_agent", "MinimaxAgent",
+                ("player_name", "depth", "time_limit", "collect_stats", "tracer", "connect")),
+    "hybrid": ("agent2", "Agent", ("player_name", "time_limit", "collect_stats", "connect")),
+    "search": ("agent", "Agent", ("player_name", "collect_stats", "tracer", "connect")),
+    "mcts": ("mcts_agent", "MCTSAgent", ("player_name", "time_limit", "collect_stats", "connect")),
+}
+
+# Agents dont le constructeur exige l'argument env
+NEEDS_ENV = {"smart", "hybrid", "search"}
+
+# Arguments ignorés par les agents qui n'en ont pas l'usage (RandomAgent et connect...)
+OPTIONAL_ARGUMENTS = {"collect_stats", "tracer", "connect"}
+
+# Modules lourds qu'importer un agent ne doit pas charger
+HEAVY_MODULES = ("numpy", "loguru")
+
+
+def silence_logs():
+    """Drop the loguru handlers if loguru is loaded; never imports it."""
+    loguru = sys.modules.get("loguru")
+    if loguru is not None:
+        loguru.logger.remove()
+
+
+def parse_value(text):
+    """Spec value as int, float, bool or None when it parses as one, else str."""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    if text in ("True", "False", "None"):
+        return {"True": True, "False": False, "None": None}[text]
+    return text
+
+
+def parse_spec(spec):
+    """
+    Split "name:key=value,key=value" into (name, {key: value}).
+    """
+    name, _, params = spec.partition(":")
+    kwargs = {}
+    for item in filter(None, params.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Bad parameter {item!r} in agent spec {spec!r}")
+        kwargs[key.strip()] = parse_value(value.strip())
+    if name not in AGENTS:
+        raise ValueError(f"Unknown agent {name!r}; choose from {sorted(AGENTS)}")
+    return name, kwargs
+
+
+def make_agent(spec, **overrides):
+    """
+    Build an agent from its spec.
+
+    Parameters:
+        spec: agent spec string (see module docstring)
+        overrides: keyword arguments taking precedence over the spec;
+            arguments the agent does not support (e.g. collect_stats or
+            tracer for SmartAgent, connect for RandomAgent) are dropped
+
+    Returns:
+        agent instance
+    """
+    name, kwargs = parse_spec(spec)
+    kwargs.update(overrides)
+    module_name, class_name, accepted = AGENTS[name]
+    cls = getattr(importlib.import_module(module_name), class_name)
+
+    # agent.Agent fixe son budget en attribut et non en paramètre
+    attributes = {}
+    if name == "search" and "time_limit" in kwargs:
+        attributes["time_limit"] = kwargs.pop("time_limit")
+
+    unknown = set(kwargs) - set(accepted) - OPTIONAL_ARGUMENTS
+    if unknown:
+        raise ValueError(f"Agent {name!r} does not accept {sorted(unknown)}")
+    kwargs = {k: v for k, v in kwargs.items() if k in accepted}
+    kwargs.setdefault("player_name", spec)
+    if name in NEEDS_ENV:
+        kwargs["env"] = None
+    agent = cls(**kwargs)
+    for key, value in attributes.items():
+        setattr(agent, key, value)
+    return agent
@@ -0,0 +1,282 @@
+"""
+Long-lived agent server
+
+Agents are imported once per worker process and answer move requests for
+many concurrent games. Each game keeps its own agent instance (and with
+it whatever the agent caches between moves) in the worker that owns the
+game; the least recently used games are evicted beyond `capacity`.
+
+Protocol: one JSON object per line, over a Unix socket or stdin/stdout.
+
+    {"id": 7, "game": "g42", "agent": "search:time_limit=0.1", "moves": [3, 3, 4]}
+        -> {"id": 7, "game": "g42", "action": 2, "elapsed": 0.1003}
+    {"id": 8, "op": "end", "game": "g42"}          forget the game
+        -> {"id": 8, "game": "g42", "ended": true}
+    {"id": 9, "op": "stats"}
+        -> {"id": 9, "requests": 123, "games": [12, 9]}   live games per worker
+
+"moves" is the column sequence played since the start of the game; the
+agent sees the position from the side to move. Errors are answered as
+{"id": ..., "error": "message"}. Requests are handled concurrently, so
+answers may come back out of order: clients match them by "id".
+
+Games are sharded over the workers by a hash of the game id, so the moves
+of one game always reach the process holding its agent, while searches of
+games on different shards run in parallel.
+
+Usage:
+    python agent_server.py --unix /tmp/connect4.sock --workers 4
+    python agent_server.py --stdio < requests.jsonl
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from agent_registry import AGENTS, make_agent, silence_logs
+from game_record import replay
+
+DEFAULT_CAPACITY = 256
+
+
+# ------------------------------------------------------------------
+# Processus de travail (un par shard)
+# ------------------------------------------------------------------
+
+_games = OrderedDict()  # id de partie -> (spec, agent), du plus ancien au plus récent
+_capacity = DEFAULT_CAPACITY
+
+
+def _init_shard(capacity):
+    global _capacity
+    silence_logs()  # pas de log par coup dans les workers
+    _capacity = capacity
+    # Charger une fois pour toutes les modules des agents (numpy via le referee, tables)
+    for module_name, _, _ in AGENTS.values():
+        importlib.import_module(module_name)
+
+
+def choose_move(game, spec, moves):
+    """
+    Move of the agent `spec` for game `game` after `moves`.
+
+    Returns:
+        (action, seconds spent in choose_action)
+    """
+    entry = _games.get(game)
+    if entry is None or entry[0] != spec:
+        entry = (spec, make_agent(spec))
+        _games[game] = entry
+        while len(_games) > _capacity:
+            _games.popitem(last=False)
+    else:
+        _games.move_to_end(game)
+
+    referee = replay(moves)
+    if referee.is_over():
+        raise ValueError(f"game {game} is already over")
+    start = time.perf_counter()
+    action = entry[1].choose_action(referee.view(), action_mask=referee.action_mask())
+    return int(action), time.perf_counter() - start
+
+
+def end_game(game):
+    return _games.pop(game, None) is not None
+
+
+def live_games():
+    return len(_games)
+
+
+# ------------------------------------------------------------------
+# Serveur
+# ------------------------------------------------------------------
+
+class AgentServer:
+    """
+    Dispatches requests to single-process executors, one per shard.
+    """
+
+    def __init__(self, workers=2, capacity=DEFAULT_CAPACITY):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.shards = [ProcessPoolExecutor(max_workers=1, initializer=_init_shard, initargs=(capacity,))
+                       for _ in range(workers)]
+        self.requests = 0
+
+    def _shard(self, game):
+        return self.shards[zlib.crc32(str(game).encode()) % len(self.shards)]
+
+    async def handle(self, message):
+        """
+        Answer one decoded request (see the module docstring).
+
+        Returns:
+            the response dict
+        """
+        loop = asyncio.get_running_loop()
+        request_id = message.get("id")
+        self.requests += 1
+        try:
+            op = message.get("op", "move")
+            if op == "stats":
+                games = await asyncio.gather(*(loop.run_in_executor(s, live_games) for s in self.shards))
+                return {"id": request_id, "requests": self.requests, "games": list(games)}
+            game = message["game"]
+            if op == "end":
+                ended = await loop.run_in_executor(self._shard(game), end_game, game)
+                return {"id": request_id, "game": game, "ended": ended}
+            if op != "move":
+                raise ValueError(f"unknown op {op!r}")
+            action, elapsed = await loop.run_in_executor(
+                self._shard(game), choose_move, game, message["agent"], list(message.get("moves", [])))
+            return {"id": request_id, "game": game, "action": action, "elapsed": elapsed}
+        except KeyError as exc:
+            return {"id": request_id, "error": f"missing field {exc.args[0]!r}"}
+        except Exception as exc:  # l'erreur d'une partie ne doit pas arrêter le serveur
+            return {"id": request_id, "error": f"{type(exc).__name__}: {exc}"}
+
+    async def _answer(self, line, write):
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as exc:
+            response = {"id": None, "error": f"invalid JSON: {exc}"}
+        else:
+            response = await self.handle(message)
+        write((json.dumps(response) + "\n").encode())
+
+    async def _serve_lines(self, reader, write):
+        """Read requests until EOF, answering each line in its own task."""
+        pending = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            task = asyncio.create_task(self._answer(line, write))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def serve_stream(self, reader, writer):
+        """Serve one socket connection."""
+        await self._serve_lines(reader, writer.write)
+        await writer.drain()
+        writer.close()
+
+    async def serve_unix(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(self.serve_stream, path=path)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        await self._serve_lines(reader, _write_stdout)
+
+    def close(self):
+        for shard in self.shards:
+            shard.shutdown()
+
+
+def _write_stdout(data):
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.flush()
+
+
+# ------------------------------------------------------------------
+# Client
+# ------------------------------------------------------------------
+
+class AgentClient:
+    """
+    Asyncio client of a Unix socket server; requests may be in flight concurrently.
+
+        async with AgentClient(path) as client:
+            action = await client.move("g1", "smart", [3, 3])
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.reader = self.writer = None
+        self.futures = {}
+        self.next_id = 0
+        self._reading = None
+
+    async def __aenter__(self):
+        self.reader, self.writer = await asyncio.open_unix_connection(self.path)
+        self._reading = asyncio.create_task(self._read_responses())
+        return self
+
+    async def __aexit__(self, *exc):
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._reading.cancel()
+
+    async def _read_responses(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self.futures.pop(response.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+        for future in self.futures.values():
+            future.set_exception(ConnectionError("agent server closed the connection"))
+
+    async def request(self, message):
+        self.next_id += 1
+        message = dict(message, id=self.next_id)
+        future = asyncio.get_running_loop().create_future()
+        self.futures[self.next_id] = future
+        self.writer.write((json.dumps(message) + "\n").encode())
+        await self.writer.drain()
+        response = await future
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def move(self, game, agent, moves):
+        response = await self.request({"game": game, "agent": agent, "moves": list(moves)})
+        return response["action"]
+
+    async def end(self, game):
+        await self.request({"op": "end", "game": game})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve agent moves for many concurrent games")
+    transport = parser.add_mutually_exclusive_group(required=True)
+    transport.add_argument("--unix", metavar="PATH", help="listen on a Unix socket")
+    transport.add_argument("--stdio", action="store_true", help="read requests on stdin, answer on stdout")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (shards)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="live games kept per worker")
+    args = parser.parse_args(argv)
+
+    server = AgentServer(workers=args.workers, capacity=args.capacity)
+    try:
+        if args.unix:
+            asyncio.run(server.serve_unix(args.unix))
+        else:
+            asyncio.run(server.serve_stdio())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,540 @@
+"""
+Reproducible agent benchmark over a fixed position corpus
+
+The corpus is a versioned text file (benchmarks/corpus_v1.txt), one
+position per line as the sequence of columns played, 1-based ("4453").
+Positions are stratified by ply so that opening, middlegame and endgame
+costs are reported separately.
+
+Commands:
+    python benchmark.py make-corpus [--per-stratum 20] [--seed 1] [--version 2] [--force]
+    python benchmark.py run --agents smart minimax:depth=6 search:time_limit=0.05 --out results.json
+    python benchmark.py compare old.json new.json [--threshold 0.10]
+    python benchmark.py solved --agents search:time_limit=0.2 --set end
+    python benchmark.py budget --agents search mcts --budgets 0.01 0.05 0.2 --games 40
+    python benchmark.py startup --agents smart minimax:depth=5 --repeat 5 [--budget 0.3]
+
+For each agent, `run` reports time-per-move percentiles (overall and per
+ply stratum), nodes per second when the agent exposes get_stats, peak
+tracemalloc memory of one call, and the share of moves equal to those of a
+reference agent. `solved` plays each agent on the exactly solved positions
+of solved_corpus.py and reports how often its move keeps the theoretical
+result (and how often it is optimal) together with its time to decide.
+`budget` plays anytime agents at a ladder of time budgets against a fixed
+reference opponent (in parallel, through sweep.py) and prints their
+Elo-versus-milliseconds curve with the cheapest budget reaching a target Elo.
+`startup` launches fresh interpreters and reports each agent's time to
+first move, split into module import, setup and the move itself, and
+whether importing the agent pulled in a heavy module (numpy, loguru).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from agent_registry import HEAVY_MODULES, make_agent, parse_spec, silence_logs
+from bitboard import BitBoard
+from latency import LatencyHistogram
+from ratings import elo_from_score
+from referee import Referee
+from solved_corpus import ReferenceSolver, read_set, set_path
+from sweep import run_sweep
+
+CORPUS_VERSION = 1
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+STRATA = ((0, 7), (8, 15), (16, 23), (24, 31), (32, 39))
+DEFAULT_AGENTS = ["smart", "minimax:depth=5", "hybrid", "search:time_limit=0.05", "mcts:time_limit=0.05"]
+DEFAULT_REFERENCE = "minimax:depth=8"
+DEFAULT_BUDGETS = [0.01, 0.02, 0.05, 0.1, 0.2, 0.5]
+BUDGET_OPPONENT = "minimax:depth=5"
+STARTUP_BUDGET = 0.3  # secondes de démarrage à froid, hors réflexion du premier coup
+
+
+def corpus_path(version=CORPUS_VERSION):
+    return os.path.join(CORPUS_DIR, f"corpus_v{version}.txt")
+
+
+# ------------------------------------------------------------------
+# CORPUS
+# ------------------------------------------------------------------
+
+def random_position(rng, ply):
+    """
+    Random legal game truncated at `ply` moves, or None if it ended earlier
+    or leaves the player to move an immediate win (too easy to be useful).
+    """
+    state = BitBoard()
+    while state.ply < ply:
+        state.play(rng.choice(state.legal_moves(state.geometry.columns)))
+        if state.last_move_wins():
+            return None
+    # Tous les agents jouent un gain immédiat sans chercher : la position ne mesurerait rien
+    if any(state.is_winning_move(col) for col in state.legal_moves()):
+        return None
+    return list(state.moves)
+
+
+def make_corpus(per_stratum=20, seed=1):
+    """
+    Returns:
+        list of distinct move lists, `per_stratum` positions per ply stratum
+    """
+    rng = random.Random(seed)
+    positions = []
+    seen = set()
+    for low, high in STRATA:
+        found = 0
+        while found < per_stratum:
+            moves = random_position(rng, rng.randint(low, high))
+            if moves is not None and tuple(moves) not in seen:
+                seen.add(tuple(moves))
+                positions.append(moves)
+                found += 1
+    return positions
+
+
+def write_corpus(path, positions):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        for moves in positions:
+            f.write("".join(str(c + 1) for c in moves) + "\n")
+
+
+def load_corpus(path):
+    """
+    Returns:
+        list of move lists (0-based columns); an empty line is the empty board
+    """
+    with open(path) as f:
+        return [[int(ch) - 1 for ch in line.split()[0]] if line.split() else [] for line in f]
+
+
+def position_referee(moves):
+    referee = Referee()
+    for col in moves:
+        referee.play(col)
+    return referee
+
+
+def stratum_of(ply):
+    for low, high in STRATA:
+        if low <= ply <= high:
+            return f"{low}-{high}"
+    return f"{ply}"
+
+
+# ------------------------------------------------------------------
+# RUN
+# ------------------------------------------------------------------
+
+def _call(agent, referee):
+    return agent.choose_action(referee.view(), action_mask=referee.action_mask())
+
+
+def benchmark_agent(spec, positions, reference_moves=None, repeat=1):
+    """
+    Benchmark one agent spec over the corpus.
+
+    Returns:
+        dict with latency summaries, nodes per second, peak memory and agreement
+    """
+    agent = make_agent(spec, collect_stats=True)
+    referees = [position_referee(moves) for moves in positions]
+    overall = LatencyHistogram()
+    by_stratum = {}
+    nodes = 0
+    search_time = 0.0
+    chosen = []
+
+    # Passe 1 : temps (sans tracemalloc, qui ralentit l'exécution)
+    for referee, moves in zip(referees, positions):
+        histogram = by_stratum.setdefault(stratum_of(len(moves)), LatencyHistogram())
+        for _ in range(repeat):
+            start = time.perf_counter()
+            action = _call(agent, referee)
+            elapsed = time.perf_counter() - start
+            overall.record(elapsed)
+            histogram.record(elapsed)
+            if hasattr(agent, "get_stats"):
+                stats = agent.get_stats()
+                nodes += stats.get("nodes", 0)
+                search_time += elapsed
+        chosen.append(action)
+
+    # Passe 2 : pic mémoire d'un appel
+    peak = 0
+    tracemalloc.start()
+    try:
+        for referee in referees:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            _call(agent, referee)
+            _, call_peak = tracemalloc.get_traced_memory()
+            peak = max(peak, call_peak - base)
+    finally:
+        tracemalloc.stop()
+
+    result = {
+        "spec": spec,
+        "latency": overall.summary(),
+        "latency_by_ply": {name: h.summary() for name, h in by_stratum.items()},
+        "nodes_per_second": nodes / search_time if search_time > 0 and nodes else None,
+        "peak_memory_bytes": peak,
+        "moves": chosen,
+    }
+    if reference_moves is not None:
+        agree = sum(a == b for a, b in zip(chosen, reference_moves))
+        result["agreement"] = agree / len(reference_moves)
+    return result
+
+
+def run(specs, corpus_file, reference=DEFAULT_REFERENCE, repeat=1):
+    positions = load_corpus(corpus_file)
+    reference_moves = None
+    if reference:
+        ref_agent = make_agent(reference)
+        reference_moves = [_call(ref_agent, position_referee(moves)) for moves in positions]
+    results = {
+        "corpus": os.path.basename(corpus_file),
+        "positions": len(positions),
+        "reference": reference,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "agents": {},
+    }
+    for spec in specs:
+        print(f"Benchmark {spec}...", flush=True)
+        results["agents"][spec] = benchmark_agent(spec, positions, reference_moves, repeat=repeat)
+    return results
+
+
+def print_results(results):
+    print(f"\nCorpus {results['corpus']} ({results['positions']} positions), référence {results['reference']}")
+    for spec, r in results["agents"].items():
+        lat = r["latency"]
+        nps = f"{r['nodes_per_second']:.0f} n/s" if r["nodes_per_second"] else "-"
+        agree = f"{r['agreement'] * 100:.0f}%" if "agreement" in r else "-"
+        print(f"{spec:32s} p50={lat['p50'] * 1000:8.2f}ms p95={lat['p95'] * 1000:8.2f}ms "
+              f"max={lat['max'] * 1000:8.2f}ms {nps:>14s} peak={r['peak_memory_bytes'] / 1024:8.1f}KB accord={agree}")
+
+
+# ------------------------------------------------------------------
+# SOLVED POSITIONS
+# ------------------------------------------------------------------
+
+def _sign(score):
+    return (score > 0) - (score < 0)
+
+
+def benchmark_solved(spec, solved_positions, solver=None):
+    """
+    Check an agent's moves against exact scores.
+
+    A move "keeps the result" when the position after it has the opposite
+    sign of the position's score, and is "optimal" when it has exactly the
+    opposite score.
+
+    Returns:
+        dict with latency summary, keep_result and optimal rates
+    """
+    agent = make_agent(spec)
+    solver = solver or ReferenceSolver()
+    latency = LatencyHistogram()
+    kept = optimal = 0
+    for moves, score in solved_positions:
+        referee = position_referee(moves)
+        start = time.perf_counter()
+        action = _call(agent, referee)
+        latency.record(time.perf_counter() - start)
+        # Coup gagnant immédiat : score maximal du joueur au trait
+        solver.load(moves)
+        if solver.is_winning_move(action):
+            child = -((42 + 1 - len(moves)) // 2)
+        else:
+            child = solver.solve(moves + [action])
+        kept += _sign(-child) == _sign(score)
+        optimal += -child == score
+    n = len(solved_positions)
+    return {"spec": spec, "latency": latency.summary(),
+            "keep_result": kept / n if n else 0.0, "optimal": optimal / n if n else 0.0}
+
+
+# ------------------------------------------------------------------
+# STRENGTH VERSUS TIME BUDGET
+# ------------------------------------------------------------------
+
+def budget_curve(spec, budgets, opponent=BUDGET_OPPONENT, games=40, workers=None, seed=0):
+    """
+    Elo of an anytime agent against `opponent` at each time budget.
+
+    Parameters:
+        spec: agent spec without time_limit ("search", "mcts", "minimax:depth=42")
+        budgets: time_limit values in seconds
+
+    Returns:
+        list of dicts {budget_ms, move_mean_ms, move_p95_ms, moves_per_second,
+        games, score, elo, elo_low, elo_high}, one per budget; Elo is relative
+        to the opponent and the interval comes from the Wilson score interval
+    """
+    name, fixed = parse_spec(spec)
+    rows = run_sweep(name, ("time_limit", list(budgets)), fixed=fixed, opponent=opponent,
+                     games=games, workers=workers, seed=seed)
+    curve = []
+    for budget, row in zip(budgets, rows):
+        curve.append({
+            "budget_ms": budget * 1000,
+            "move_mean_ms": row["move_mean"] * 1000,
+            "move_p95_ms": row["move_p95"] * 1000,
+            # Coups par seconde de calcul sur un cœur : capacité de service
+            "moves_per_second": 1 / row["move_mean"] if row["move_mean"] > 0 else None,
+            "games": row["games"],
+            "score": row["score"],
+            "elo": row["elo"],
+            "elo_low": elo_from_score(row["score_low"]),
+            "elo_high": elo_from_score(row["score_high"]),
+        })
+    return curve
+
+
+def cheapest_budget(curve, needed_elo):
+    """
+    First point of the curve (cheapest mean move time) whose Elo reaches
+    `needed_elo`, or None if no budget is strong enough.
+    """
+    for point in sorted(curve, key=lambda p: p["move_mean_ms"]):
+        if point["elo"] >= needed_elo:
+            return point
+    return None
+
+
+def print_curve(spec, curve, opponent, needed_elo):
+    print(f"\n{spec} contre {opponent}")
+    for p in curve:
+        print(f"  budget={p['budget_ms']:7.1f}ms coup moyen={p['move_mean_ms']:7.1f}ms p95={p['move_p95_ms']:7.1f}ms "
+              f"score={p['score'] * 100:5.1f}% Elo={p['elo']:+7.0f} [{p['elo_low']:+.0f}, {p['elo_high']:+.0f}]")
+    best = cheapest_budget(curve, needed_elo)
+    if best is None:
+        print(f"  aucun budget n'atteint {needed_elo:+.0f} Elo")
+    else:
+        print(f"  budget le moins cher à {needed_elo:+.0f} Elo : {best['budget_ms']:.0f}ms "
+              f"({best['moves_per_second']:.1f} coups/s par cœur)")
+
+
+# ------------------------------------------------------------------
+# COLD START
+# ------------------------------------------------------------------
+
+# Exécuté dans un interpréteur neuf : argv[1] = spec de l'agent
+_STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import agent_registry
+module = agent_registry.AGENTS[agent_registry.parse_spec(sys.argv[1])[0]][0]
+__import__(module)
+t1 = time.perf_counter()
+heavy = [m for m in agent_registry.HEAVY_MODULES if m in sys.modules]
+agent = agent_registry.make_agent(sys.argv[1])
+from referee import Referee
+referee = Referee()
+t2 = time.perf_counter()
+agent.choose_action(referee.view(), action_mask=referee.action_mask())
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "setup": t2 - t1, "first_move": t3 - t2, "heavy": heavy}))
+"""
+
+
+def startup_profile(spec, repeat=5):
+    """
+    Time to first move of an agent in fresh interpreters.
+
+    Parameters:
+        spec: agent spec
+        repeat: interpreters launched; medians are reported
+
+    Returns:
+        dict with, in seconds, "total" (process launch to first move
+        returned, interpreter start included), "import" (agent module),
+        "setup" (agent, referee and numpy), "first_move" and "cold_start"
+        (total minus first_move), plus "heavy": heavy modules loaded by
+        importing the agent module
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, spec], cwd=here, check=True,
+                             capture_output=True, text=True).stdout
+        total = time.perf_counter() - start
+        run_ = json.loads(out.strip().splitlines()[-1])
+        run_["total"] = total
+        runs.append(run_)
+    result = {key: statistics.median(r[key] for r in runs) for key in ("total", "import", "setup", "first_move")}
+    result["cold_start"] = result["total"] - result["first_move"]
+    result["heavy"] = sorted({m for r in runs for m in r["heavy"]})
+    return result
+
+
+def print_startup(results, budget=STARTUP_BUDGET):
+    """
+    Print the startup table.
+
+    Returns:
+        list of spec over budget or importing a heavy module
+    """
+    print(f"{'Agent':<32} {'Import':>9} {'Setup':>9} {'1er coup':>9} {'Total':>9}  Modules lourds")
+    failures = []
+    for spec, r in results.items():
+        over = r["cold_start"] > budget or r["heavy"]
+        if over:
+            failures.append(spec)
+        print(f"{spec:<32} {r['import'] * 1000:7.1f}ms {r['setup'] * 1000:7.1f}ms "
+              f"{r['first_move'] * 1000:7.1f}ms {r['total'] * 1000:7.1f}ms  "
+              f"{', '.join(r['heavy']) or '-'}{'  HORS BUDGET' if over else ''}")
+    return failures
+
+
+# ------------------------------------------------------------------
+# COMPARE
+# ------------------------------------------------------------------
+
+def compare(old, new, threshold=0.10):
+    """
+    Flag regressions of `new` against `old`.
+
+    A regression is a relative increase of p50/p95 latency or peak memory,
+    or a relative drop of nodes per second, beyond `threshold`, or an
+    absolute drop of agreement beyond `threshold`.
+
+    Returns:
+        list of human readable regression messages (empty if none)
+    """
+    regressions = []
+    for spec, n in new["agents"].items():
+        o = old["agents"].get(spec)
+        if o is None:
+            continue
+        for key in ("p50", "p95"):
+            before, after = o["latency"][key], n["latency"][key]
+            if before > 0 and (after - before) / before > threshold:
+                regressions.append(f"{spec}: latence {key} {before * 1000:.2f}ms -> {after * 1000:.2f}ms")
+        before, after = o["peak_memory_bytes"], n["peak_memory_bytes"]
+        if before > 0 and (after - before) / before > threshold:
+            regressions.append(f"{spec}: mémoire {before / 1024:.1f}KB -> {after / 1024:.1f}KB")
+        before, after = o.get("nodes_per_second"), n.get("nodes_per_second")
+        if before and after is not None and (before - after) / before > threshold:
+            regressions.append(f"{spec}: nœuds/s {before:.0f} -> {after:.0f}")
+        before, after = o.get("agreement"), n.get("agreement")
+        if before is not None and after is not None and before - after > threshold:
+            regressions.append(f"{spec}: accord {before * 100:.0f}% -> {after * 100:.0f}%")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Connect Four agent benchmark")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("make-corpus", help="(re)generate a corpus file")
+    p.add_argument("--per-stratum", type=int, default=20)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--version", type=int, default=CORPUS_VERSION)
+    p.add_argument("--force", action="store_true", help="overwrite an existing corpus version")
+
+    p = sub.add_parser("run", help="benchmark agents on the corpus")
+    p.add_argument("--agents", nargs="+", default=DEFAULT_AGENTS)
+    p.add_argument("--corpus", default=corpus_path())
+    p.add_argument("--reference", default=DEFAULT_REFERENCE, help="agent spec for move agreement ('' to skip)")
+    p.add_argument("--repeat", type=int, default=1, help="timed calls per position")
+    p.add_argument("--out", default=None, help="JSON file for the results")
+
+    p = sub.add_parser("solved", help="check agents against exactly solved positions")
+    p.add_argument("--agents", nargs="+", default=["search:time_limit=0.2", "minimax:depth=12,time_limit=0.2"])
+    p.add_argument("--set", default="end", help="solved set name (see solved_corpus.py) or file path")
+
+    p = sub.add_parser("budget", help="Elo versus time budget of anytime agents")
+    p.add_argument("--agents", nargs="+", default=["search", "mcts"], help="agent specs without time_limit")
+    p.add_argument("--budgets", nargs="+", type=float, default=DEFAULT_BUDGETS, help="time limits in seconds")
+    p.add_argument("--opponent", default=BUDGET_OPPONENT)
+    p.add_argument("--games", type=int, default=40, help="games per budget")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--needed-elo", type=float, default=0.0, help="target Elo against the opponent")
+    p.add_argument("--out", default=None, help="JSON file for the curves")
+
+    p = sub.add_parser("startup", help="time to first move from a fresh interpreter")
+    p.add_argument("--agents", nargs="+", default=DEFAULT_AGENTS)
+    p.add_argument("--repeat", type=int, default=5, help="interpreters launched per agent")
+    p.add_argument("--budget", type=float, default=STARTUP_BUDGET,
+                   help="cold start budget in seconds, first move thinking excluded")
+
+    p = sub.add_parser("compare", help="flag regressions between two result files")
+    p.add_argument("old")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == "make-corpus":
+        path = corpus_path(args.version)
+        if os.path.exists(path) and not args.force:
+            # Un corpus versionné ne change plus : les résultats publiés s'y réfèrent
+            print(f"{path} existe déjà ; choisir une nouvelle --version ou passer --force")
+            return 1
+        write_corpus(path, make_corpus(args.per_stratum, args.seed))
+        print(f"Corpus écrit dans {path}")
+        return 0
+    if args.command == "run":
+        silence_logs()  # les logs par coup fausseraient les mesures
+        results = run(args.agents, args.corpus, reference=args.reference, repeat=args.repeat)
+        print_results(results)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(results, f, indent=2)
+        return 0
+    if args.command == "solved":
+        silence_logs()
+        path = args.set if os.path.exists(args.set) else set_path(args.set)
+        positions = list(read_set(path))
+        solver = ReferenceSolver()
+        print(f"{len(positions)} positions résolues ({os.path.basename(path)})")
+        for spec in args.agents:
+            r = benchmark_solved(spec, positions, solver)
+            lat = r["latency"]
+            print(f"{spec:32s} résultat conservé={r['keep_result'] * 100:5.1f}% optimal={r['optimal'] * 100:5.1f}% "
+                  f"p50={lat['p50'] * 1000:8.2f}ms p95={lat['p95'] * 1000:8.2f}ms")
+        return 0
+    if args.command == "budget":
+        curves = {}
+        for spec in args.agents:
+            curves[spec] = budget_curve(spec, args.budgets, opponent=args.opponent, games=args.games,
+                                        workers=args.workers)
+            print_curve(spec, curves[spec], args.opponent, args.needed_elo)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump({"opponent": args.opponent, "games": args.games, "curves": curves}, f, indent=2)
+        return 0
+    if args.command == "startup":
+        results = {spec: startup_profile(spec, args.repeat) for spec in args.agents}
+        failures = print_startup(results, args.budget)
+        print(f"Budget de démarrage : {args.budget * 1000:.0f}ms, modules interdits à l'import : "
+              f"{', '.join(HEAVY_MODULES)}")
+        return 1 if failures else 0
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    regressions = compare(old, new, args.threshold)
+    for message in regressions:
+        print("REGRESSION", message)
+    if not regressions:
+        print("Aucune régression au-delà du seuil.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
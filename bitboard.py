@@ -0,0 +1,298 @@
+"""
+Bitboard engine for Connect Four
+
+Shared make/unmake board used by the search agents.
+Same bit layout as agent.Agent: each column takes 7 bits
+(6 cells + 1 buffer bit), bit index = col * 7 + row, row 0 at the bottom.
+Other board sizes and alignment lengths (7 x 8, connect 5...) use the
+same layout with rows + 1 bits per column; see Geometry.
+
+    .  .  .  .  .  .  .
+    5 12 19 26 33 40 47
+    4 11 18 25 32 39 46
+    ...
+    0  7 14 21 28 35 42
+"""
+
+from functools import lru_cache
+
+CENTER_WEIGHT = 3
+
+
+def _build_win_lines(rows, cols, connect, h1):
+    """Every `connect`-cell alignment of the board as a bitmask (69 lines on 6 x 7)."""
+    lines = []
+    for col in range(cols):
+        for row in range(rows):
+            for dc, dr in ((1, 0), (0, 1), (1, 1), (1, -1)):
+                end_col, end_row = col + (connect - 1) * dc, row + (connect - 1) * dr
+                if not (0 <= end_col < cols and 0 <= end_row < rows):
+                    continue
+                line = 0
+                for k in range(connect):
+                    line |= 1 << ((col + k * dc) * h1 + row + k * dr)
+                lines.append(line)
+    return tuple(lines)
+
+
+def _win_steps(connect, shift):
+    """
+    Shifts whose successive `m &= m >> k` leave the first cell of every run
+    of `connect` pieces along `shift`: runs double in length, then the rest.
+    """
+    steps = []
+    run = 1
+    while run * 2 <= connect:
+        steps.append(run * shift)
+        run *= 2
+    if run < connect:
+        steps.append((connect - run) * shift)
+    return tuple(steps)
+
+
+def _compile_has_won(win_steps):
+    """
+    has_won(pos) with the shifts written as constants, as hand-written
+    for 6 x 7 (m = pos & (pos >> 7); if m & (m >> 14): ...), so the check
+    costs the same on every geometry.
+    """
+    body = ["def has_won(pos):"]
+    for steps in win_steps:
+        body.append(f"    m = pos & (pos >> {steps[0]})")
+        for k in steps[1:-1]:
+            body.append(f"    m &= m >> {k}")
+        body.append(f"    if m & (m >> {steps[-1]}): return True")
+    body.append("    return False")
+    namespace = {}
+    exec("\n".join(body), namespace)
+    return namespace["has_won"]
+
+
+class Geometry:
+    """
+    Board size, alignment length and the bitboard tables derived from them.
+
+    Each column takes rows + 1 bits (the buffer bit stops alignments from
+    wrapping to the next column), so a board needs cols * (rows + 1) bits.
+    Stones are Python ints: boards wider than 64 bits (8 x 9 is 81) use
+    big ints with the same code. Use board_geometry() to share the tables.
+    """
+
+    __slots__ = ("rows", "cols", "connect", "h1", "size", "columns", "bottoms", "tops",
+                 "win_lines", "lines_through", "win_steps", "line_weights",
+                 "center_order", "center_mask", "has_won")
+
+    def __init__(self, rows=6, cols=7, connect=4):
+        if not 3 <= connect <= max(rows, cols):
+            raise ValueError(f"Cannot align {connect} on a {rows} x {cols} board")
+        self.rows = rows
+        self.cols = cols
+        self.connect = connect
+        self.h1 = h1 = rows + 1  # bits par colonne (avec le bit tampon)
+        self.size = rows * cols
+        self.columns = tuple(range(cols))
+        self.bottoms = tuple(col * h1 for col in range(cols))
+        self.tops = tuple(col * h1 + rows for col in range(cols))  # premier bit hors de la colonne
+        self.win_lines = _build_win_lines(rows, cols, connect, h1)
+        # Pour chaque case, les seules lignes qu'un pion posé là peut compléter
+        self.lines_through = tuple(
+            tuple(line for line in self.win_lines if line >> i & 1)
+            for i in range(cols * h1)
+        )
+        # Vertical, horizontal, diagonales \ et /
+        self.win_steps = tuple(_win_steps(connect, shift) for shift in (1, h1, h1 - 1, h1 + 1))
+        # has_won(pos) : `connect` pions alignés dans pos, quelques décalages par direction
+        self.has_won = _compile_has_won(self.win_steps)
+        # Poids des lignes ouvertes (aucun pion adverse) selon le nombre de pions posés :
+        # (0, 1, 4, 32, 0) pour le puissance 4
+        self.line_weights = ((0,) + tuple(4 ** (k - 1) for k in range(1, connect - 1))
+                             + (8 * 4 ** (connect - 3), 0))
+        # Colonnes du centre vers les bords, à gauche d'abord en cas d'égalité
+        self.center_order = tuple(sorted(range(cols), key=lambda c: abs(2 * c - (cols - 1))))
+        center = 0
+        for col in range(cols):
+            if abs(2 * col - (cols - 1)) <= 1:
+                center |= ((1 << rows) - 1) << (col * h1)
+        self.center_mask = center
+
+    def __repr__(self):
+        return f"Geometry(rows={self.rows}, cols={self.cols}, connect={self.connect})"
+
+
+@lru_cache(maxsize=None)
+def board_geometry(rows=6, cols=7, connect=4):
+    """Shared Geometry of a board size (tables are built once per process)."""
+    return Geometry(rows, cols, connect)
+
+
+STANDARD = board_geometry()
+
+# Plateau standard 6 x 7, puissance 4
+ROWS = STANDARD.rows
+COLS = STANDARD.cols
+H1 = STANDARD.h1
+CENTER_ORDER = STANDARD.center_order
+WIN_LINES = STANDARD.win_lines
+LINES_THROUGH = STANDARD.lines_through
+LINE_WEIGHTS = STANDARD.line_weights
+CENTER_MASK = STANDARD.center_mask
+
+
+def bit_index(row, col):
+    """
+    Bit index of a cell of the standard board given in numpy coordinates
+    (row 0 = top of the grid).
+    """
+    return col * H1 + (ROWS - 1 - row)
+
+
+def completes_line(pos, bit, lines_through=LINES_THROUGH):
+    """
+    Check whether adding cell `bit` to the pieces `pos` completes an alignment.
+    Only the lines through that cell are inspected.
+    """
+    pos |= 1 << bit
+    for line in lines_through[bit]:
+        if pos & line == line:
+            return True
+    return False
+
+
+class BitBoard:
+    """
+    Mutable Connect Four position with make/unmake.
+
+    stones[p] holds the pieces of the player who moves on plies of parity p,
+    so the side to move is always stones[ply & 1].
+
+    Parameters:
+        geometry: board size and alignment length (standard 6 x 7, connect 4 by default)
+    """
+
+    __slots__ = ("stones", "heights", "moves", "geometry", "tops", "lines_through")
+
+    def __init__(self, geometry=STANDARD):
+        self.geometry = geometry
+        # Tables du chemin critique gardées en attributs directs
+        self.tops = geometry.tops
+        self.lines_through = geometry.lines_through
+        self.stones = [0, 0]
+        self.heights = list(geometry.bottoms)  # prochain bit libre par colonne
+        self.moves = []
+
+    @classmethod
+    def from_observation(cls, obs, connect=4):
+        """
+        Build a position from a (rows, cols, 2) observation.
+
+        Parameters:
+            obs: numpy array, channel 0 = player to move, channel 1 = opponent
+            connect: alignment length of the variant played
+
+        Returns:
+            BitBoard with the player to move on turn
+        """
+        rows, cols = obs.shape[0], obs.shape[1]
+        geometry = board_geometry(rows, cols, connect)
+        h1 = geometry.h1
+        current = 0
+        opponent = 0
+        state = cls(geometry)
+        for col in range(cols):
+            height = 0
+            for row in range(rows - 1, -1, -1):
+                if obs[row, col, 0] == 1:
+                    current |= 1 << (col * h1 + height)
+                elif obs[row, col, 1] == 1:
+                    opponent |= 1 << (col * h1 + height)
+                else:
+                    break
+                height += 1
+            state.heights[col] = col * h1 + height
+        ply = bin(current | opponent).count("1")
+        state.stones[ply & 1] = current
+        state.stones[(ply & 1) ^ 1] = opponent
+        # Historique inconnu : on ne garde qu'une pile de la bonne longueur
+        state.moves = [None] * ply
+        return state
+
+    @property
+    def ply(self):
+        return len(self.moves)
+
+    @property
+    def current(self):
+        """Pieces of the player to move."""
+        return self.stones[len(self.moves) & 1]
+
+    @property
+    def opponent(self):
+        """Pieces of the player who just moved."""
+        return self.stones[(len(self.moves) & 1) ^ 1]
+
+    def can_play(self, col):
+        return self.heights[col] < self.tops[col]
+
+    def legal_moves(self, order=None):
+        """Playable columns in `order` (center first by default)."""
+        heights, tops = self.heights, self.tops
+        if order is None:
+            order = self.geometry.center_order
+        return [col for col in order if heights[col] < tops[col]]
+
+    def play(self, col):
+        """Drop a piece of the player to move in column col."""
+        self.stones[len(self.moves) & 1] |= 1 << self.heights[col]
+        self.heights[col] += 1
+        self.moves.append(col)
+
+    def undo(self):
+        """Take back the last move."""
+        col = self.moves.pop()
+        self.heights[col] -= 1
+        self.stones[len(self.moves) & 1] ^= 1 << self.heights[col]
+
+    def last_move_wins(self):
+        """
+        Check whether the last move completed an alignment.
+        Only the lines through the last placed piece are inspected.
+        """
+        col = self.moves[-1]
+        pos = self.stones[(len(self.moves) & 1) ^ 1]
+        for line in self.lines_through[self.heights[col] - 1]:
+            if pos & line == line:
+                return True
+        return False
+
+    def is_winning_move(self, col):
+        """Check whether the player to move would win by playing col."""
+        return completes_line(self.stones[len(self.moves) & 1], self.heights[col], self.lines_through)
+
+    def is_opponent_winning_move(self, col):
+        """Check whether the opponent would win if it could play col now."""
+        return completes_line(self.stones[(len(self.moves) & 1) ^ 1], self.heights[col], self.lines_through)
+
+    def is_full(self):
+        return len(self.moves) == self.geometry.size
+
+    def evaluate(self):
+        """
+        Static evaluation from the point of view of the player to move.
+        Open lines (no opposing piece) are weighted by how many pieces they hold.
+        """
+        geometry = self.geometry
+        weights = geometry.line_weights
+        center = geometry.center_mask
+        me = self.stones[len(self.moves) & 1]
+        opp = self.stones[(len(self.moves) & 1) ^ 1]
+        score = 0
+        for line in geometry.win_lines:
+            mine = me & line
+            theirs = opp & line
+            if not theirs:
+                if mine:
+                    score += weights[mine.bit_count()]
+            elif not mine:
+                score -= weights[theirs.bit_count()]
+        score += CENTER_WEIGHT * ((me & center).bit_count() - (opp & center).bit_count())
+        return score
@@ -0,0 +1,188 @@
+"""
+Bitboard Connect Four environment with the PettingZoo AEC API
+
+Drop-in replacement for pettingzoo.classic.connect_four_v3 in simulation
+loops: same agent names, same agent_iter() / last() / step() protocol, same
+rewards and termination sequence, and the same observation dict:
+
+    observation  (6, 7, 2) int8, channel 0 = pieces of the observing agent,
+                 channel 1 = opponent, row 0 = top of the board
+    action_mask  (7,) int8, legal columns (all zeros when it is not the
+                 observing agent's turn)
+
+The game itself runs on referee.Referee, so a win is detected from the
+lines through the last piece instead of scanning the whole board, and no
+pygame / gymnasium wrapper sits between the loop and the rules.
+
+Usage (same loop as with PettingZoo):
+    import connect_four_env as connect_four_v3
+    env = connect_four_v3.env()
+    env.reset(seed=42)
+    for agent in env.agent_iter():
+        obs, reward, terminated, truncated, info = env.last()
+        env.step(None if terminated or truncated else policy(obs))
+
+Variants: env(rows=7, cols=8, connect=5) plays on another board; the
+observation and action mask take its shape.
+"""
+
+import warnings
+
+import numpy as np
+
+from bitboard import COLS, ROWS
+from referee import Referee
+
+
+def env(render_mode=None, rows=ROWS, cols=COLS, connect=4):
+    return raw_env(render_mode=render_mode, rows=rows, cols=cols, connect=connect)
+
+
+class raw_env:
+    """
+    Two-player AEC environment; see the module docstring.
+    """
+
+    metadata = {
+        "render_modes": ["human", "ansi"],
+        "name": "connect_four_v3",
+        "is_parallelizable": False,
+    }
+
+    def __init__(self, render_mode=None, rows=ROWS, cols=COLS, connect=4):
+        if render_mode not in (None, "human", "ansi"):
+            raise ValueError(f"Unsupported render_mode {render_mode!r}")
+        self.render_mode = render_mode
+        self.rows, self.cols, self.connect = rows, cols, connect
+        self.possible_agents = ["player_0", "player_1"]
+        self.referee = None
+        self.agents = []
+
+    # --- API PettingZoo --------------------------------------------------
+    @property
+    def unwrapped(self):
+        return self
+
+    @property
+    def num_agents(self):
+        return len(self.agents)
+
+    @property
+    def max_num_agents(self):
+        return len(self.possible_agents)
+
+    def observation_space(self, agent):
+        from gymnasium import spaces  # dépendance optionnelle, seulement pour les spaces
+        return spaces.Dict({
+            "observation": spaces.Box(low=0, high=1, shape=(self.rows, self.cols, 2), dtype=np.int8),
+            "action_mask": spaces.Box(low=0, high=1, shape=(self.cols,), dtype=np.int8),
+        })
+
+    def action_space(self, agent):
+        from gymnasium import spaces
+        return spaces.Discrete(self.cols)
+
+    def reset(self, seed=None, options=None):
+        # Le jeu est déterministe : seed est accepté pour la compatibilité
+        self.referee = Referee(self.rows, self.cols, self.connect)
+        self.agents = self.possible_agents[:]
+        self.rewards = {agent: 0 for agent in self.agents}
+        self._cumulative_rewards = {agent: 0 for agent in self.agents}
+        self.terminations = {agent: False for agent in self.agents}
+        self.truncations = {agent: False for agent in self.agents}
+        self.infos = {agent: {} for agent in self.agents}
+        self.agent_selection = self.agents[0]
+        self._skip_agent_selection = None
+
+    def observe(self, agent):
+        board = self.referee.board
+        seat = self.possible_agents.index(agent)
+        observation = (board if seat == 0 else board[:, :, ::-1]).astype(np.int8)
+        action_mask = np.zeros(self.cols, dtype=np.int8)
+        if agent == self.agent_selection:
+            action_mask[:] = self.referee.action_mask()
+        return {"observation": observation, "action_mask": action_mask}
+
+    def last(self, observe=True):
+        agent = self.agent_selection
+        observation = self.observe(agent) if observe else None
+        return (observation, self._cumulative_rewards[agent], self.terminations[agent],
+                self.truncations[agent], self.infos[agent])
+
+    def agent_iter(self, max_iter=2 ** 63):
+        for _ in range(max_iter):
+            if not self.agents:
+                return
+            yield self.agent_selection
+
+    def step(self, action):
+        agent = self.agent_selection
+        if self.terminations[agent] or self.truncations[agent]:
+            self._was_dead_step(action)
+            return
+        if action is None or not 0 <= action < self.cols:
+            raise ValueError(f"action {action!r} is outside the action space")
+        if not self.referee.is_legal(action):
+            self._illegal_move(agent)
+            return
+
+        _, won = self.referee.play(action)
+        next_agent = self.agents[1 - self.agents.index(agent)]
+        if won:
+            self.rewards[agent] += 1
+            self.rewards[next_agent] -= 1
+            self.terminations = {a: True for a in self.agents}
+        elif self.referee.is_over():
+            self.terminations = {a: True for a in self.agents}
+        self.agent_selection = next_agent
+        for a, reward in self.rewards.items():
+            self._cumulative_rewards[a] += reward
+        if self.render_mode == "human":
+            self.render()
+
+    def _illegal_move(self, agent):
+        """Full column: the game ends and the mover loses (TerminateIllegalWrapper)."""
+        warnings.warn("Illegal move made, game terminating with current player losing.")
+        self._cumulative_rewards[agent] = 0
+        self.terminations = {a: True for a in self.agents}
+        self.truncations = {a: True for a in self.agents}
+        self.rewards = {a: 0 for a in self.agents}
+        self.rewards[agent] = -1
+        for a, reward in self.rewards.items():
+            self._cumulative_rewards[a] += reward
+        # Les agents terminés sont retirés dans l'ordre de la liste
+        self._skip_agent_selection = agent
+        self.agent_selection = self.agents[0]
+
+    def _was_dead_step(self, action):
+        """Remove a finished agent, in the same order as PettingZoo's AECEnv."""
+        if action is not None:
+            raise ValueError("when an agent is dead, the only valid action is None")
+        agent = self.agent_selection
+        for table in (self.terminations, self.truncations, self.rewards, self._cumulative_rewards, self.infos):
+            del table[agent]
+        self.agents.remove(agent)
+        dead = [a for a in self.agents if self.terminations[a] or self.truncations[a]]
+        if dead:
+            if self._skip_agent_selection is None:
+                self._skip_agent_selection = self.agent_selection
+            self.agent_selection = dead[0]
+        else:
+            if self._skip_agent_selection is not None:
+                self.agent_selection = self._skip_agent_selection
+            self._skip_agent_selection = None
+        self.rewards = {a: 0 for a in self.agents}
+
+    def render(self):
+        board = self.referee.board
+        text = "\n".join(
+            " ".join("X" if board[r, c, 0] else "O" if board[r, c, 1] else "." for c in range(self.cols))
+            for r in range(self.rows)
+        )
+        if self.render_mode == "human":
+            print(text + "\n")
+            return None
+        return text
+
+    def close(self):
+        pass
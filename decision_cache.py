@@ -0,0 +1,160 @@
+"""
+Memoized decisions for deterministic agents
+
+In a tournament a deterministic agent meets the same early positions game
+after game and recomputes the same move. CachedAgent wraps an agent and
+remembers its decisions in a bounded LRU keyed by
+
+    (agent config, packed board, action mask)
+
+where the config is results_store.agent_version (class source + settings),
+so a cache can be shared between wrappers of identically configured agents.
+
+Agents declare whether caching is sound through two attributes:
+
+    stochastic      the move depends on random draws (RandomAgent, MCTS)
+    time_dependent  the move depends on a time budget (anytime search)
+
+Caching is disabled (the wrapper only forwards calls) if either is true,
+or if the agent declares neither. SmartAgent and MinimaxAgent without a
+time limit are cacheable; their random tie-breaks are frozen by the cache.
+Both the declarations and the config are re-read when a setting of the
+wrapped agent changes (e.g. a time_limit set after wrapping).
+
+Usage:
+    agents_dict = {name: CachedAgent(agent) for name, agent in agents_dict.items()}
+    run_tournament(agents_dict)
+    print(agents_dict["SmartAgent"].cache_stats())
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from results_store import agent_settings, agent_version
+
+DEFAULT_CAPACITY = 100_000
+
+
+def is_cacheable(agent):
+    """True if the agent declares itself neither stochastic nor time-dependent."""
+    stochastic = getattr(agent, "stochastic", None)
+    time_dependent = getattr(agent, "time_dependent", None)
+    return stochastic is False and time_dependent is False
+
+
+def board_key(observation):
+    """
+    Compact key of an observation: its shape and its cells packed 8 per byte
+    (11 bytes for 6 x 7). The shape keeps variant boards with the same
+    number of cells apart.
+    """
+    if isinstance(observation, dict):
+        observation = observation["observation"]
+    return observation.shape, np.packbits(observation).tobytes()
+
+
+class DecisionCache:
+    """
+    Bounded LRU of decisions with hit / miss counters.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        action = self.entries.get(key)
+        if action is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return action
+
+    def put(self, key, action):
+        self.entries[key] = action
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        """
+        Returns:
+            dict {hits, misses, hit_rate, size, evictions}
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.entries),
+            "evictions": self.evictions,
+        }
+
+
+class CachedAgent:
+    """
+    Agent wrapper answering repeated positions from a DecisionCache.
+
+    Parameters:
+        agent: wrapped agent
+        cache: DecisionCache to use (shared between wrappers if given)
+        capacity: size of the private cache created when cache is None
+    """
+
+    def __init__(self, agent, cache=None, capacity=DEFAULT_CAPACITY):
+        self.agent = agent
+        self.cache = cache if cache is not None else DecisionCache(capacity)
+        self._settings = None
+        self._enabled = False
+        self._config = None
+
+    def _refresh(self):
+        # Réglages relus à chaque coup (peu coûteux) ; le hash du source seulement s'ils changent
+        settings = agent_settings(self.agent)
+        if settings != self._settings:
+            self._settings = settings
+            self._enabled = is_cacheable(self.agent)
+            self._config = agent_version(self.agent) if self._enabled else None
+
+    @property
+    def enabled(self):
+        self._refresh()
+        return self._enabled
+
+    @property
+    def unwrapped(self):
+        return self.agent
+
+    @property
+    def player_name(self):
+        return self.agent.player_name
+
+    def __getattr__(self, name):
+        # get_stats, depth, time_limit... de l'agent enveloppé
+        if name == "agent":
+            raise AttributeError(name)
+        return getattr(self.agent, name)
+
+    def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        self._refresh()
+        if not self._enabled:
+            return self.agent.choose_action(observation, reward=reward, terminated=terminated,
+                                            truncated=truncated, info=info, action_mask=action_mask)
+        mask = tuple(int(v) for v in action_mask) if action_mask is not None else None
+        key = (self._config, board_key(observation), mask)
+        action = self.cache.get(key)
+        if action is None:
+            action = self.agent.choose_action(observation, reward=reward, terminated=terminated,
+                                              truncated=truncated, info=info, action_mask=action_mask)
+            self.cache.put(key, action)
+        return action
+
+    def cache_stats(self):
+        """Hit rate and size of the cache, plus whether caching is enabled for this agent."""
+        return dict(self.cache.stats(), enabled=self.enabled)
@@ -0,0 +1,149 @@
+"""
+Compact binary game records for Connect Four
+
+One record = 1 header byte + the moves packed 3 bits each (at most 16 bytes):
+
+    header: bits 0-5 = number of moves (0..42), bits 6-7 = result
+            (0 = draw, 1 = first player won, 2 = second player won, 3 = unfinished)
+    moves:  column of move k in bits 3k..3k+2 of a little-endian integer
+
+A forfeited game is recorded as a win of the opponent; its final position
+is not terminal, which is how forfeited() tells it apart.
+
+Records are appended to a file as games finish (GameRecordWriter) and
+replayed lazily, one record at a time (read_records).
+"""
+
+from referee import Referee
+
+DRAW = 0
+FIRST_WINS = 1
+SECOND_WINS = 2
+UNFINISHED = 3
+
+MAX_MOVES = 42
+
+
+def pack_record(moves, result):
+    """
+    Encode one game.
+
+    Parameters:
+        moves: sequence of column indices (0-6), at most 42
+        result: DRAW, FIRST_WINS, SECOND_WINS or UNFINISHED
+
+    Returns:
+        bytes of length 1 + ceil(3 * len(moves) / 8)
+    """
+    n = len(moves)
+    if n > MAX_MOVES:
+        raise ValueError(f"A game has at most {MAX_MOVES} moves, got {n}")
+    if not 0 <= result <= 3:
+        raise ValueError(f"Invalid result code {result}")
+    packed = 0
+    for k, col in enumerate(moves):
+        if not 0 <= col < 7:
+            raise ValueError(f"Invalid column {col} at move {k}")
+        packed |= col << (3 * k)
+    return bytes([n | (result << 6)]) + packed.to_bytes((3 * n + 7) // 8, "little")
+
+
+def unpack_moves(payload, n):
+    """Decode n moves from the packed bytes that follow a header."""
+    packed = int.from_bytes(payload, "little")
+    return [(packed >> (3 * k)) & 7 for k in range(n)]
+
+
+def result_code(winner_seat):
+    """Result code from the winning seat (0, 1 or None for a draw), forfeits included."""
+    if winner_seat is None:
+        return DRAW
+    return FIRST_WINS if winner_seat == 0 else SECOND_WINS
+
+
+class GameRecordWriter:
+    """
+    Append-only writer; each record is written as soon as the game ends.
+
+    Parameters:
+        path: file the records are appended to
+        flush_every: records kept in memory before they are flushed; the
+            default 1 puts every game on disk when it ends, a larger value
+            batches writes but a crash loses up to flush_every - 1 games
+
+    Usage:
+        with GameRecordWriter("games.c4r") as writer:
+            writer.write(moves, result)
+    """
+
+    def __init__(self, path, flush_every=1):
+        self.path = path
+        self._file = open(path, "ab")
+        self.flush_every = flush_every
+        self.count = 0
+
+    def write(self, moves, result):
+        self._file.write(pack_record(moves, result))
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_records(path, chunk_size=64 * 1024):
+    """
+    Generator over the records of a file, read in fixed-size chunks.
+
+    Yields:
+        (moves, result) for each record, in file order
+    """
+    with open(path, "rb") as f:
+        buffer = b""
+        pos = 0
+        while True:
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer = buffer[pos:] + chunk
+                pos = 0
+            while pos < len(buffer):
+                header = buffer[pos]
+                n = header & 0x3F
+                size = (3 * n + 7) // 8
+                if pos + 1 + size > len(buffer):
+                    break  # record coupé entre deux blocs
+                yield unpack_moves(buffer[pos + 1:pos + 1 + size], n), header >> 6
+                pos += 1 + size
+            if not chunk:
+                if pos < len(buffer):
+                    raise ValueError(f"Truncated record at the end of {path}")
+                return
+
+
+def forfeited(moves, result):
+    """True for a recorded win whose final position is not a win (game lost by forfeit)."""
+    return result in (FIRST_WINS, SECOND_WINS) and replay(moves).winner is None
+
+
+def replay(moves):
+    """
+    Re-simulate a recorded game on a fresh Referee.
+
+    Returns:
+        the Referee after the last move (board, winner, turn)
+    """
+    referee = Referee()
+    for col in moves:
+        referee.play(col)
+    return referee
@@ -0,0 +1,64 @@
+"""
+Per-move latency recording for the game loops
+
+LatencyHistogram keeps every choose_action duration of one agent and
+summarises them as count / mean / p50 / p95 / p99 / max.
+"""
+
+
+def percentile(sorted_samples, p):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Parameters:
+        sorted_samples: list of floats sorted in increasing order
+        p: percentile in [0, 100]
+
+    Returns:
+        the sample value, or 0.0 for an empty list
+    """
+    if not sorted_samples:
+        return 0.0
+    rank = int(round(p / 100 * (len(sorted_samples) - 1)))
+    return sorted_samples[min(max(rank, 0), len(sorted_samples) - 1)]
+
+
+class LatencyHistogram:
+    """
+    Move durations (seconds) of one agent.
+    """
+
+    def __init__(self):
+        self.samples = []
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def merge(self, other):
+        self.samples.extend(other.samples)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def summary(self):
+        """
+        Returns:
+            dict {count, mean, p50, p95, p99, max} in seconds
+        """
+        ordered = sorted(self.samples)
+        count = len(ordered)
+        return {
+            "count": count,
+            "mean": sum(ordered) / count if count else 0.0,
+            "p50": percentile(ordered, 50),
+            "p95": percentile(ordered, 95),
+            "p99": percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+
+def format_summary(name, summary):
+    """One-line human readable summary, times in milliseconds."""
+    return (f"{name}: {summary['count']} coups, "
+            f"p50={summary['p50'] * 1000:.2f}ms p95={summary['p95'] * 1000:.2f}ms "
+            f"p99={summary['p99'] * 1000:.2f}ms max={summary['max'] * 1000:.2f}ms")
@@ -2,53 +2,132 @@
 My MCTS Agent for Connect Four
 
 Monte Carlo Tree Search with optimized win checking.
+The tree stores moves only; selection and playouts replay them on a single
+BitBoard with make/unmake.
 """
 
-import numpy as np
+import math
 import random
 import time
 
-ROWS = 6
-COLS = 7
-
-# On réutilise les mêmes fonctions check_win_optimized et dérivées
+from bitboard import BitBoard
+from search_stats import SearchStats
 
 class MCTSNode:
-    def __init__(self, board, player, parent=None, move=None):
-        self.board = board
-        self.player = player
+    __slots__ = ("parent", "move", "children", "untried", "visits", "wins", "terminal")
+
+    def __init__(self, parent=None, move=None, untried=(), terminal=False):
         self.parent = parent
         self.move = move
         self.children = []
+        self.untried = list(untried)  # coups pas encore développés
         self.visits = 0
-        self.wins = 0
+        self.wins = 0.0  # du point de vue du joueur qui a joué self.move
+        self.terminal = terminal
 
     def is_fully_expanded(self):
-        valid_moves = [c for c in range(COLS) if self._get_next_row(c) is not None]
-        return len(self.children) == len(valid_moves)
+        return not self.untried
 
     def best_child(self, c=1.41):
-        scores = [(child.wins/child.visits) + c * np.sqrt(np.log(self.visits)/child.visits) for child in self.children]
-        return self.children[np.argmax(scores)]
-
-    def _get_next_row(self, col):
-        for row in range(5, -1, -1):
-            if self.board[row, col, 0] == 0 and self.board[row, col, 1] == 0:
-                return row
-        return None
+        log_visits = math.log(self.visits)
+        scores = [(child.wins/child.visits) + c * math.sqrt(log_visits/child.visits) for child in self.children]
+        return self.children[scores.index(max(scores))]
 
 class MCTSAgent:
-    def __init__(self, env=None, time_limit=0.95, player_name=None):
+    stochastic = True
+    time_dependent = True
+
+    def __init__(self, env=None, time_limit=0.95, player_name=None, collect_stats=False, connect=4):
         self.env = env
         self.time_limit = time_limit
+        self.connect = connect  # la taille du plateau vient de l'observation
         self.player_name = player_name or "MCTSAgent"
+        self.stats = SearchStats() if collect_stats else None
 
     def choose_action(self, board, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
-        root = MCTSNode(board.copy(), player=0)
+        stats = self.stats
+        if stats is not None:
+            stats.reset()
+        state = BitBoard.from_observation(board, self.connect)
+        valid_actions = [c for c in state.legal_moves() if action_mask is None or action_mask[c] == 1]
+        if not valid_actions:
+            return 0
+        # Victoire immédiate : pas besoin de chercher
+        for col in valid_actions:
+            if state.is_winning_move(col):
+                return col
+
+        root = MCTSNode(untried=valid_actions)
         start_time = time.time()
         while time.time() - start_time < self.time_limit:
-            node = root  # selection / expansion / simulation / backprop simplified
-            # TODO: Implement full MCTS
-            pass
-        best = root.best_child(c=0)
+            node = root
+            depth = 0
+
+            # 1. Selection
+            while node.is_fully_expanded() and node.children and not node.terminal:
+                node = node.best_child()
+                state.play(node.move)
+                depth += 1
+
+            # 2. Expansion
+            if node.untried and not node.terminal:
+                move = node.untried.pop(random.randrange(len(node.untried)))
+                state.play(move)
+                depth += 1
+                won = state.last_move_wins()
+                child = MCTSNode(node, move, () if won else state.legal_moves(), terminal=won or state.is_full())
+                node.children.append(child)
+                node = child
+                if stats is not None:
+                    stats.nodes += 1
+
+            # 3. Simulation : résultat pour le joueur qui a joué node.move
+            result = self._rollout(state, node)
+            if stats is not None:
+                stats.playouts += 1
+                stats.max_depth = max(stats.max_depth, depth)
+
+            # 4. Backpropagation
+            while node is not None:
+                node.visits += 1
+                node.wins += result
+                result = 1.0 - result
+                node = node.parent
+            for _ in range(depth):
+                state.undo()
+
+        if stats is not None:
+            stats.stop()
+        if not root.children:
+            return valid_actions[0] if valid_actions else 0
+        best = max(root.children, key=lambda child: child.visits)
         return best.move
+
+    def get_stats(self):
+        """Statistics of the last choose_action call as a dict ({} if collect_stats is off)."""
+        return self.stats.as_dict() if self.stats is not None else {}
+
+    def _rollout(self, state, node):
+        """
+        Random playout from `state`, undone before returning.
+
+        Returns:
+            1.0 / 0.5 / 0.0 for the player who played node.move
+        """
+        if node.terminal:
+            return 1.0 if node.move is not None and state.last_move_wins() else 0.5
+        mover = (state.ply - 1) & 1
+        played = 0
+        result = 0.5
+        while True:
+            moves = state.legal_moves()
+            if not moves:
+                break
+            state.play(random.choice(moves))
+            played += 1
+            if state.last_move_wins():
+                result = 1.0 if (state.ply - 1) & 1 == mover else 0.0
+                break
+        for _ in range(played):
+            state.undo()
+        return result
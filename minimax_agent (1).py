@@ -1,118 +1,189 @@
 """
 My Minimax Agent for Connect Four
 
-This agent uses the Minimax algorithm with alpha-beta pruning
-and optimized win checking for speed.
+This agent uses the Minimax algorithm (negamax form) with alpha-beta pruning
+on a make/unmake bitboard. Only the lines through the last placed piece are
+checked for a win, and iterative deepening keeps the search inside an
+optional time budget.
 """
 
-import numpy as np
 import random
+import time
+
+from bitboard import BitBoard
+from search_stats import SearchStats
+
+WIN_SCORE = 100000
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the move deadline is exceeded."""
 
-ROWS = 6
-COLS = 7
-
-# Réutilisation des fonctions optimisées du SmartAgent
-def check_horizontal_wins(board, channel):
-    for row in range(ROWS):
-        row_slice = board[row, :, channel]
-        for col in range(COLS - 3):
-            if np.sum(row_slice[col:col+4]) == 4:
-                return True
-    return False
-
-def check_vertical_wins(board, channel):
-    for col in range(COLS):
-        col_slice = board[:, col, channel]
-        for row in range(ROWS - 3):
-            if np.sum(col_slice[row:row+4]) == 4:
-                return True
-    return False
-
-def check_diagonal_down(board, channel):
-    for row in range(ROWS - 3):
-        for col in range(COLS - 3):
-            if np.sum([board[row+i, col+i, channel] for i in range(4)]) == 4:
-                return True
-    return False
-
-def check_diagonal_up(board, channel):
-    for row in range(3, ROWS):
-        for col in range(COLS - 3):
-            if np.sum([board[row-i, col+i, channel] for i in range(4)]) == 4:
-                return True
-    return False
-
-def check_win_optimized(board, channel):
-    return (
-        check_horizontal_wins(board, channel) or
-        check_vertical_wins(board, channel) or
-        check_diagonal_down(board, channel) or
-        check_diagonal_up(board, channel)
-    )
 
 # ============================================================
 
 class MinimaxAgent:
     """
-    Minimax Agent with alpha-beta pruning and optimized win check
+    Minimax Agent with alpha-beta pruning, bitboard make/unmake
+    and iterative deepening
     """
-    def __init__(self, env=None, depth=3, player_name=None):
+
+    stochastic = False
+
+    @property
+    def time_dependent(self):
+        """With a time limit the reached depth, hence the move, depends on the machine."""
+        return self.time_limit is not None
+
+    def __init__(self, env=None, depth=3, player_name=None, time_limit=None, collect_stats=False, tracer=None,
+                 connect=4):
+        """
+        Parameters:
+            env: PettingZoo environment (optional)
+            depth: maximum search depth
+            player_name: Optional name for the agent
+            time_limit: seconds per move; None searches to `depth` without deadline
+            collect_stats: fill a SearchStats on every choose_action (see get_stats)
+            tracer: optional search_trace.SearchTracer recording sampled searches
+            connect: pieces to align (the board size comes from the observation)
+        """
         self.env = env
         self.depth = depth
+        self.time_limit = time_limit
+        self.connect = connect
         self.player_name = player_name or "MinimaxAgent"
+        self._deadline = None
+        self._nodes = 0
+        self.stats = SearchStats() if collect_stats else None
+        self.tracer = tracer
+        self._trace = None
         if env is not None:
             self.action_space = env.action_space(env.agents[0])
 
     def choose_action(self, board, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
+        if self.stats is not None:
+            self.stats.reset()
+        action = self._choose_action(board, action_mask)
+        if self.stats is not None:
+            self.stats.stop()
+        return action
+
+    def _choose_action(self, board, action_mask):
         valid_actions = [i for i, valid in enumerate(action_mask) if valid == 1]
-        best_score = -np.inf
-        best_action = random.choice(valid_actions)
-        for action in valid_actions:
-            row = self._get_next_row(board, action)
-            if row is not None:
-                board[row, action, 0] = 1  # Simulate move
-                score = self._minimax(board, self.depth-1, False, -np.inf, np.inf)
-                board[row, action, 0] = 0
-                if score > best_score:
-                    best_score = score
-                    best_action = action
+        if len(valid_actions) == 1:
+            return valid_actions[0]
+
+        state = BitBoard.from_observation(board, self.connect)
+        root_moves = [c for c in state.legal_moves() if c in valid_actions]
+        if not root_moves:
+            return random.choice(valid_actions)
+
+        self._deadline = time.time() + self.time_limit if self.time_limit is not None else None
+        self._nodes = 0
+        stats = self.stats
+        trace = self._trace = self.tracer.sample(self.player_name, state.ply) if self.tracer is not None else None
+
+        best_action = root_moves[0]
+        for depth in range(1, self.depth + 1):
+            if trace is not None:
+                trace.begin(depth)
+            try:
+                score, action = self._search_root(state, depth, root_moves)
+            except SearchTimeout:
+                if trace is not None:
+                    trace.end(completed=False)
+                break
+            if trace is not None:
+                trace.end(completed=True)
+            best_action = action
+            if stats is not None:
+                stats.max_depth = depth
+            # Le meilleur coup de l'itération précédente est exploré en premier
+            root_moves.remove(action)
+            root_moves.insert(0, action)
+            if abs(score) >= WIN_SCORE:
+                break  # issue forcée trouvée, inutile d'aller plus loin
+        if stats is not None:
+            stats.nodes = self._nodes
         return best_action
 
-    def _minimax(self, board, depth, maximizing, alpha, beta):
-        if depth == 0 or check_win_optimized(board, 0) or check_win_optimized(board, 1):
-            return self.evaluate_position(board, 0)
-        valid_actions = [c for c in range(COLS) if self._get_next_row(board, c) is not None]
-        if maximizing:
-            max_eval = -np.inf
-            for action in valid_actions:
-                row = self._get_next_row(board, action)
-                board[row, action, 0] = 1
-                eval = self._minimax(board, depth-1, False, alpha, beta)
-                board[row, action, 0] = 0
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            return max_eval
-        else:
-            min_eval = np.inf
-            for action in valid_actions:
-                row = self._get_next_row(board, action)
-                board[row, action, 1] = 1
-                eval = self._minimax(board, depth-1, True, alpha, beta)
-                board[row, action, 1] = 0
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            return min_eval
+    def get_stats(self):
+        """Statistics of the last choose_action call as a dict ({} if collect_stats is off)."""
+        return self.stats.as_dict() if self.stats is not None else {}
+
+    def _search_root(self, state, depth, root_moves):
+        alpha, beta = -WIN_SCORE - depth - 1, WIN_SCORE + depth + 1
+        best_score = alpha
+        best_action = root_moves[0]
+        if self._trace is not None:
+            self._trace.node(depth)
+            self._trace.expand(depth, len(root_moves))
+        for action in root_moves:
+            state.play(action)
+            if state.last_move_wins():
+                score = WIN_SCORE + depth
+            else:
+                score = -self._negamax(state, depth - 1, -beta, -alpha)
+            state.undo()
+            if score > best_score:
+                best_score = score
+                best_action = action
+            alpha = max(alpha, score)
+        return best_score, best_action
+
+    def _negamax(self, state, depth, alpha, beta):
+        """
+        Score of `state` for the player to move, searched `depth` plies deep.
+        The caller already checked that the previous move did not win.
+        """
+        self._nodes += 1
+        if self._deadline is not None and not self._nodes & 1023 and time.time() > self._deadline:
+            raise SearchTimeout()
+
+        trace = self._trace
+        if trace is not None:
+            trace.node(depth)
+        moves = state.legal_moves()
+        if not moves:
+            return 0  # match nul
+        if depth == 0:
+            if self.stats is not None:
+                self.stats.leaf_evals += 1
+            return state.evaluate()
+
+        if trace is not None:
+            trace.expand(depth, len(moves))
+        best = -WIN_SCORE - depth - 1
+        for index, action in enumerate(moves):
+            state.play(action)
+            if state.last_move_wins():
+                state.undo()
+                return WIN_SCORE + depth  # victoire plus rapide = meilleur score
+            score = -self._negamax(state, depth - 1, -beta, -alpha)
+            state.undo()
+            if score > best:
+                best = score
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if self.stats is not None:
+                    self.stats.cutoff(index)
+                if trace is not None:
+                    trace.cutoff(depth, index)
+                break
+        return best
 
     def _get_next_row(self, board, col):
-        for row in range(5, -1, -1):
+        for row in range(board.shape[0] - 1, -1, -1):
             if board[row, col, 0] == 0 and board[row, col, 1] == 0:
                 return row
         return None
 
     def evaluate_position(self, board, player_channel):
-        # On peut réutiliser la fonction evaluate_position du SmartAgent
-        return 0  # simplifié ici, à compléter comme dans SmartAgent
+        """
+        Évalue le plateau pour le joueur donné (channel 0 ou 1)
+        """
+        state = BitBoard.from_observation(board, self.connect)
+        score = state.evaluate()
+        # evaluate() est du point de vue du joueur au trait (channel 0)
+        return score if player_channel == 0 else -score
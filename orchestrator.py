@@ -0,0 +1,349 @@
+"""
+Subprocess-isolated tournament orchestrator
+
+Every agent runs in its own Python subprocess (one or more per agent, see
+processes_per_agent) and answers moves over a JSON line protocol on its
+stdin/stdout pipes. The orchestrator drives many games concurrently with
+asyncio. Each move has a wall-clock deadline:
+
+    - a move later than move_timeout forfeits the game, and the subprocess
+      (still busy with the late search) is killed and restarted
+    - a subprocess that dies or answers garbage forfeits the game and is
+      restarted
+    - an illegal move forfeits the game; the subprocess answered in time
+      and in protocol, so it stays in the pool as it is
+    - a restart that fails is retried with a growing delay; after
+      RESTART_ATTEMPTS failures the subprocess leaves the pool, and an
+      agent left with no subprocess forfeits its remaining games
+
+A slow or crashing agent therefore costs only its own games, and agents do
+not share an interpreter, a GIL or caches. For fair timing keep the number
+of busy subprocesses (concurrency) at or below the number of cores.
+
+Usage:
+    python orchestrator.py smart random minimax:depth=4 search:time_limit=0.1 --games 20 --move-timeout 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+from game_record import GameRecordWriter, replay, result_code
+from latency import LatencyHistogram, format_summary
+from ratings import bradley_terry
+
+SCRIPT = os.path.abspath(__file__)
+START_TIMEOUT = 30.0
+RESTART_ATTEMPTS = 3
+RESTART_BACKOFF = 0.5  # secondes avant la deuxième tentative, doublées ensuite
+
+
+class AgentCrashed(Exception):
+    """The agent subprocess exited or broke the protocol."""
+
+
+# ------------------------------------------------------------------
+# Côté sous-processus
+# ------------------------------------------------------------------
+
+def serve_agent(spec):
+    """
+    Subprocess main loop: build the agent, print "ready", then answer
+    {"id", "moves"} lines with {"id", "action", "elapsed"} lines.
+    """
+    from agent_registry import make_agent, silence_logs
+    silence_logs()
+    out = sys.stdout
+    sys.stdout = sys.stderr  # un print d'agent ne doit pas corrompre le protocole
+    agent = make_agent(spec)
+    out.write("ready\n")
+    out.flush()
+    for line in sys.stdin:
+        request = json.loads(line)
+        referee = replay(request["moves"])
+        start = time.perf_counter()
+        action = agent.choose_action(referee.view(), action_mask=referee.action_mask())
+        elapsed = time.perf_counter() - start
+        out.write(json.dumps({"id": request["id"], "action": int(action), "elapsed": elapsed}) + "\n")
+        out.flush()
+
+
+# ------------------------------------------------------------------
+# Côté orchestrateur
+# ------------------------------------------------------------------
+
+class AgentProcess:
+    """
+    One agent subprocess, used by one game at a time.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.proc = None
+        self.next_id = 0
+        self.restarts = 0
+
+    async def start(self):
+        self.proc = await asyncio.create_subprocess_exec(
+            sys.executable, SCRIPT, "--serve", self.spec,
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+        # Le temps d'import et de construction de l'agent n'est pas compté dans les coups
+        line = await asyncio.wait_for(self.proc.stdout.readline(), START_TIMEOUT)
+        if line.strip() != b"ready":
+            await self.kill()
+            raise AgentCrashed(f"{self.spec} failed to start")
+
+    async def kill(self):
+        if self.proc is not None and self.proc.returncode is None:
+            self.proc.kill()
+            await self.proc.wait()
+
+    async def restart(self):
+        await self.kill()
+        self.restarts += 1
+        await self.start()
+
+    async def close(self):
+        if self.proc is None or self.proc.returncode is not None:
+            return
+        self.proc.stdin.close()
+        try:
+            await asyncio.wait_for(self.proc.wait(), 2.0)
+        except asyncio.TimeoutError:
+            await self.kill()
+
+    async def move(self, moves, timeout=None):
+        """
+        Returns:
+            the column chosen by the agent
+
+        Raises:
+            asyncio.TimeoutError past `timeout` seconds, AgentCrashed if the
+            subprocess died or answered something else than a move
+        """
+        self.next_id += 1
+        request = json.dumps({"id": self.next_id, "moves": list(moves)}) + "\n"
+        try:
+            self.proc.stdin.write(request.encode())
+            await self.proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as exc:
+            raise AgentCrashed(f"{self.spec}: {exc}") from exc
+        line = await asyncio.wait_for(self.proc.stdout.readline(), timeout)
+        if not line:
+            raise AgentCrashed(f"{self.spec} exited with code {await self.proc.wait()}")
+        try:
+            response = json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise AgentCrashed(f"{self.spec} sent {line[:80]!r}") from exc
+        if response.get("id") != self.next_id:
+            raise AgentCrashed(f"{self.spec} answered request {response.get('id')}, expected {self.next_id}")
+        return response["action"]
+
+
+class Orchestrator:
+    """
+    Round-robin tournament between agent subprocesses.
+
+    Parameters:
+        agents: dict {name: agent spec} (see agent_registry)
+        move_timeout: wall-clock deadline of one move in seconds (None = none)
+        processes_per_agent: subprocesses started for each agent
+        concurrency: games played at the same time
+    """
+
+    def __init__(self, agents, move_timeout=1.0, processes_per_agent=2, concurrency=None):
+        self.agents = dict(agents)
+        self.move_timeout = move_timeout
+        self.processes_per_agent = processes_per_agent
+        self.concurrency = concurrency or os.cpu_count() or 1
+        self.pools = {}
+        self.latency = {name: LatencyHistogram() for name in self.agents}
+        self.forfeits = {name: 0 for name in self.agents}
+        self.timeouts = {name: 0 for name in self.agents}
+        self.crashes = {name: 0 for name in self.agents}
+        self.restart_failures = {name: 0 for name in self.agents}
+        self.live = {name: 0 for name in self.agents}  # sous-processus encore dans le pool
+
+    async def start(self):
+        for name, spec in self.agents.items():
+            processes = [AgentProcess(spec) for _ in range(self.processes_per_agent)]
+            await asyncio.gather(*(p.start() for p in processes))
+            self.pools[name] = asyncio.Queue()
+            for process in processes:
+                self.pools[name].put_nowait(process)
+            self.live[name] = len(processes)
+
+    async def close(self):
+        processes = []
+        for pool in self.pools.values():
+            while not pool.empty():
+                process = pool.get_nowait()
+                if process is not None:
+                    processes.append(process)
+        await asyncio.gather(*(p.close() for p in processes))
+
+    async def _restart(self, name, process):
+        """
+        Restart a timed-out or crashed subprocess, retrying with a backoff.
+
+        Returns:
+            True if it runs again, False if it was taken out of the pool
+        """
+        delay = RESTART_BACKOFF
+        for attempt in range(RESTART_ATTEMPTS):
+            if attempt:
+                await asyncio.sleep(delay)
+                delay *= 2
+            try:
+                await process.restart()
+                return True
+            except (AgentCrashed, asyncio.TimeoutError, OSError):
+                self.restart_failures[name] += 1
+                await process.kill()
+        self.live[name] -= 1
+        return False
+
+    async def _move(self, name, moves):
+        """
+        Returns:
+            the column played, or None if the agent forfeits this move
+        """
+        pool = self.pools[name]
+        process = await pool.get()
+        if process is None:
+            pool.put_nowait(None)  # plus aucun sous-processus : forfait, pour les autres parties aussi
+            return None
+        try:
+            start = time.perf_counter()
+            try:
+                action = await process.move(moves, self.move_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts[name] += 1
+            except AgentCrashed:
+                self.crashes[name] += 1
+            else:
+                self.latency[name].record(time.perf_counter() - start)
+                return action
+            if not await self._restart(name, process):
+                process = None
+            return None
+        finally:
+            if process is not None:
+                pool.put_nowait(process)
+            elif not self.live[name]:
+                pool.put_nowait(None)  # réveille les parties qui attendent un sous-processus
+
+    async def play_game(self, first, second):
+        """
+        Returns:
+            (winner name or None for a draw, forfeiting name or None, moves)
+        """
+        referee = replay([])
+        moves = []
+        players = (first, second)
+        while not referee.is_over():
+            name = players[referee.seat]
+            action = await self._move(name, moves)
+            if action is None or not referee.is_legal(action):
+                self.forfeits[name] += 1
+                return players[1 - referee.seat], name, moves
+            referee.play(action)
+            moves.append(action)
+        winner = None if referee.winner is None else players[referee.winner]
+        return winner, None, moves
+
+    async def run(self, games_per_match=2, record_writer=None):
+        """
+        Play games_per_match games for every pair, colours alternating.
+
+        Returns:
+            pair_results {(name_a, name_b): (wins_a, draws, wins_b)}
+        """
+        names = list(self.agents)
+        schedule = [(names[i], names[j], g) for i in range(len(names)) for j in range(i + 1, len(names))
+                    for g in range(games_per_match)]
+        pair_results = {(a, b): [0, 0, 0] for a, b, _ in schedule}
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def one_game(a, b, g):
+            first, second = (a, b) if g % 2 == 0 else (b, a)
+            async with slots:
+                winner, _, moves = await self.play_game(first, second)
+            if record_writer is not None:
+                seat = None if winner is None else (0 if winner == first else 1)
+                record_writer.write(moves, result_code(seat))
+            pair_results[(a, b)][0 if winner == a else 2 if winner == b else 1] += 1
+
+        await asyncio.gather(*(one_game(*game) for game in schedule))
+        return {pair: tuple(result) for pair, result in pair_results.items()}
+
+
+async def run_orchestrated(agents, games_per_match=2, move_timeout=1.0, processes_per_agent=2,
+                           concurrency=None, record_path=None):
+    """
+    Start the subprocesses, play the tournament and stop them.
+
+    Returns:
+        (pair_results, orchestrator) — the orchestrator holds latency,
+        forfeits, timeouts, crashes and restart failures per agent
+    """
+    orchestrator = Orchestrator(agents, move_timeout=move_timeout, processes_per_agent=processes_per_agent,
+                                concurrency=concurrency)
+    record_writer = GameRecordWriter(record_path) if record_path is not None else None
+    await orchestrator.start()
+    try:
+        pair_results = await orchestrator.run(games_per_match, record_writer=record_writer)
+    finally:
+        await orchestrator.close()
+        if record_writer is not None:
+            record_writer.close()
+    return pair_results, orchestrator
+
+
+def print_report(pair_results, orchestrator):
+    scores = {name: 0.0 for name in orchestrator.agents}
+    for (a, b), (wins_a, draws, wins_b) in pair_results.items():
+        scores[a] += wins_a + 0.5 * draws
+        scores[b] += wins_b + 0.5 * draws
+        print(f"{a} vs {b} : +{wins_a} ={draws} -{wins_b}")
+
+    ratings = bradley_terry(pair_results)
+    print("\n===== Classement Elo (Bradley-Terry, IC 95%) =====")
+    for name in sorted(ratings, key=lambda n: ratings[n][0], reverse=True):
+        elo, low, high = ratings[name]
+        print(f"{name}: {scores[name]} points, {elo:+.0f} [{low:+.0f}, {high:+.0f}]")
+
+    print("\n===== Temps par coup (IPC compris) =====")
+    for name, histogram in orchestrator.latency.items():
+        print(format_summary(name, histogram.summary()) +
+              f", {orchestrator.forfeits[name]} forfait(s), {orchestrator.timeouts[name]} dépassement(s), "
+              f"{orchestrator.crashes[name]} crash(s), {orchestrator.restart_failures[name]} échec(s) de redémarrage")
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["--serve"]:
+        serve_agent(argv[1])
+        return
+    parser = argparse.ArgumentParser(description="Round-robin tournament with one subprocess per agent")
+    parser.add_argument("agents", nargs="+", help="agent specs (see agent_registry)")
+    parser.add_argument("--games", type=int, default=2, help="games per pairing, colours alternate")
+    parser.add_argument("--move-timeout", type=float, default=1.0, help="seconds per move before forfeit")
+    parser.add_argument("--processes-per-agent", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=None, help="simultaneous games (default: CPU count)")
+    parser.add_argument("--record", default=None, help="append every game to this game_record file")
+    args = parser.parse_args(argv)
+
+    agents = {spec: spec for spec in args.agents}
+    pair_results, orchestrator = asyncio.run(run_orchestrated(
+        agents, games_per_match=args.games, move_timeout=args.move_timeout,
+        processes_per_agent=args.processes_per_agent, concurrency=args.concurrency, record_path=args.record))
+    print_report(pair_results, orchestrator)
+
+
+if __name__ == "__main__":
+    main()
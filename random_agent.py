@@ -1,8 +1,12 @@
 import random
-from loguru import logger
-import numpy as np
+import time
+
+from decision_trace import RANDOM, TRACE
 
 class RandomAgent:
+    stochastic = True
+    time_dependent = False
+
     def __init__(self, player_name="RandomAgent"):
         self.player_name = player_name
 
@@ -12,13 +16,14 @@ class RandomAgent:
 
     def _get_next_row(self, board, col):
         """Trouver la prochaine ligne libre dans la colonne."""
-        for row in range(5, -1, -1):
+        for row in range(board.shape[0] - 1, -1, -1):
             if board[row, col, 0] == 0 and board[row, col, 1] == 0:
                 return row
         return None
 
     def choose_action(self, observation, reward=0.0, terminated=False, truncated=False, info=None, action_mask=None):
         """Choisit un coup au hasard parmi les actions valides."""
+        start = time.perf_counter()
         if action_mask is None:
             raise ValueError("RandomAgent requires an action_mask to select valid actions.")
 
@@ -29,5 +34,6 @@ class RandomAgent:
         else:
             action = random.choice(valid_actions)
 
-        logger.debug(f"{self.player_name}: RANDOM -> column {action}")
+        if TRACE.enabled:
+            TRACE.record(self.player_name, RANDOM, action, time.perf_counter() - start)
         return action
@@ -0,0 +1,183 @@
+"""
+Ratings for Connect Four tournaments
+
+- elo_from_score / score_from_elo: logistic Elo scale
+- match_elo: Elo difference of one pairing with a confidence interval
+- wilson_interval: score of one pairing with a Wilson confidence interval
+- bradley_terry: ratings of a whole pool from pairwise results
+- SPRT: sequential probability ratio test to stop a pairing early
+
+Results are counted as (wins, draws, losses); a draw is worth half a point.
+"""
+
+import math
+
+ELO_PER_NATURAL = 400 / math.log(10)  # 1 unité de log-force = 173.7 Elo
+Z95 = 1.959964
+
+
+def score_from_elo(elo):
+    """Expected score of a player rated `elo` points above its opponent."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_from_score(score):
+    """
+    Elo difference matching an expected score in (0, 1).
+    Scores of exactly 0 or 1 map to -inf / +inf.
+    """
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+def _score_stats(wins, draws, losses):
+    """Mean score and per-game score variance of a trinomial result."""
+    n = wins + draws + losses
+    mean = (wins + 0.5 * draws) / n
+    variance = (wins * (1 - mean) ** 2 + draws * (0.5 - mean) ** 2 + losses * mean ** 2) / n
+    return mean, variance
+
+
+def match_elo(wins, draws, losses, z=Z95):
+    """
+    Elo difference of player A over player B with a confidence interval.
+
+    Parameters:
+        wins, draws, losses: results from A's point of view
+        z: normal quantile of the interval (1.96 = 95%)
+
+    Returns:
+        (elo, low, high); (0, -inf, inf) when no game was played
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0, -math.inf, math.inf
+    mean, variance = _score_stats(wins, draws, losses)
+    margin = z * math.sqrt(variance / n)
+    return elo_from_score(mean), elo_from_score(mean - margin), elo_from_score(mean + margin)
+
+
+def wilson_interval(wins, draws, losses, z=Z95):
+    """
+    Wilson score interval of the mean score (a draw counts as half a win).
+    Unlike the normal interval it stays inside [0, 1] for 0% or 100% scores.
+
+    Returns:
+        (score, low, high); (0.5, 0, 1) when no game was played
+    """
+    n = wins + draws + losses
+    if n == 0:
+        return 0.5, 0.0, 1.0
+    score = (wins + 0.5 * draws) / n
+    denom = 1 + z * z / n
+    centre = (score + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(score * (1 - score) / n + z * z / (4 * n * n)) / denom
+    return score, max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def bradley_terry(pair_results, prior_draws=1.0, iterations=1000, tol=1e-9, z=Z95):
+    """
+    Fit Bradley-Terry strengths to pairwise results (minorisation-maximisation).
+
+    Parameters:
+        pair_results: dict {(a, b): (wins_a, draws, wins_b)}
+        prior_draws: virtual draws added to every played pairing so that
+            undefeated players keep a finite rating
+        iterations, tol: stopping rule of the MM iterations
+        z: normal quantile of the intervals
+
+    Returns:
+        dict {player: (elo, low, high)}, Elo centred on a mean of 0
+    """
+    players = sorted({p for pair in pair_results for p in pair}, key=str)
+    wins = {p: 0.0 for p in players}
+    games = {}  # (a, b) -> nombre de parties, symétrique
+    for (a, b), (wa, d, wb) in pair_results.items():
+        n = wa + d + wb
+        if n == 0:
+            continue
+        wins[a] += wa + 0.5 * (d + prior_draws)
+        wins[b] += wb + 0.5 * (d + prior_draws)
+        games[(a, b)] = games.get((a, b), 0) + n + prior_draws
+        games[(b, a)] = games.get((b, a), 0) + n + prior_draws
+
+    opponents = {p: [] for p in players}
+    for (a, b), n in games.items():
+        opponents[a].append((b, n))
+
+    strength = {p: 1.0 for p in players}
+    for _ in range(iterations):
+        delta = 0.0
+        updated = {}
+        for p in players:
+            denom = sum(n / (strength[p] + strength[q]) for q, n in opponents[p])
+            updated[p] = wins[p] / denom if denom > 0 else strength[p]
+        # Normaliser par la moyenne géométrique
+        log_mean = sum(math.log(v) for v in updated.values()) / len(players)
+        for p in players:
+            value = updated[p] / math.exp(log_mean)
+            delta = max(delta, abs(math.log(value) - math.log(strength[p])))
+            strength[p] = value
+        if delta < tol:
+            break
+
+    ratings = {}
+    for p in players:
+        # Information de Fisher (diagonale) pour l'erreur standard
+        info = 0.0
+        for q, n in opponents[p]:
+            prob = strength[p] / (strength[p] + strength[q])
+            info += n * prob * (1 - prob)
+        elo = ELO_PER_NATURAL * math.log(strength[p])
+        margin = z * ELO_PER_NATURAL / math.sqrt(info) if info > 0 else math.inf
+        ratings[p] = (elo, elo - margin, elo + margin)
+    return ratings
+
+
+class SPRT:
+    """
+    Sequential probability ratio test of H0: elo = elo0 against H1: elo = elo1,
+    with the usual normal approximation of the trinomial log-likelihood ratio.
+
+    Feed results with update(); status() is "H1", "H0" or None (keep playing).
+    """
+
+    def __init__(self, elo0=0.0, elo1=50.0, alpha=0.05, beta=0.05):
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower = math.log(beta / (1 - alpha))
+        self.upper = math.log((1 - beta) / alpha)
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    def update(self, score):
+        """Add one game result (1, 0.5 or 0) from the tested player's side."""
+        if score == 1:
+            self.wins += 1
+        elif score == 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+
+    def llr(self):
+        n = self.wins + self.draws + self.losses
+        if n == 0:
+            return 0.0
+        # Une demi-victoire et une demi-défaite fictives : évite une variance
+        # nulle (et un arrêt prématuré) quand les premières parties sont identiques
+        mean, variance = _score_stats(self.wins + 0.5, self.draws, self.losses + 0.5)
+        s0 = score_from_elo(self.elo0)
+        s1 = score_from_elo(self.elo1)
+        return n * (s1 - s0) * (2 * mean - s0 - s1) / (2 * variance)
+
+    def status(self):
+        llr = self.llr()
+        if llr >= self.upper:
+            return "H1"
+        if llr <= self.lower:
+            return "H0"
+        return None
@@ -0,0 +1,101 @@
+"""
+Referee for Connect Four game loops
+
+The referee owns the game: the (6, 7, 2) board handed to the agents (as
+a read-only view) and its own bitboards, so a win is detected by looking
+only at the lines through the piece just placed. It never calls into the
+agents.
+"""
+
+import numpy as np
+
+from bitboard import COLS, ROWS, board_geometry
+
+CHANNELS = 2
+
+
+class Referee:
+    """
+    Rules and state of one game.
+
+    Seat 0 moves first. board[:, :, seat] holds the pieces of that seat;
+    observation() returns it from the point of view of the player to move.
+
+    Parameters:
+        rows, cols: board size (6 x 7 by default)
+        connect: pieces to align to win
+    """
+
+    __slots__ = ("board", "stones", "heights", "turn", "winner", "geometry", "_views")
+
+    def __init__(self, rows=ROWS, cols=COLS, connect=4):
+        self.geometry = board_geometry(rows, cols, connect)
+        self.board = np.zeros((rows, cols, CHANNELS), dtype=int)
+        # Vues en lecture seule créées une fois : elles suivent le plateau sans copie
+        self._views = (self.board.view(), self.board[:, :, ::-1])
+        for view in self._views:
+            view.flags.writeable = False
+        self.stones = [0, 0]
+        self.heights = list(self.geometry.bottoms)
+        self.turn = 0
+        self.winner = None  # siège gagnant (0 ou 1), None tant que personne n'a gagné
+
+    @property
+    def seat(self):
+        """Seat of the player to move."""
+        return self.turn & 1
+
+    def action_mask(self):
+        heights, tops = self.heights, self.geometry.tops
+        return [1 if heights[c] < tops[c] else 0 for c in self.geometry.columns]
+
+    def is_legal(self, col):
+        return 0 <= col < self.geometry.cols and self.heights[col] < self.geometry.tops[col]
+
+    def is_over(self):
+        return self.winner is not None or self.turn == self.geometry.size
+
+    def observation(self):
+        """
+        Board view for the player to move: channel 0 = its pieces,
+        channel 1 = the opponent's (same convention as PettingZoo).
+        """
+        if self.turn & 1 == 0:
+            return self.board
+        return self.board[:, :, ::-1]
+
+    def view(self):
+        """
+        Read-only observation() to hand to an agent.
+
+        No copy is made: the view always reflects the current board, and an
+        agent writing into it raises ValueError instead of corrupting the
+        game. Agents that simulate moves borrow a buffer from scratch.
+        """
+        return self._views[self.turn & 1]
+
+    def play(self, col):
+        """
+        Drop a piece of the player to move in column col.
+
+        Returns:
+            (row, won): numpy row where the piece landed, and whether it wins
+        """
+        if not self.is_legal(col):
+            raise ValueError(f"Illegal move: column {col}")
+        geometry = self.geometry
+        seat = self.turn & 1
+        bit = self.heights[col]
+        height = bit - geometry.bottoms[col]
+        row = geometry.rows - 1 - height
+        self.board[row, col, seat] = 1
+        pos = self.stones[seat] | (1 << bit)
+        self.stones[seat] = pos
+        self.heights[col] = bit + 1
+        self.turn += 1
+
+        for line in geometry.lines_through[bit]:
+            if pos & line == line:
+                self.winner = seat
+                return row, True
+        return row, False
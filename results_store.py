@@ -0,0 +1,207 @@
+"""
+Persistent tournament results
+
+Every finished game is written to a SQLite file, keyed by
+
+    (first player, its version, second player, its version, seed)
+
+where the version of an agent is a hash of the source file of its class
+and of its simple settings (depth, time_limit, ...). Colours are part of
+the key through the first/second order. A tournament run with a store
+(run_tournament(..., results_path=...)) only plays the games missing from
+it: adding an agent plays only its pairings, editing an agent's code
+invalidates only its games, and an interrupted run resumes where it
+stopped because each game is committed as soon as it ends.
+
+Usage:
+    python results_store.py standings results.db
+    python results_store.py invalidate results.db MinimaxAgent
+"""
+
+import argparse
+import hashlib
+import inspect
+import sqlite3
+import time
+
+from game_record import FIRST_WINS, SECOND_WINS, pack_record
+from ratings import bradley_terry
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    first TEXT NOT NULL,
+    first_version TEXT NOT NULL,
+    second TEXT NOT NULL,
+    second_version TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    forfeit INTEGER NOT NULL,
+    record BLOB NOT NULL,
+    played_at REAL NOT NULL,
+    PRIMARY KEY (first, first_version, second, second_version, seed)
+)
+"""
+
+
+# Attributs qui changent d'un coup à l'autre ou n'affectent pas le jeu
+VOLATILE_ATTRIBUTES = {"player_name", "start_time", "last_report", "stats", "tracer"}
+
+
+def agent_settings(agent):
+    """Sorted (name, value) pairs of the public attributes of simple type that configure an agent."""
+    agent = getattr(agent, "unwrapped", agent)  # enveloppes (decision_cache.CachedAgent)
+    return sorted((k, v) for k, v in vars(agent).items()
+                  if isinstance(v, (bool, int, float, str, type(None)))
+                  and not k.startswith("_") and k not in VOLATILE_ATTRIBUTES)
+
+
+def agent_version(agent):
+    """
+    Short hash identifying the code and settings of an agent instance:
+    the source file of its class and its public attributes of simple type.
+    """
+    agent = getattr(agent, "unwrapped", agent)  # enveloppes (decision_cache.CachedAgent)
+    digest = hashlib.sha1()
+    try:
+        with open(inspect.getsourcefile(type(agent)), "rb") as f:
+            digest.update(f.read())
+    except (TypeError, OSError):
+        digest.update(type(agent).__qualname__.encode())
+    digest.update(repr(agent_settings(agent)).encode())
+    return digest.hexdigest()[:12]
+
+
+class ResultsStore:
+    """
+    SQLite table of finished games (see the module docstring).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, first, first_version, second, second_version, seed):
+        """
+        Returns:
+            (result code, forfeit) of the stored game, or None if it was never played
+        """
+        row = self.conn.execute(
+            "SELECT result, forfeit FROM games WHERE first = ? AND first_version = ? "
+            "AND second = ? AND second_version = ? AND seed = ?",
+            (first, first_version, second, second_version, seed)).fetchone()
+        return None if row is None else (row[0], bool(row[1]))
+
+    def add(self, first, first_version, second, second_version, seed, moves, result, forfeit=False):
+        """
+        Store (or replace) one game and commit it immediately.
+
+        Parameters:
+            result: DRAW, FIRST_WINS or SECOND_WINS; a forfeited game is
+                stored as a win of the opponent with forfeit=True
+        """
+        record = pack_record(moves, result)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (first, first_version, second, second_version, seed, result, int(forfeit), record, time.time()))
+        self.conn.commit()
+
+    def invalidate(self, name, version=None):
+        """
+        Delete the games of an agent (only those of one version if given).
+
+        Returns:
+            number of deleted games
+        """
+        if version is None:
+            where, params = "first = ? OR second = ?", (name, name)
+        else:
+            where = "(first = ? AND first_version = ?) OR (second = ? AND second_version = ?)"
+            params = (name, version, name, version)
+        deleted = self.conn.execute(f"DELETE FROM games WHERE {where}", params).rowcount
+        self.conn.commit()
+        return deleted
+
+    def latest_versions(self):
+        """
+        Returns:
+            dict {name: version of its most recently played game}
+        """
+        versions = {}
+        rows = self.conn.execute("SELECT first, first_version, second, second_version FROM games ORDER BY played_at")
+        for first, first_version, second, second_version in rows:
+            versions[first] = first_version
+            versions[second] = second_version
+        return versions
+
+    def pair_results(self, versions=None):
+        """
+        Results per pairing, recomputed from the stored games.
+
+        Parameters:
+            versions: optional dict {name: version}; only games between these
+                agents at these versions are counted
+
+        Returns:
+            dict {(name_a, name_b): (wins_a, draws, wins_b)}, one entry per
+            unordered pairing (name_a sorts before name_b unless versions
+            gives another order)
+        """
+        rows = self.conn.execute("SELECT first, first_version, second, second_version, result FROM games")
+        order = {name: i for i, name in enumerate(versions)} if versions else None
+        results = {}
+        for first, first_version, second, second_version, result in rows:
+            if versions is not None and (versions.get(first) != first_version
+                                         or versions.get(second) != second_version):
+                continue
+            a, b = (first, second)
+            if (order[a] > order[b]) if order is not None else a > b:
+                a, b = b, a
+            winner = first if result == FIRST_WINS else second if result == SECOND_WINS else None
+            wins_a, draws, wins_b = results.get((a, b), (0, 0, 0))
+            if winner == a:
+                wins_a += 1
+            elif winner == b:
+                wins_b += 1
+            else:
+                draws += 1
+            results[(a, b)] = (wins_a, draws, wins_b)
+        return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect a tournament results store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("standings", help="Bradley-Terry ratings of the latest version of each agent")
+    p.add_argument("path")
+    p = sub.add_parser("invalidate", help="delete the games of an agent")
+    p.add_argument("path")
+    p.add_argument("name")
+    p.add_argument("--version", default=None)
+    args = parser.parse_args(argv)
+
+    with ResultsStore(args.path) as store:
+        if args.command == "invalidate":
+            print(f"{store.invalidate(args.name, args.version)} partie(s) supprimée(s)")
+            return
+        pair_results = store.pair_results(store.latest_versions())
+    for (a, b), (wins_a, draws, wins_b) in sorted(pair_results.items()):
+        print(f"{a} vs {b} : +{wins_a} ={draws} -{wins_b}")
+    ratings = bradley_terry(pair_results)
+    for name in sorted(ratings, key=lambda n: ratings[n][0], reverse=True):
+        elo, low, high = ratings[name]
+        print(f"{name}: {elo:+.0f} [{low:+.0f}, {high:+.0f}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Tournament schedulers for large agent pools
+
+A round robin (tournament.run_tournament) plays every pairing, n(n-1)/2 of
+them. These schedulers take the same agents_dict and rank the pool with
+far fewer games:
+
+- run_swiss: Swiss rounds. Each round pairs players with equal or close
+  scores who have not met yet, so log2(n) + a few rounds separate the pool.
+- run_adaptive: after one Swiss round, repeatedly plays the two neighbours
+  of the current Bradley-Terry ranking whose order is the least certain,
+  until every neighbouring order is settled or the game budget is spent.
+
+Both return (scores, ratings, pair_results) like run_tournament with
+return_ratings=True, ratings being Bradley-Terry estimates from every game.
+"""
+
+import math
+
+from latency import LatencyHistogram
+from ratings import Z95, bradley_terry
+from results_store import ResultsStore
+from tournament import play_match, print_report
+
+
+def swiss_pairings(names, scores, played, byes=()):
+    """
+    Pair players of close score who have not met yet.
+
+    Parameters:
+        names: players in a fixed tie-break order (e.g. current rating)
+        scores: dict {name: points}
+        played: set of frozenset({a, b}) pairings already played
+        byes: players who already had a bye
+
+    Returns:
+        (list of (a, b) pairs, name sitting out or None)
+    """
+    order = sorted(names, key=lambda n: -scores[n])  # tri stable : départage par `names`
+    bye = None
+    if len(order) % 2 == 1:
+        # Le moins bien classé sans exemption saute le tour
+        bye = next((n for n in reversed(order) if n not in byes), order[-1])
+        order.remove(bye)
+    pairs = []
+    while order:
+        a = order.pop(0)
+        # Adversaire le mieux classé pas encore rencontré, sinon le suivant
+        b = next((n for n in order if frozenset((a, n)) not in played), order[0])
+        order.remove(b)
+        pairs.append((a, b))
+    return pairs, bye
+
+
+class _Pool:
+    """Results, latency and store shared by the rounds of one scheduler run."""
+
+    def __init__(self, agents_dict, games_per_pairing, match_kwargs, results_path):
+        self.agents = agents_dict
+        self.games_per_pairing = games_per_pairing
+        self.match_kwargs = match_kwargs
+        self.names = list(agents_dict)
+        self.scores = {name: 0.0 for name in self.names}
+        self.pair_results = {}
+        self.latency = {agent.player_name: LatencyHistogram() for agent in agents_dict.values()}
+        self.timeouts = {agent.player_name: 0 for agent in agents_dict.values()}
+        self.store = ResultsStore(results_path) if results_path is not None else None
+        self.games = 0
+
+    def play(self, a, b):
+        # Paires rangées dans l'ordre de agents_dict, comme run_tournament
+        if self.names.index(a) > self.names.index(b):
+            a, b = b, a
+        wins_a, draws, wins_b = self.pair_results.get((a, b), (0, 0, 0))
+        result = play_match(self.agents[a], self.agents[b], self.games_per_pairing,
+                            latency=self.latency, timeouts=self.timeouts, store=self.store,
+                            first_game=wins_a + draws + wins_b, **self.match_kwargs)
+        self.pair_results[(a, b)] = (wins_a + result[0], draws + result[1], wins_b + result[2])
+        self.scores[a] += result[0] + 0.5 * result[1]
+        self.scores[b] += result[2] + 0.5 * result[1]
+        self.games += sum(result)
+        print(f"{a} vs {b} : +{result[0]} ={result[1]} -{result[2]}")
+
+    def swiss_round(self, played, byes, ratings=None):
+        order = self.names
+        if ratings:
+            order = sorted(self.names, key=lambda n: -ratings.get(n, (0,))[0])
+        pairs, bye = swiss_pairings(order, self.scores, played, byes)
+        if bye is not None:
+            byes.add(bye)
+        for a, b in pairs:
+            self.play(a, b)
+            played.add(frozenset((a, b)))
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+
+    def report(self):
+        ratings = bradley_terry(self.pair_results)
+        print_report(self.scores, ratings, self.latency, self.timeouts, self.match_kwargs.get("move_timeout"))
+        return self.scores, ratings, self.pair_results
+
+
+def run_swiss(agents_dict, rounds=None, games_per_pairing=2, results_path=None, **match_kwargs):
+    """
+    Swiss-system tournament.
+
+    Parameters:
+        agents_dict: dict {agent_name: agent_instance}
+        rounds: number of rounds (default ceil(log2(n)) + 2, at most n - 1)
+        games_per_pairing: games of each pairing, colours alternating
+        results_path: optional SQLite results store (see results_store)
+        match_kwargs: passed to play_match (move_timeout, on_timeout, verbose, ...)
+
+    Returns:
+        (scores, ratings, pair_results)
+    """
+    n = len(agents_dict)
+    if rounds is None:
+        rounds = min(n - 1, math.ceil(math.log2(max(n, 2))) + 2)
+    pool = _Pool(agents_dict, games_per_pairing, match_kwargs, results_path)
+    played, byes = set(), set()
+    try:
+        for r in range(rounds):
+            print(f"\n===== Ronde suisse {r + 1}/{rounds} =====")
+            ratings = bradley_terry(pool.pair_results) if pool.pair_results else None
+            pool.swiss_round(played, byes, ratings)
+    finally:
+        pool.close()
+    return pool.report()
+
+
+def misorder_probability(rating_a, rating_b, z=Z95):
+    """
+    Probability that two Bradley-Terry estimates (elo, low, high) are in the
+    wrong order, from their normal approximations.
+    """
+    sigma_a = (rating_a[2] - rating_a[1]) / (2 * z)
+    sigma_b = (rating_b[2] - rating_b[1]) / (2 * z)
+    spread = math.hypot(sigma_a, sigma_b)
+    if not math.isfinite(spread):
+        return 0.5
+    if spread == 0:
+        return 0.0
+    return 0.5 * math.erfc(abs(rating_a[0] - rating_b[0]) / spread / math.sqrt(2))
+
+
+def run_adaptive(agents_dict, max_games=None, batch=2, threshold=0.05, results_path=None, **match_kwargs):
+    """
+    Spend games where the ranking is still uncertain.
+
+    After one Swiss round (every agent but the bye plays once), the neighbours in the
+    Bradley-Terry ranking with the highest misorder probability play
+    `batch` more games, until every neighbouring pair is below `threshold`
+    or `max_games` games have been played.
+
+    Parameters:
+        agents_dict: dict {agent_name: agent_instance}
+        max_games: total game budget (default 8 games per agent)
+        batch: games added to the chosen pair at each step (even keeps colours balanced)
+        threshold: misorder probability below which a neighbouring order is settled
+        results_path: optional SQLite results store (see results_store)
+        match_kwargs: passed to play_match
+
+    Returns:
+        (scores, ratings, pair_results)
+    """
+    n = len(agents_dict)
+    if max_games is None:
+        max_games = 8 * n
+    pool = _Pool(agents_dict, batch, match_kwargs, results_path)
+    try:
+        print("\n===== Ronde initiale =====")
+        pool.swiss_round(set(), set())
+        while pool.games + batch <= max_games:
+            ratings = bradley_terry(pool.pair_results)
+            ranking = sorted(pool.names, key=lambda name: -ratings.get(name, (0,))[0])
+            candidates = [(misorder_probability(ratings.get(a, (0, -math.inf, math.inf)),
+                                                ratings.get(b, (0, -math.inf, math.inf))), a, b)
+                          for a, b in zip(ranking, ranking[1:])]
+            probability, a, b = max(candidates)
+            if probability < threshold:
+                break
+            pool.play(a, b)
+    finally:
+        pool.close()
+    print(f"\n{pool.games} parties jouées (round robin : {n * (n - 1) // 2} paires)")
+    return pool.report()
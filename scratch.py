@@ -0,0 +1,62 @@
+"""
+Scratch buffers for agents that simulate moves on the board
+
+The game loop hands agents a read-only view of the referee board
+(Referee.view). An agent that needs to write, e.g. to drop a test piece
+and undo it, borrows a buffer instead of allocating a copy every move:
+
+    with borrow(observation) as board:
+        board[row, col, 0] = 1
+        ...
+
+Buffers are reused across moves and games; one is allocated only when
+all buffers of that shape are already borrowed (nested or concurrent
+calls), so steady-state play allocates nothing.
+"""
+
+from contextlib import contextmanager
+
+
+class ScratchPool:
+    """
+    Free lists of writeable buffers, one per (shape, dtype).
+    """
+
+    def __init__(self):
+        self.free = {}
+        self.allocated = 0
+
+    @contextmanager
+    def borrow(self, source):
+        """
+        Lend a writeable buffer holding a copy of source.
+
+        Parameters:
+            source: array-like (any numpy view, writeable or not)
+
+        Returns:
+            context manager yielding the buffer; it goes back to the pool
+            on exit and must not be kept after that
+        """
+        import numpy as np  # déjà chargé par l'appelant : simple lecture de sys.modules
+        source = np.asarray(source)
+        key = (source.shape, source.dtype.str)
+        free = self.free.setdefault(key, [])
+        try:
+            buffer = free.pop()  # atomique sous le GIL
+        except IndexError:
+            buffer = np.empty(source.shape, dtype=source.dtype)
+            self.allocated += 1
+        np.copyto(buffer, source)
+        try:
+            yield buffer
+        finally:
+            free.append(buffer)
+
+
+_POOL = ScratchPool()
+
+
+def borrow(source):
+    """Borrow a scratch copy of source from the shared pool (see ScratchPool.borrow)."""
+    return _POOL.borrow(source)
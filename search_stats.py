@@ -0,0 +1,69 @@
+"""
+Search statistics for the Connect Four agents
+
+Each search agent takes `collect_stats=True` to fill a SearchStats per
+choose_action call; `agent.get_stats()` returns it as a dict.
+When collection is off the agent keeps `stats = None` and the search only
+pays an `is not None` test per counter site.
+"""
+
+import time
+
+
+class SearchStats:
+    """
+    Counters for one choose_action call.
+    """
+
+    __slots__ = (
+        "nodes", "leaf_evals", "beta_cutoffs", "first_move_cutoffs",
+        "tt_probes", "tt_hits", "max_depth", "playouts",
+        "_start", "elapsed",
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.max_depth = 0    # dernière profondeur complètement explorée
+        self.playouts = 0
+        self._start = time.perf_counter()
+        self.elapsed = 0.0
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self._start
+
+    def cutoff(self, move_index):
+        """Record a beta cutoff produced by the move_index-th move tried."""
+        self.beta_cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+    def as_dict(self):
+        """
+        Returns:
+            dict with the raw counters plus first_move_cutoff_rate,
+            tt_hit_rate, nodes_per_second and playouts_per_second
+        """
+        elapsed = self.elapsed
+        return {
+            "nodes": self.nodes,
+            "leaf_evals": self.leaf_evals,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.beta_cutoffs if self.beta_cutoffs else 0.0,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": self.tt_hits / self.tt_probes if self.tt_probes else 0.0,
+            "max_depth": self.max_depth,
+            "playouts": self.playouts,
+            "elapsed": elapsed,
+            "nodes_per_second": self.nodes / elapsed if elapsed > 0 else 0.0,
+            "playouts_per_second": self.playouts / elapsed if elapsed > 0 else 0.0,
+        }
@@ -0,0 +1,217 @@
+"""
+Sampled search-tree tracer for the negamax agents
+
+SearchStats (search_stats.py) gives totals per move. A SearchTracer shows
+where the nodes go: for a random sample of moves it records, for every
+iterative-deepening iteration,
+
+    - its time and whether it completed before the deadline
+    - the nodes visited at each ply below the root
+    - the legal moves of the expanded nodes (branching factor)
+    - the index of the move that caused each beta cutoff
+
+MinimaxAgent and agent.Agent take `tracer=SearchTracer(...)`. Moves that
+are not sampled pay one `is not None` test per node, so a tracer with a
+small sample_rate can stay on in production games.
+
+Usage:
+    tracer = SearchTracer(sample_rate=0.05)
+    agent = MinimaxAgent(depth=8, tracer=tracer)
+    ...
+    tracer.dump("trace.json")
+
+    python search_trace.py trace.json --folded trace.folded
+
+The folded file (one "frame;frame;... count" line per stack) is read by
+flamegraph.pl, speedscope or inferno: one tower per iteration whose width
+is its node count, split ply by ply.
+"""
+
+import argparse
+import json
+import random
+import time
+
+
+class MoveTrace:
+    """
+    Trace of one choose_action call, filled by the search.
+    """
+
+    __slots__ = ("agent", "ply", "iterations", "_current", "_start")
+
+    def __init__(self, agent, ply):
+        self.agent = agent
+        self.ply = ply
+        self.iterations = []
+        self._current = None
+        self._start = 0.0
+
+    def begin(self, depth):
+        """Start the iteration searching `depth` plies."""
+        self._current = {
+            "depth": depth,
+            "nodes": [0] * (depth + 1),     # indexés par profondeur restante
+            "moves": [0] * (depth + 1),
+            "cutoffs": [[] for _ in range(depth + 1)],
+        }
+        self._start = time.perf_counter()
+
+    def node(self, remaining):
+        self._current["nodes"][remaining] += 1
+
+    def expand(self, remaining, moves):
+        self._current["moves"][remaining] += moves
+
+    def cutoff(self, remaining, move_index):
+        cutoffs = self._current["cutoffs"][remaining]
+        while len(cutoffs) <= move_index:
+            cutoffs.append(0)
+        cutoffs[move_index] += 1
+
+    def end(self, completed):
+        """Close the current iteration (completed=False when the deadline stopped it)."""
+        it = self._current
+        depth = it["depth"]
+        plies = []
+        # Profondeur restante -> ply depuis la racine
+        for remaining in range(depth, -1, -1):
+            nodes, moves = it["nodes"][remaining], it["moves"][remaining]
+            if not nodes:
+                continue
+            expanded = it["nodes"][remaining - 1] if remaining > 0 else 0
+            plies.append({
+                "ply": depth - remaining,
+                "nodes": nodes,
+                "branching": moves / nodes,
+                "effective_branching": expanded / nodes,
+                "cutoffs": it["cutoffs"][remaining],
+            })
+        self.iterations.append({
+            "depth": depth,
+            "completed": completed,
+            "elapsed": time.perf_counter() - self._start,
+            "nodes": sum(it["nodes"]),
+            "plies": plies,
+        })
+        self._current = None
+
+    def as_dict(self):
+        return {"agent": self.agent, "ply": self.ply, "iterations": self.iterations}
+
+
+class SearchTracer:
+    """
+    Collects MoveTraces for a random fraction of the moves.
+
+    Parameters:
+        sample_rate: probability that a choose_action call is traced
+        seed: seed of the sampling (its own generator: the agents'
+            random tie-breaks are not disturbed)
+        max_traces: traces kept, the oldest are dropped beyond it
+    """
+
+    def __init__(self, sample_rate=0.05, seed=None, max_traces=1000):
+        self.sample_rate = sample_rate
+        self.rng = random.Random(seed)
+        self.max_traces = max_traces
+        self.traces = []
+        self.moves_seen = 0
+
+    def sample(self, agent, ply=None):
+        """
+        Decide whether to trace the coming search.
+
+        Returns:
+            a MoveTrace to fill, or None if this move is not sampled
+        """
+        self.moves_seen += 1
+        if self.rng.random() >= self.sample_rate:
+            return None
+        trace = MoveTrace(agent, ply)
+        self.traces.append(trace)
+        if len(self.traces) > self.max_traces:
+            del self.traces[0]
+        return trace
+
+    def as_dict(self):
+        return {
+            "sample_rate": self.sample_rate,
+            "moves_seen": self.moves_seen,
+            "moves": [trace.as_dict() for trace in self.traces],
+        }
+
+    def dump(self, path):
+        """Write the traces as JSON (see to_folded for a flame-graph view)."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=1)
+
+
+def to_folded(data):
+    """
+    Folded stacks of a dumped trace, summed over the sampled moves.
+
+    Stack "agent;depth d;ply 0;ply 1;...;ply k" counts the nodes visited at
+    ply k during iterations of depth d, so each frame is as wide as the
+    subtree below it.
+
+    Parameters:
+        data: dict as written by SearchTracer.dump
+
+    Returns:
+        list of "stack count" lines
+    """
+    counts = {}
+    for move in data["moves"]:
+        for it in move["iterations"]:
+            frames = [move["agent"], f"depth {it['depth']}"]
+            for ply in it["plies"]:
+                frames.append(f"ply {ply['ply']}")
+                key = ";".join(frames)
+                counts[key] = counts.get(key, 0) + ply["nodes"]
+    return [f"{stack} {count}" for stack, count in counts.items()]
+
+
+def summarize(data):
+    """
+    Per (agent, depth) averages over the sampled moves.
+
+    Returns:
+        dict {(agent, depth): {"iterations", "nodes", "elapsed", "completed"}}
+    """
+    rows = {}
+    for move in data["moves"]:
+        for it in move["iterations"]:
+            row = rows.setdefault((move["agent"], it["depth"]),
+                                  {"iterations": 0, "nodes": 0, "elapsed": 0.0, "completed": 0})
+            row["iterations"] += 1
+            row["nodes"] += it["nodes"]
+            row["elapsed"] += it["elapsed"]
+            row["completed"] += it["completed"]
+    for row in rows.values():
+        row["nodes"] /= row["iterations"]
+        row["elapsed"] /= row["iterations"]
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a search trace or convert it to folded stacks")
+    parser.add_argument("trace", help="JSON file written by SearchTracer.dump")
+    parser.add_argument("--folded", help="write folded stacks for a flame graph to this file")
+    args = parser.parse_args()
+
+    with open(args.trace, encoding="utf-8") as f:
+        data = json.load(f)
+    print(f"{len(data['moves'])} coups tracés sur {data['moves_seen']} (taux {data['sample_rate']})")
+    print(f"{'Agent':<24} {'Prof.':>5} {'Itér.':>6} {'Noeuds':>10} {'Temps (ms)':>11} {'Finies':>7}")
+    for (agent, depth), row in sorted(summarize(data).items()):
+        print(f"{agent:<24} {depth:>5} {row['iterations']:>6} {row['nodes']:>10.0f} "
+              f"{row['elapsed'] * 1000:>11.2f} {row['completed']:>7}")
+    if args.folded:
+        with open(args.folded, "w", encoding="utf-8") as f:
+            f.write("\n".join(to_folded(data)) + "\n")
+        print(f"Piles repliées écrites dans {args.folded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Self-play position dataset generator
+
+Plays games between copies of an existing agent (SmartAgent or agent.Agent)
+across a process pool and appends every position to memory-mapped arrays
+in an output directory:
+
+    stones.u64   (n, 2) uint64  pieces of the first / second player (bitboard layout of bitboard.py)
+    side.u8      (n,)   uint8   player to move (0 = first player)
+    move.i8      (n,)   int8    column played by the agent
+    result.i8    (n,)   int8    final result for the player to move (+1 / 0 / -1)
+    score.i16    (n,)   int16   optional solver score, NO_SCORE when absent
+    meta.json           committed row count, capacity, games played, settings
+
+Files grow by `chunk` rows at a time. meta.json is rewritten atomically
+after each batch of games, so an interrupted run resumes from the last
+committed row with `python selfplay_dataset.py OUT --positions N`.
+
+Usage:
+    python selfplay_dataset.py data/selfplay --positions 1000000 --agent smart --workers 8
+"""
+
+import argparse
+import json
+import os
+import random
+from multiprocessing import Pool
+
+import numpy as np
+
+from referee import Referee
+
+FORMAT_VERSION = 1
+NO_SCORE = np.iinfo(np.int16).min
+
+FIELDS = {
+    # nom: (fichier, dtype, colonnes)
+    "stones": ("stones.u64", np.uint64, 2),
+    "side": ("side.u8", np.uint8, 1),
+    "move": ("move.i8", np.int8, 1),
+    "result": ("result.i8", np.int8, 1),
+    "score": ("score.i16", np.int16, 1),
+}
+
+
+class PositionStore:
+    """
+    Preallocated memory-mapped arrays that grow in chunks.
+    """
+
+    def __init__(self, directory, chunk=1 << 20, settings=None):
+        self.directory = directory
+        self.chunk = chunk
+        os.makedirs(directory, exist_ok=True)
+        meta_path = os.path.join(directory, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+            if self.meta["version"] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported dataset version {self.meta['version']}")
+        else:
+            self.meta = {"version": FORMAT_VERSION, "count": 0, "capacity": 0, "games": 0,
+                         "settings": settings or {}}
+        self.arrays = {}
+        self._map(self.meta["capacity"])
+
+    @property
+    def count(self):
+        return self.meta["count"]
+
+    def _map(self, capacity):
+        """(Re)open every field file as a memmap of `capacity` rows."""
+        self.arrays = {}
+        for name, (filename, dtype, width) in FIELDS.items():
+            path = os.path.join(self.directory, filename)
+            nbytes = capacity * width * np.dtype(dtype).itemsize
+            with open(path, "ab") as f:
+                if f.tell() < nbytes:
+                    f.truncate(nbytes)
+            if capacity == 0:
+                continue
+            shape = (capacity, width) if width > 1 else (capacity,)
+            self.arrays[name] = np.memmap(path, dtype=dtype, mode="r+", shape=shape)
+        self.meta["capacity"] = capacity
+
+    def _reserve(self, rows):
+        needed = self.count + rows
+        if needed <= self.meta["capacity"]:
+            return
+        capacity = self.meta["capacity"]
+        while capacity < needed:
+            capacity += self.chunk
+        for array in self.arrays.values():
+            array.flush()
+        self._map(capacity)
+
+    def append(self, batch):
+        """Append a dict of equal-length numpy arrays (one entry per field)."""
+        rows = len(batch["move"])
+        self._reserve(rows)
+        start, end = self.count, self.count + rows
+        for name, array in self.arrays.items():
+            array[start:end] = batch[name]
+        self.meta["count"] = end
+
+    def commit(self, games):
+        """Flush the arrays, then record the new row count in meta.json."""
+        for array in self.arrays.values():
+            array.flush()
+        self.meta["games"] += games
+        meta_path = os.path.join(self.directory, "meta.json")
+        tmp_path = meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+
+def open_dataset(directory):
+    """
+    Read-only view of a dataset, limited to the committed rows.
+
+    Returns:
+        dict {field: np.memmap}
+    """
+    with open(os.path.join(directory, "meta.json")) as f:
+        meta = json.load(f)
+    count = meta["count"]
+    arrays = {}
+    for name, (filename, dtype, width) in FIELDS.items():
+        shape = (count, width) if width > 1 else (count,)
+        if count == 0:
+            arrays[name] = np.zeros(shape, dtype=dtype)
+        else:
+            arrays[name] = np.memmap(os.path.join(directory, filename), dtype=dtype, mode="r", shape=shape)
+    return arrays
+
+
+# ------------------------------------------------------------------
+# Self-play (exécuté dans les processus du pool)
+# ------------------------------------------------------------------
+
+_worker_agents = None
+_worker_settings = None
+
+
+def _make_agent(kind, time_limit, name):
+    if kind == "smart":
+        from smart_agent import SmartAgent
+        return SmartAgent(env=None, player_name=name)
+    if kind == "search":
+        from agent import Agent
+        agent = Agent(env=None, player_name=name)
+        agent.time_limit = time_limit
+        return agent
+    raise ValueError(f"Unknown agent kind {kind!r}")
+
+
+def _init_worker(settings):
+    global _worker_agents, _worker_settings
+    from agent_registry import silence_logs
+    silence_logs()  # pas de log par coup dans les workers
+    _worker_settings = settings
+    _worker_agents = (_make_agent(settings["agent"], settings["time_limit"], "P1"),
+                      _make_agent(settings["agent"], settings["time_limit"], "P2"))
+
+
+def play_selfplay_game(game_index):
+    """
+    Play one self-play game; the first random_plies moves are random so that
+    deterministic agents still produce distinct games.
+
+    Returns:
+        dict of numpy arrays with one row per position
+    """
+    settings = _worker_settings
+    rng = random.Random(settings["seed"] * 1_000_003 + game_index)
+    random.seed(rng.random())  # départage aléatoire des agents, reproductible
+    referee = Referee()
+    stones, sides, moves = [], [], []
+    while not referee.is_over():
+        mask = referee.action_mask()
+        if referee.turn < settings["random_plies"]:
+            col = rng.choice([c for c in range(len(mask)) if mask[c]])
+        else:
+            col = _worker_agents[referee.seat].choose_action(referee.view(), action_mask=mask)
+        stones.append((referee.stones[0], referee.stones[1]))
+        sides.append(referee.seat)
+        moves.append(col)
+        referee.play(col)
+
+    side = np.array(sides, dtype=np.uint8)
+    if referee.winner is None:
+        result = np.zeros(len(moves), dtype=np.int8)
+    else:
+        result = np.where(side == referee.winner, 1, -1).astype(np.int8)
+    return {
+        "stones": np.array(stones, dtype=np.uint64).reshape(-1, 2),
+        "side": side,
+        "move": np.array(moves, dtype=np.int8),
+        "result": result,
+        "score": np.full(len(moves), NO_SCORE, dtype=np.int16),
+    }
+
+
+def generate(directory, positions, agent="smart", time_limit=0.05, workers=None,
+             random_plies=4, seed=0, chunk=1 << 20, commit_every=256):
+    """
+    Generate self-play positions until the dataset holds at least `positions` rows.
+
+    Returns:
+        the number of committed rows
+    """
+    settings = {"agent": agent, "time_limit": time_limit, "random_plies": random_plies, "seed": seed}
+    store = PositionStore(directory, chunk=chunk, settings=settings)
+    if store.meta["settings"] != settings:
+        raise ValueError(f"{directory} was generated with {store.meta['settings']}, not {settings}")
+
+    # Reprise : les indices de partie continuent après les parties déjà validées
+    next_game = store.meta["games"]
+    with Pool(workers, initializer=_init_worker, initargs=(settings,)) as pool:
+        while store.count < positions:
+            indices = range(next_game, next_game + commit_every)
+            for game in pool.imap(play_selfplay_game, indices, chunksize=4):
+                store.append(game)
+            next_game += commit_every
+            store.commit(commit_every)
+            print(f"\r{store.count} positions, {store.meta['games']} parties", end="", flush=True)
+    print()
+    return store.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a self-play position dataset")
+    parser.add_argument("directory")
+    parser.add_argument("--positions", type=int, required=True, help="target number of positions")
+    parser.add_argument("--agent", choices=["smart", "search"], default="smart")
+    parser.add_argument("--time-limit", type=float, default=0.05, help="seconds per move for --agent search")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--random-plies", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=1 << 20, help="rows added each time the files grow")
+    args = parser.parse_args()
+    generate(args.directory, args.positions, agent=args.agent, time_limit=args.time_limit,
+             workers=args.workers, random_plies=args.random_plies, seed=args.seed, chunk=args.chunk)
+
+
+if __name__ == "__main__":
+    main()
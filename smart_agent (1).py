@@ -5,23 +5,33 @@ This agent uses rule-based heuristics to play strategically.
 """
 
 import random
-from loguru import logger
+import time
+
+from bitboard import board_geometry
+from decision_trace import BLOCK, CENTER, DOUBLE_THREAT, RANDOM, TRACE, WIN
+from scratch import borrow
 
 class SmartAgent:
     """
     A rule-based agent that plays strategically
     """
 
-    def __init__(self, env, player_name=None):
+    # Déterministe hormis le départage aléatoire final (voir decision_cache)
+    stochastic = False
+    time_dependent = False
+
+    def __init__(self, env, player_name=None, connect=4):
         """
         Initialize the smart agent
 
         Parameters:
             env: PettingZoo environment
             player_name: Optional name for the agent
+            connect: pieces to align (the board size comes from the observation)
         """
         self.env = env
         self.player_name = player_name or "SmartAgent"
+        self.connect = connect
         if env is not None:
             self.action_space = env.action_space(env.agents[0])
 
@@ -35,22 +45,38 @@ class SmartAgent:
         3. Create double threat
         4. Play center if available
         5. Random valid move
+
+        The rule that fired is recorded in decision_trace.TRACE.
+        """
+        start = time.perf_counter()
+        # Les règles simulent des coups : copie modifiable empruntée au pool,
+        # l'observation reçue peut être une vue en lecture seule du plateau
+        with borrow(observation) as board:
+            rule, action = self._decide(board, self._get_valid_actions(action_mask))
+        if TRACE.enabled:
+            TRACE.record(self.player_name, rule, action, time.perf_counter() - start)
+        return action
+
+    def _decide(self, board, valid_actions):
+        """
+        Apply the rules in priority order.
+
+        Parameters:
+            board: writeable numpy array (6, 7, 2), restored before returning
+            valid_actions: list of valid column indices
+
+        Returns:
+            (rule, column), rule being one of the decision_trace rule codes
         """
-        board = observation  # uniformiser le nom
-        # Get valid actions
-        valid_actions = self._get_valid_actions(action_mask)
-    
         # Rule 1: Try to win
         winning_move = self._find_winning_move(board, valid_actions, channel=0)
         if winning_move is not None:
-            logger.success(f"{self.player_name}: COUP GAGNANT -> colonne {winning_move}")
-            return winning_move
+            return WIN, winning_move
     
         # Rule 2: Block opponent
         blocking_move = self._find_winning_move(board, valid_actions, channel=1)
         if blocking_move is not None:
-            logger.warning(f"{self.player_name}: BLOQUER ADVERSAIRE -> colonne {blocking_move}")
-            return blocking_move
+            return BLOCK, blocking_move
     
         # Rule 3: Avoid giving opponent a double threat
         safe_actions = [col for col in valid_actions if not self._creates_double_threat(board, col, channel=1)]
@@ -60,20 +86,16 @@ class SmartAgent:
         # Rule 4: Create double threat for self
         for col in safe_actions:
             if self._creates_double_threat(board, col, channel=0):
-                logger.success(f"{self.player_name}: DOUBLE THREAT -> colonne {col}")
-                return col
+                return DOUBLE_THREAT, col
     
         # Rule 5: Center preference
-        center_preference = [3, 2, 4, 1, 5, 0, 6]
+        center_preference = board_geometry(board.shape[0], board.shape[1], self.connect).center_order
         for col in center_preference:
             if col in safe_actions:
-                logger.info(f"{self.player_name}: PRÉFÉRENCE CENTRE -> colonne {col}")
-                return col
+                return CENTER, col
     
         # Rule 6: Random fallback
-        action = random.choice(safe_actions)
-        logger.debug(f"{self.player_name}: COUP ALÉATOIRE -> colonne {action}")
-        return action
+        return RANDOM, random.choice(safe_actions)
 
     def _get_valid_actions(self, action_mask):
         """
@@ -122,24 +144,25 @@ class SmartAgent:
         Returns:
             row index (0-5) if space available, None if column full
         """
-        for row in range(5, -1, -1):  # commencer par le bas
+        for row in range(board.shape[0] - 1, -1, -1):  # commencer par le bas
             if board[row, col, 0] == 0 and board[row, col, 1] == 0:
                 return row
         return None  # colonne pleine
 
     def _check_win_from_position(self, board, row, col, channel):
         """
-        Check if placing a piece at (row, col) would create 4 in a row
+        Check if placing a piece at (row, col) would create `connect` in a row
 
         Parameters:
-            board: numpy array (6, 7, 2)
+            board: numpy array (6, 7, 2), or (rows, cols, 2) for a variant
             row: row index (0-5)
             col: column index (0-6)
             channel: 0 or 1 (which player's pieces to check)
 
         Returns:
-            True if this position creates 4 in a row/col/diag, False otherwise
+            True if this position creates `connect` in a row/col/diag, False otherwise
         """
+        rows, cols = board.shape[0], board.shape[1]
         directions = [(0, 1), (1, 0), (1, 1), (-1, 1)]  # horizontal, vertical, diag \, diag /
 
         for dr, dc in directions:
@@ -147,19 +170,19 @@ class SmartAgent:
 
             # Vérifier dans le sens positif
             r, c = row + dr, col + dc
-            while 0 <= r < 6 and 0 <= c < 7 and board[r, c, channel] == 1:
+            while 0 <= r < rows and 0 <= c < cols and board[r, c, channel] == 1:
                 count += 1
                 r += dr
                 c += dc
 
             # Vérifier dans le sens négatif
             r, c = row - dr, col - dc
-            while 0 <= r < 6 and 0 <= c < 7 and board[r, c, channel] == 1:
+            while 0 <= r < rows and 0 <= c < cols and board[r, c, channel] == 1:
                 count += 1
                 r -= dr
                 c -= dc
 
-            if count >= 4:
+            if count >= self.connect:
                 return True
 
         return False
@@ -197,7 +220,7 @@ class SmartAgent:
         """
         Évalue le plateau pour le joueur donné
         """
-        ROWS, COLS = 6, 7
+        ROWS, COLS = board.shape[0], board.shape[1]
         score = 0
         opponent_channel = 1 - player_channel
 
@@ -236,10 +259,11 @@ class SmartAgent:
                             count += 1
             return count
 
-        score += count_n_in_row(board, player_channel, 3) * 5
-        score += count_n_in_row(board, player_channel, 2) * 2
-        score -= count_n_in_row(board, opponent_channel, 3) * 4
-        score -= count_n_in_row(board, opponent_channel, 2) * 1
+        # Alignements à un et deux pions de la victoire (3 et 2 au puissance 4)
+        score += count_n_in_row(board, player_channel, self.connect - 1) * 5
+        score += count_n_in_row(board, player_channel, self.connect - 2) * 2
+        score -= count_n_in_row(board, opponent_channel, self.connect - 1) * 4
+        score -= count_n_in_row(board, opponent_channel, self.connect - 2) * 1
 
         # Centre
         center_col = COLS // 2
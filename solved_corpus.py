@@ -0,0 +1,244 @@
+"""
+Locally generated corpus of solved Connect Four positions
+
+Random legal games are truncated at a chosen ply and solved exactly by a
+deliberately simple reference solver that shares no code with the agents
+or with bitboard.py: a plain column-list board, negamax with alpha-beta and
+a dictionary of upper bounds.
+
+Scores use the usual convention of the standard test sets:
+    0                       draw with perfect play
+    (43 - n) // 2 > 0       the player to move wins, n = stones on the board
+                            when it plays its winning move
+    negative                the player to move loses (same scale)
+
+Files contain one "moves score" line per position, moves 1-based ("4453 -2").
+
+Usage:
+    python solved_corpus.py --set end --count 50
+    python solved_corpus.py --set middle --count 20 --node-budget 2000000
+"""
+
+import argparse
+import os
+import random
+import time
+
+WIDTH = 7
+HEIGHT = 6
+SOLVED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "solved")
+
+# Difficulté graduée : plage de plis de départ de chaque jeu de test
+SETS = {
+    "end": (28, 36),
+    "middle": (18, 27),
+    "begin": (8, 17),
+}
+
+
+class SolverBudgetExceeded(Exception):
+    """Raised when a position needs more nodes than the solver budget."""
+
+
+class ReferenceSolver:
+    """
+    Slow but straightforward exact solver.
+    """
+
+    def __init__(self, node_budget=None):
+        self.node_budget = node_budget
+        self.nodes = 0
+        self.columns = [[] for _ in range(WIDTH)]
+        self.moves = 0
+        self.bounds = {}  # clé de position -> borne supérieure du score
+
+    # --- plateau -------------------------------------------------------
+    def load(self, moves):
+        """Set up the position reached by the 0-based column sequence `moves`."""
+        self.columns = [[] for _ in range(WIDTH)]
+        self.moves = 0
+        for col in moves:
+            if not self.can_play(col):
+                raise ValueError(f"Illegal move sequence {moves}")
+            if self.is_winning_move(col):
+                raise ValueError(f"Move sequence {moves} contains a finished game")
+            self.play(col)
+
+    def can_play(self, col):
+        return len(self.columns[col]) < HEIGHT
+
+    def play(self, col):
+        self.columns[col].append(self.moves % 2)
+        self.moves += 1
+
+    def undo(self, col):
+        self.columns[col].pop()
+        self.moves -= 1
+
+    def _cell(self, col, row):
+        if 0 <= col < WIDTH and 0 <= row < len(self.columns[col]):
+            return self.columns[col][row]
+        return None
+
+    def is_winning_move(self, col, player=None):
+        """Would `player` (default: the player to move) make four in a row by playing col?"""
+        if player is None:
+            player = self.moves % 2
+        row = len(self.columns[col])
+        for dc, dr in ((1, 0), (0, 1), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                c, r = col + sign * dc, row + sign * dr
+                while self._cell(c, r) == player:
+                    count += 1
+                    c += sign * dc
+                    r += sign * dr
+            if count >= 4:
+                return True
+        return False
+
+    def key(self):
+        return tuple(tuple(column) for column in self.columns)
+
+    # --- résolution ------------------------------------------------------
+    def negamax(self, alpha, beta):
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            raise SolverBudgetExceeded()
+        if self.moves == WIDTH * HEIGHT:
+            return 0
+        for col in range(WIDTH):
+            if self.can_play(col) and self.is_winning_move(col):
+                return (WIDTH * HEIGHT + 1 - self.moves) // 2
+
+        upper = (WIDTH * HEIGHT - 1 - self.moves) // 2
+        key = self.key()
+        if key in self.bounds:
+            upper = min(upper, self.bounds[key])
+        if beta > upper:
+            beta = upper
+            if alpha >= beta:
+                return beta
+
+        for col in (3, 2, 4, 1, 5, 0, 6):
+            if not self.can_play(col):
+                continue
+            self.play(col)
+            score = -self.negamax(-beta, -alpha)
+            self.undo(col)
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        self.bounds[key] = alpha
+        return alpha
+
+    def solve(self, moves):
+        """
+        Exact score of the position after `moves` (0-based columns).
+        """
+        self.load(moves)
+        self.nodes = 0
+        return self.negamax(-WIDTH * HEIGHT, WIDTH * HEIGHT)
+
+
+# ------------------------------------------------------------------
+# GÉNÉRATION
+# ------------------------------------------------------------------
+
+def random_game_prefix(rng, ply):
+    """
+    Random legal moves up to `ply`, or None if the game ended before or if
+    the final position is decided by a one-move tactic (immediate win or
+    forced block), which would make the test trivial.
+    """
+    solver = ReferenceSolver()
+    moves = []
+    while solver.moves < ply:
+        legal = [c for c in range(WIDTH) if solver.can_play(c)]
+        col = rng.choice(legal)
+        if solver.is_winning_move(col):
+            return None
+        solver.play(col)
+        moves.append(col)
+    legal = [c for c in range(WIDTH) if solver.can_play(c)]
+    if any(solver.is_winning_move(c) for c in legal):
+        return None
+    # Menace adverse immédiate : l'adversaire gagnerait-il en jouant là ?
+    opponent = (solver.moves + 1) % 2
+    if any(solver.is_winning_move(c, opponent) for c in legal):
+        return None
+    return moves
+
+
+def generate_set(name, count, seed=0, node_budget=5_000_000, verbose=True):
+    """
+    Returns:
+        list of (moves, score, seconds) for `count` solved positions of the set
+    """
+    low, high = SETS[name]
+    rng = random.Random(f"{name}-{seed}")
+    solved = []
+    skipped = 0
+    while len(solved) < count:
+        moves = random_game_prefix(rng, rng.randint(low, high))
+        if moves is None:
+            continue
+        solver = ReferenceSolver(node_budget=node_budget)
+        start = time.perf_counter()
+        try:
+            score = solver.solve(moves)
+        except SolverBudgetExceeded:
+            skipped += 1
+            continue
+        solved.append((moves, score, time.perf_counter() - start))
+        if verbose:
+            print(f"\r{name}: {len(solved)}/{count} résolues ({skipped} hors budget)", end="", flush=True)
+    if verbose:
+        print()
+    return solved
+
+
+def set_path(name):
+    return os.path.join(SOLVED_DIR, f"{name}.txt")
+
+
+def write_set(path, solved):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        for moves, score, _ in solved:
+            f.write("".join(str(c + 1) for c in moves) + f" {score}\n")
+
+
+def read_set(path):
+    """
+    Yields:
+        (moves, score) with 0-based columns
+    """
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            moves = [int(ch) - 1 for ch in parts[0]] if len(parts) == 2 else []
+            yield moves, int(parts[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate solved Connect Four positions")
+    parser.add_argument("--set", choices=sorted(SETS), default="end")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--node-budget", type=int, default=5_000_000,
+                        help="positions needing more solver nodes are skipped")
+    parser.add_argument("--out", default=None)
+    args = parser.parse_args(argv)
+    solved = generate_set(args.set, args.count, seed=args.seed, node_budget=args.node_budget)
+    path = args.out or set_path(args.set)
+    write_set(path, solved)
+    total = sum(seconds for _, _, seconds in solved)
+    print(f"{len(solved)} positions écrites dans {path} ({total:.1f}s de résolution)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Parameter sweep of one agent against a fixed opponent
+
+Each configuration of the swept parameter plays N games against the
+opponent across a process pool, alternating colours. For every
+configuration the sweep reports:
+
+    score with a Wilson confidence interval (and the matching Elo)
+    per-move time distribution of the swept agent (mean / p50 / p95 / p99 / max)
+    nodes searched per move and completed depth, when the agent exposes get_stats
+    effective branching factor: geometric mean over moves of nodes ** (1 / depth)
+
+Agents are given as agent_registry specs, so the same tool sweeps the depth
+of MinimaxAgent or the time budget of agent.Agent.
+
+Usage:
+    python sweep.py --agent minimax --vary depth=2,3,4,5,6 --set time_limit=1.0 --games 40
+    python sweep.py --agent search --vary time_limit=0.01,0.05,0.1 --opponent smart --csv sweep.csv
+"""
+
+import argparse
+import csv
+import json
+import math
+import random
+from multiprocessing import Pool
+
+from agent_registry import make_agent, parse_spec, parse_value, silence_logs
+from latency import LatencyHistogram
+from ratings import elo_from_score, wilson_interval
+from tournament import simulate_game
+
+COLUMNS = ["config", "games", "wins", "draws", "losses", "score", "score_low", "score_high", "elo",
+           "move_mean", "move_p50", "move_p95", "move_p99", "move_max", "timeouts",
+           "nodes_per_move", "depth_mean", "branching_factor"]
+
+
+class StatsRecorder:
+    """
+    Forwards choose_action to an agent and keeps (nodes, max_depth) of each move.
+    """
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.player_name = agent.player_name
+        self.searches = []
+
+    def choose_action(self, observation, **kwargs):
+        action = self.agent.choose_action(observation, **kwargs)
+        stats = self.agent.get_stats() if hasattr(self.agent, "get_stats") else {}
+        if stats:
+            self.searches.append((stats["nodes"], stats["max_depth"]))
+        return action
+
+
+def config_specs(agent, vary, fixed=None):
+    """
+    Parameters:
+        agent: agent_registry name ("minimax", "search", ...)
+        vary: (parameter, list of values)
+        fixed: dict of parameters shared by every configuration
+
+    Returns:
+        list of agent specs, one per value of the swept parameter
+    """
+    key, values = vary
+    params = dict(fixed or {})
+    specs = []
+    for value in values:
+        params[key] = value
+        spec = f"{agent}:" + ",".join(f"{k}={v}" for k, v in params.items())
+        parse_spec(spec)  # nom et syntaxe vérifiés avant de lancer le pool
+        specs.append(spec)
+    return specs
+
+
+# ------------------------------------------------------------------
+# Parties (exécutées dans les processus du pool)
+# ------------------------------------------------------------------
+
+_worker_agents = {}
+
+
+def _init_worker():
+    silence_logs()  # pas de log par coup dans les workers
+
+
+def _agent(spec, name):
+    if (spec, name) not in _worker_agents:
+        _worker_agents[(spec, name)] = make_agent(spec, player_name=name, collect_stats=True)
+    return _worker_agents[(spec, name)]
+
+
+def play_sweep_game(task):
+    """
+    Play one game of a configuration; even games give the swept agent the first move.
+
+    Returns:
+        dict with the score of the swept agent, its move times and search stats
+    """
+    index, spec, opponent, game, move_timeout, seed = task
+    random.seed(seed * 1_000_003 + index * 10_007 + game)
+    subject = StatsRecorder(_agent(spec, "subject"))
+    other = _agent(opponent, "opponent")
+    seat = game % 2
+    first, second = (subject, other) if seat == 0 else (other, subject)
+    winner, details = simulate_game(first, second, move_timeout=move_timeout, return_details=True)
+    score = 1.0 if winner == "subject" else 0.0 if winner == "opponent" else 0.5
+    return {
+        "config": index,
+        "score": score,
+        "latency": details["latency"][seat].samples,
+        "timeouts": details["timeouts"][seat],
+        "searches": subject.searches,
+    }
+
+
+# ------------------------------------------------------------------
+# Agrégation
+# ------------------------------------------------------------------
+
+def summarize(spec, games):
+    """
+    One result row (see COLUMNS) from the per-game dicts of a configuration.
+    """
+    wins = sum(1 for g in games if g["score"] == 1.0)
+    losses = sum(1 for g in games if g["score"] == 0.0)
+    draws = len(games) - wins - losses
+    score, low, high = wilson_interval(wins, draws, losses)
+
+    latency = LatencyHistogram()
+    searches = []
+    for g in games:
+        latency.samples.extend(g["latency"])
+        searches.extend(g["searches"])
+    moves = latency.summary()
+
+    row = {
+        "config": spec, "games": len(games), "wins": wins, "draws": draws, "losses": losses,
+        "score": score, "score_low": low, "score_high": high, "elo": elo_from_score(score),
+        "move_mean": moves["mean"], "move_p50": moves["p50"], "move_p95": moves["p95"],
+        "move_p99": moves["p99"], "move_max": moves["max"],
+        "timeouts": sum(g["timeouts"] for g in games),
+        "nodes_per_move": None, "depth_mean": None, "branching_factor": None,
+    }
+    if searches:
+        row["nodes_per_move"] = sum(n for n, _ in searches) / len(searches)
+        row["depth_mean"] = sum(d for _, d in searches) / len(searches)
+        logs = [math.log(n) / d for n, d in searches if n > 1 and d > 0]
+        if logs:
+            row["branching_factor"] = math.exp(sum(logs) / len(logs))
+    return row
+
+
+def run_sweep(agent, vary, fixed=None, opponent="smart", games=40, workers=None,
+              move_timeout=None, seed=0):
+    """
+    Play every configuration against `opponent`.
+
+    Parameters:
+        agent, vary, fixed: see config_specs
+        opponent: agent spec of the fixed opponent
+        games: games per configuration (colours alternate)
+        workers: pool size (None = one per CPU)
+        move_timeout: referee deadline per move, late moves are replaced
+        seed: base seed of the per-game random generators
+
+    Returns:
+        list of result rows, one per configuration
+    """
+    specs = config_specs(agent, vary, fixed)
+    parse_spec(opponent)
+    tasks = [(i, spec, opponent, game, move_timeout, seed)
+             for game in range(games) for i, spec in enumerate(specs)]
+    per_config = [[] for _ in specs]
+    with Pool(workers, initializer=_init_worker) as pool:
+        for done, result in enumerate(pool.imap_unordered(play_sweep_game, tasks), 1):
+            per_config[result["config"]].append(result)
+            print(f"\r{done}/{len(tasks)} parties", end="", flush=True)
+    print()
+    return [summarize(spec, results) for spec, results in zip(specs, per_config)]
+
+
+def format_row(row):
+    text = (f"{row['config']:<36} score {row['score']:6.1%} [{row['score_low']:.1%}, {row['score_high']:.1%}] "
+            f"({row['wins']}-{row['draws']}-{row['losses']})  coup p50={row['move_p50'] * 1000:7.2f}ms "
+            f"p95={row['move_p95'] * 1000:7.2f}ms")
+    if row["nodes_per_move"] is not None:
+        text += f"  noeuds/coup={row['nodes_per_move']:9.0f} prof={row['depth_mean']:4.1f}"
+    if row["branching_factor"] is not None:
+        text += f" b*={row['branching_factor']:.2f}"
+    return text
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path, rows, settings):
+    with open(path, "w") as f:
+        json.dump({"settings": settings, "results": rows}, f, indent=2)
+
+
+def _parse_vary(text):
+    key, sep, values = text.partition("=")
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected param=v1,v2,... not {text!r}")
+    return key.strip(), [parse_value(v.strip()) for v in values.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep one agent parameter against a fixed opponent")
+    parser.add_argument("--agent", default="minimax", help="agent_registry name of the swept agent")
+    parser.add_argument("--vary", type=_parse_vary, default=("depth", [2, 3, 4, 5, 6]),
+                        help="swept parameter, e.g. depth=2,3,4 or time_limit=0.01,0.1")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="fixed parameter of the swept agent (repeatable)")
+    parser.add_argument("--opponent", default="smart")
+    parser.add_argument("--games", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--move-timeout", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", default=None)
+    parser.add_argument("--json", default=None)
+    args = parser.parse_args(argv)
+
+    _, fixed = parse_spec(f"{args.agent}:" + ",".join(args.set))
+    rows = run_sweep(args.agent, args.vary, fixed=fixed, opponent=args.opponent, games=args.games,
+                     workers=args.workers, move_timeout=args.move_timeout, seed=args.seed)
+    for row in rows:
+        print(format_row(row))
+    if args.csv:
+        write_csv(args.csv, rows)
+    if args.json:
+        settings = {"agent": args.agent, "vary": list(args.vary), "fixed": fixed, "opponent": args.opponent,
+                    "games": args.games, "move_timeout": args.move_timeout, "seed": args.seed}
+        write_json(args.json, rows, settings)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# test_agent_server.py
+# Tests du serveur d'agents (LRU par partie, protocole asyncio sur socket Unix)
+
+import asyncio
+import os
+import tempfile
+
+import agent_server
+from agent_server import AgentClient, AgentServer, choose_move, end_game, live_games
+from game_record import replay
+
+
+def test_lru_keeps_recent_games():
+    saved = agent_server._capacity
+    agent_server._capacity = 2
+    try:
+        choose_move("a", "random", [])
+        choose_move("b", "random", [3])
+        first = agent_server._games["a"][1]
+        choose_move("a", "random", [3, 3])  # "a" redevient la plus récente
+        choose_move("c", "random", [])      # "b" est évincée
+        assert list(agent_server._games) == ["a", "c"]
+        assert agent_server._games["a"][1] is first  # même agent pour toute la partie
+        assert end_game("a") and not end_game("b")
+        assert live_games() == 1
+    finally:
+        agent_server._games.clear()
+        agent_server._capacity = saved
+    print("test_lru_keeps_recent_games: Passed")
+
+
+async def _play_games(path, count):
+    async with AgentClient(path) as client:
+        async def play(game):
+            moves = []
+            referee = replay(moves)
+            while not referee.is_over():
+                spec = "smart" if referee.seat == 0 else "random"
+                action = await client.move(game, spec, moves)
+                assert referee.is_legal(action)
+                referee.play(action)
+                moves.append(action)
+            await client.end(game)
+            return referee.winner
+
+        winners = await asyncio.gather(*(play(f"g{i}") for i in range(count)))
+        stats = await client.request({"op": "stats"})
+        try:
+            await client.request({"game": "x", "agent": "nope", "moves": []})
+            error = None
+        except RuntimeError as exc:
+            error = str(exc)
+        return winners, stats, error
+
+
+def test_server_concurrent_games():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "agents.sock")
+        server = AgentServer(workers=2, capacity=8)
+
+        async def main():
+            serving = asyncio.create_task(server.serve_unix(path))
+            while not os.path.exists(path):
+                await asyncio.sleep(0.01)
+            try:
+                return await _play_games(path, 6)
+            finally:
+                serving.cancel()
+
+        try:
+            winners, stats, error = asyncio.run(main())
+        finally:
+            server.close()
+    assert len(winners) == 6
+    assert stats["games"] == [0, 0]  # toutes les parties ont été terminées par "end"
+    assert "Unknown agent" in error
+    print("test_server_concurrent_games: Passed")
+
+
+if __name__ == "__main__":
+    test_lru_keeps_recent_games()
+    test_server_concurrent_games()
+    print("\nTous les tests agent_server sont passés !")
@@ -0,0 +1,62 @@
+# test_benchmark.py
+# Tests du corpus, de la courbe force / budget de temps et du démarrage à froid
+
+from agent_registry import AGENTS
+from benchmark import (budget_curve, cheapest_budget, corpus_path, load_corpus, main, make_corpus,
+                       print_startup, startup_profile)
+from bitboard import BitBoard
+
+
+def test_corpus_positions_need_a_search():
+    for positions in (load_corpus(corpus_path()), make_corpus(per_stratum=10, seed=3)):
+        assert len({tuple(moves) for moves in positions}) == len(positions)
+        for moves in positions:
+            state = BitBoard()
+            for col in moves:
+                state.play(col)
+            assert not any(state.is_winning_move(col) for col in state.legal_moves()), moves
+    # Le corpus versionné n'est pas réécrit par défaut
+    assert main(["make-corpus"]) == 1
+    print("test_corpus_positions_need_a_search: Passed")
+
+
+def test_cheapest_budget():
+    curve = [
+        {"budget_ms": 100, "move_mean_ms": 95, "elo": 120},
+        {"budget_ms": 10, "move_mean_ms": 9, "elo": -80},
+        {"budget_ms": 50, "move_mean_ms": 48, "elo": 60},
+    ]
+    assert cheapest_budget(curve, 50)["budget_ms"] == 50
+    assert cheapest_budget(curve, -100)["budget_ms"] == 10
+    assert cheapest_budget(curve, 200) is None
+    print("test_cheapest_budget: Passed")
+
+
+def test_budget_curve_one_point_per_budget():
+    curve = budget_curve("mcts", [0.002, 0.004], opponent="random", games=2, workers=1)
+    assert [p["budget_ms"] for p in curve] == [2, 4]
+    for point in curve:
+        assert point["games"] == 2
+        assert point["elo_low"] <= point["elo"] <= point["elo_high"]
+        assert point["moves_per_second"] > 0
+    print("test_budget_curve_one_point_per_budget: Passed")
+
+
+def test_agent_imports_stay_light():
+    # Chaque agent dans un interpréteur neuf : ni numpy ni loguru à l'import
+    results = {}
+    for name in AGENTS:
+        spec = name if name in ("smart", "random") else f"{name}:time_limit=0.01"
+        results[spec] = startup_profile(spec, repeat=1)
+        assert results[spec]["heavy"] == [], (spec, results[spec]["heavy"])
+        assert 0 < results[spec]["first_move"] < results[spec]["total"]
+    assert print_startup(results, budget=60.0) == []
+    print("test_agent_imports_stay_light: Passed")
+
+
+if __name__ == "__main__":
+    test_corpus_positions_need_a_search()
+    test_cheapest_budget()
+    test_budget_curve_one_point_per_budget()
+    test_agent_imports_stay_light()
+    print("\nTous les tests benchmark sont passés !")
@@ -0,0 +1,115 @@
+# test_connect_four_env.py
+# Tests de l'environnement bitboard (API AEC de PettingZoo) et parité avec connect_four_v3
+
+import random
+
+import numpy as np
+import pytest
+
+import connect_four_env
+
+try:
+    from pettingzoo.classic import connect_four_v3
+except ImportError:
+    connect_four_v3 = None
+
+needs_pettingzoo = pytest.mark.skipif(connect_four_v3 is None, reason="pettingzoo is not installed")
+
+
+def play_random_game(env, rng, log=None):
+    """
+    Play the usual agent_iter() / last() loop with random legal moves.
+
+    Returns:
+        dict {agent: final cumulative reward}
+    """
+    env.reset(seed=0)
+    final = {}
+    for agent in env.agent_iter():
+        obs, reward, terminated, truncated, info = env.last()
+        if log is not None:
+            log.append((agent, obs["observation"].tolist(), obs["action_mask"].tolist(),
+                        reward, terminated, truncated))
+        if terminated or truncated:
+            final[agent] = reward
+            action = None
+        else:
+            action = rng.choice([c for c, ok in enumerate(obs["action_mask"]) if ok])
+        env.step(action)
+    return final
+
+
+def test_observation_layout():
+    env = connect_four_env.env()
+    env.reset()
+    env.step(3)
+    obs = env.observe("player_1")
+    assert obs["observation"].dtype == np.int8 and obs["observation"].shape == (6, 7, 2)
+    # Vu par player_1 : le pion adverse est dans le canal 1, en bas du plateau
+    assert obs["observation"][5, 3, 1] == 1 and obs["observation"].sum() == 1
+    assert obs["action_mask"].tolist() == [1] * 7
+    assert env.observe("player_0")["action_mask"].tolist() == [0] * 7
+    print("test_observation_layout: Passed")
+
+
+def test_win_rewards_and_termination_order():
+    env = connect_four_env.env()
+    env.reset()
+    for col in [0, 1, 0, 1, 0, 1, 0]:
+        env.step(col)
+    order = []
+    for agent in env.agent_iter():
+        _, reward, terminated, _, _ = env.last()
+        assert terminated
+        order.append((agent, reward))
+        env.step(None)
+    assert order == [("player_1", -1), ("player_0", 1)]
+    assert env.agents == []
+    print("test_win_rewards_and_termination_order: Passed")
+
+
+def test_illegal_move_loses():
+    env = connect_four_env.env()
+    env.reset()
+    for col in [0, 0, 0, 0, 0, 0]:
+        env.step(col)
+    with pytest.warns(UserWarning):
+        env.step(0)
+    _, reward, terminated, truncated, _ = env.last()
+    assert env.agent_selection == "player_0" and reward == -1
+    assert terminated and truncated
+    env.step(None)
+    _, reward, _, _, _ = env.last()
+    assert env.agent_selection == "player_1" and reward == 0
+    print("test_illegal_move_loses: Passed")
+
+
+def test_random_games_finish():
+    env = connect_four_env.env()
+    rng = random.Random(3)
+    for _ in range(200):
+        final = play_random_game(env, rng)
+        assert sorted(final) == ["player_0", "player_1"]
+        assert sum(final.values()) == 0
+    print("test_random_games_finish: Passed")
+
+
+@needs_pettingzoo
+def test_parity_with_pettingzoo():
+    fast, reference = connect_four_env.env(), connect_four_v3.env()
+    for seed in range(300):
+        fast_log, reference_log = [], []
+        play_random_game(fast, random.Random(seed), fast_log)
+        play_random_game(reference, random.Random(seed), reference_log)
+        assert fast_log == reference_log, f"seed {seed}"
+    print("test_parity_with_pettingzoo: Passed")
+
+
+if __name__ == "__main__":
+    test_observation_layout()
+    test_win_rewards_and_termination_order()
+    test_illegal_move_loses()
+    test_random_games_finish()
+    if connect_four_v3 is not None:
+        test_parity_with_pettingzoo()
+    print("\nTous les tests connect_four_env sont passés !")
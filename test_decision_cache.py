@@ -0,0 +1,118 @@
+# test_decision_cache.py
+# Tests du cache de décisions (LRU borné, désactivation automatique)
+
+from agent import Agent
+import numpy as np
+
+from decision_cache import CachedAgent, DecisionCache, board_key, is_cacheable
+from mcts_agent import MCTSAgent
+from minimax_agent import MinimaxAgent
+from random_agent import RandomAgent
+from referee import Referee
+from smart_agent import SmartAgent
+from tournament import simulate_game
+
+
+class CountingMinimax(MinimaxAgent):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._calls = 0  # privé : un compteur public changerait la configuration à chaque coup
+
+    def choose_action(self, board, **kwargs):
+        self._calls += 1
+        return super().choose_action(board, **kwargs)
+
+
+def test_declarations():
+    assert is_cacheable(SmartAgent(env=None))
+    assert is_cacheable(MinimaxAgent(depth=4))
+    assert not is_cacheable(MinimaxAgent(depth=4, time_limit=0.1))
+    assert not is_cacheable(RandomAgent())
+    assert not is_cacheable(MCTSAgent(time_limit=0.01))
+    assert not is_cacheable(Agent(env=None))
+    assert not is_cacheable(object())  # rien déclaré : pas de cache
+    print("test_declarations: Passed")
+
+
+def test_repeated_positions_hit_the_cache():
+    inner = CountingMinimax(depth=4)
+    agent = CachedAgent(inner)
+    referee = Referee()
+    referee.play(3)
+    first = agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    again = agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    assert first == again and inner._calls == 1
+    # Même plateau, masque différent : autre clé
+    mask = referee.action_mask()
+    mask[first] = 0
+    assert agent.choose_action(referee.observation().copy(), action_mask=mask) != first
+    stats = agent.cache_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["enabled"]
+    print("test_repeated_positions_hit_the_cache: Passed")
+
+
+def test_lru_is_bounded():
+    cache = DecisionCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # "b" est la moins récemment utilisée
+    assert cache.get("b") is None and cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+    print("test_lru_is_bounded: Passed")
+
+
+def test_stochastic_agent_is_not_cached():
+    agent = CachedAgent(RandomAgent("R"))
+    referee = Referee()
+    for _ in range(5):
+        agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    assert agent.cache_stats()["hits"] == 0 and agent.cache_stats()["size"] == 0
+    print("test_stochastic_agent_is_not_cached: Passed")
+
+
+def test_shared_cache_in_games():
+    cache = DecisionCache()
+    inner = CountingMinimax(depth=3, player_name="M")
+    agent = CachedAgent(inner, cache=cache)
+    for _ in range(6):
+        simulate_game(agent, SmartAgent(env=None, player_name="S"))
+    # Deux agents déterministes : les parties se répètent, presque tout vient du cache
+    assert cache.stats()["hit_rate"] > 0.5
+    assert inner._calls == cache.stats()["misses"]
+    print("test_shared_cache_in_games: Passed")
+
+
+def test_settings_changed_after_wrapping():
+    inner = CountingMinimax(depth=2)
+    agent = CachedAgent(inner)
+    referee = Referee()
+    agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    inner.depth = 3  # autre configuration : autre clé
+    agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    assert inner._calls == 2 and agent.cache_stats()["size"] == 2
+    inner.time_limit = 0.05  # devenu dépendant du temps : plus de cache
+    assert not agent.enabled
+    agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    assert inner._calls == 3 and agent.cache_stats()["size"] == 2
+    inner.time_limit = None
+    agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+    assert inner._calls == 3 and agent.cache_stats()["hits"] == 1
+    print("test_settings_changed_after_wrapping: Passed")
+
+
+def test_board_key_includes_shape():
+    # Même nombre de cases, plateaux différents
+    assert board_key(np.zeros((6, 7, 2), dtype=int)) != board_key(np.zeros((7, 6, 2), dtype=int))
+    print("test_board_key_includes_shape: Passed")
+
+
+if __name__ == "__main__":
+    test_declarations()
+    test_repeated_positions_hit_the_cache()
+    test_lru_is_bounded()
+    test_stochastic_agent_is_not_cached()
+    test_shared_cache_in_games()
+    test_settings_changed_after_wrapping()
+    test_board_key_includes_shape()
+    print("\nTous les tests decision_cache sont passés !")
@@ -0,0 +1,79 @@
+# test_decision_trace.py
+# Tests de la trace des décisions (tampon circulaire, puits loguru)
+
+import json
+import os
+import tempfile
+
+from loguru import logger
+
+from decision_trace import BLOCK, CENTER, TRACE, DecisionTrace, disable_logs, enable_logs
+from random_agent import RandomAgent
+from referee import Referee
+from smart_agent import SmartAgent
+
+
+def test_ring_keeps_last_decisions():
+    trace = DecisionTrace(capacity=3)
+    for col in range(5):
+        trace.record("A" if col % 2 else "B", CENTER, col, 0.001)
+    events = trace.dump()
+    assert [e["column"] for e in events] == [2, 3, 4]
+    assert [e["agent"] for e in events] == ["B", "A", "B"]
+    assert events[0]["rule"] == "center"
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl")
+        trace.dump(path)
+        with open(path, encoding="utf-8") as f:
+            assert [json.loads(line) for line in f] == events
+    trace.clear()
+    assert trace.dump() == []
+    print("test_ring_keeps_last_decisions: Passed")
+
+
+def test_agents_record_rule_fired():
+    TRACE.clear()
+    referee = Referee()
+    for col in (3, 3, 4, 4, 5):
+        referee.play(col)
+    SmartAgent(env=None, player_name="S").choose_action(referee.view(), action_mask=referee.action_mask())
+    RandomAgent("R").choose_action(referee.view(), action_mask=referee.action_mask())
+    smart, rand = TRACE.dump()
+    assert smart["agent"] == "S" and smart["rule"] == "block" and smart["column"] in (2, 6)
+    assert rand["agent"] == "R" and rand["rule"] == "random"
+    assert smart["elapsed"] >= 0
+
+    TRACE.enabled = False
+    try:
+        RandomAgent("R").choose_action(referee.view(), action_mask=referee.action_mask())
+    finally:
+        TRACE.enabled = True
+    assert TRACE.count == 2
+    print("test_agents_record_rule_fired: Passed")
+
+
+def test_loguru_sink_is_optional():
+    messages = []
+    handler = logger.add(lambda m: messages.append(m.record), level="DEBUG")
+    try:
+        trace = DecisionTrace()
+        trace.record("S", BLOCK, 2, 0.0)
+        assert messages == []  # aucun puits : rien n'est formaté
+        enable_logs(trace)
+        enable_logs(trace)  # idempotent
+        trace.record("S", BLOCK, 2, 0.0)
+        disable_logs(trace)
+        trace.record("S", BLOCK, 2, 0.0)
+    finally:
+        logger.remove(handler)
+    assert len(messages) == 1
+    assert messages[0]["level"].name == "WARNING"
+    assert messages[0]["message"] == "S: BLOQUER ADVERSAIRE -> colonne 2"
+    print("test_loguru_sink_is_optional: Passed")
+
+
+if __name__ == "__main__":
+    test_ring_keeps_last_decisions()
+    test_agents_record_rule_fired()
+    test_loguru_sink_is_optional()
+    print("\nTous les tests decision_trace sont passés !")
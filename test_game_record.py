@@ -0,0 +1,99 @@
+# test_game_record.py
+# Tests du format binaire des parties (écriture en flux, relecture paresseuse)
+
+import os
+import random
+import tempfile
+import time
+
+from game_record import (DRAW, FIRST_WINS, SECOND_WINS, GameRecordWriter, forfeited,
+                         pack_record, read_records, replay, result_code)
+from random_agent import RandomAgent
+from smart_agent import SmartAgent
+from tournament import simulate_game
+
+
+def test_pack_size():
+    assert len(pack_record([], DRAW)) == 1
+    assert len(pack_record([3] * 8, DRAW)) == 1 + 3
+    moves = [c for c in range(7) for _ in range(6)]
+    assert len(pack_record(moves, DRAW)) == 1 + 16
+    print("test_pack_size: Passed")
+
+
+def test_write_read_roundtrip():
+    rng = random.Random(1)
+    games = []
+    for _ in range(500):
+        n = rng.randint(0, 42)
+        games.append(([rng.randrange(7) for _ in range(n)], rng.choice([DRAW, FIRST_WINS, SECOND_WINS])))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.c4r")
+        with GameRecordWriter(path) as writer:
+            for moves, result in games:
+                writer.write(moves, result)
+        # Petits blocs pour couper des records entre deux lectures
+        assert list(read_records(path, chunk_size=7)) == games
+    print("test_write_read_roundtrip: Passed")
+
+
+def test_simulate_game_records_replayable_game():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.c4r")
+        winners = []
+        with GameRecordWriter(path) as writer:
+            for _ in range(20):
+                winner = simulate_game(RandomAgent("A"), RandomAgent("B"), record_writer=writer)
+                winners.append(winner)
+        records = list(read_records(path))
+    assert len(records) == 20
+    for (moves, result), winner in zip(records, winners):
+        referee = replay(moves)
+        assert result == result_code(referee.winner)
+        assert (winner == "A") == (result == FIRST_WINS)
+        assert not forfeited(moves, result)
+    print("test_simulate_game_records_replayable_game: Passed")
+
+
+class LateAgent(RandomAgent):
+    def choose_action(self, observation, **kwargs):
+        time.sleep(0.02)
+        return super().choose_action(observation, **kwargs)
+
+
+def test_forfeit_recorded_as_opponent_win():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.c4r")
+        with GameRecordWriter(path) as writer:
+            winner = simulate_game(SmartAgent(env=None, player_name="S"), LateAgent("L"),
+                                   move_timeout=0.01, on_timeout="forfeit", record_writer=writer)
+        ((moves, result),) = read_records(path)
+    assert winner == "S" and moves == [moves[0]]
+    assert result == FIRST_WINS and forfeited(moves, result)
+    print("test_forfeit_recorded_as_opponent_win: Passed")
+
+
+def test_each_game_reaches_disk():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "games.c4r")
+        writer = GameRecordWriter(path)
+        writer.write([3, 3, 4], DRAW)
+        # Sans fermer le fichier : un crash ici ne doit pas perdre la partie
+        assert list(read_records(path)) == [([3, 3, 4], DRAW)]
+        batched = GameRecordWriter(os.path.join(tmp, "batched.c4r"), flush_every=2)
+        batched.write([3], DRAW)
+        assert os.path.getsize(batched.path) == 0
+        batched.write([4], DRAW)
+        assert os.path.getsize(batched.path) == 4
+        writer.close()
+        batched.close()
+    print("test_each_game_reaches_disk: Passed")
+
+
+if __name__ == "__main__":
+    test_pack_size()
+    test_write_read_roundtrip()
+    test_simulate_game_records_replayable_game()
+    test_forfeit_recorded_as_opponent_win()
+    test_each_game_reaches_disk()
+    print("\nTous les tests game_record sont passés !")
@@ -0,0 +1,66 @@
+# test_hybrid_agent.py
+# Tests de l'agent hybride (minimax + Mini-MCTS) : pondération des rollouts, rapport de temps
+
+from loguru import logger
+
+import agent2
+from agent2 import MCTS_SCALE, Agent as HybridAgent
+from referee import Referee
+
+
+def midgame():
+    referee = Referee()
+    for col in (3, 3, 2, 4, 4, 2):
+        referee.play(col)
+    return referee
+
+
+def test_rollout_weight_does_not_grow_with_simulations():
+    agent = HybridAgent(env=None)
+    # Le même taux de victoire pèse autant avec 5 ou 50 rollouts, au plus beta * MCTS_SCALE
+    assert agent._blend(0, 5, 5) == agent._blend(0, 50, 50) == agent.beta * MCTS_SCALE
+    assert agent._blend(10, 1, 5) == agent._blend(10, 10, 50)
+    assert agent._blend(0, 0, 0) == 0
+    print("test_rollout_weight_does_not_grow_with_simulations: Passed")
+
+
+def test_time_split_reaches_sinks():
+    reports = []
+    agent2.REPORT_SINKS.append(lambda name, report: reports.append((name, report)))
+    try:
+        referee = midgame()
+        agent = HybridAgent(env=None, player_name="H", time_limit=0.05)
+        agent.choose_action(referee.view(), action_mask=referee.action_mask())
+    finally:
+        agent2.REPORT_SINKS.clear()
+    ((name, report),) = reports
+    assert name == "H" and report is agent.last_report
+    assert report["minimax_time"] + report["mcts_time"] <= 0.1
+    print("test_time_split_reaches_sinks: Passed")
+
+
+def test_report_logs_are_optional():
+    messages = []
+    handler = logger.add(lambda m: messages.append(m.record["message"]), level="DEBUG")
+    try:
+        referee = midgame()
+        agent = HybridAgent(env=None, player_name="H", time_limit=0.02)
+        agent.choose_action(referee.view(), action_mask=referee.action_mask())
+        assert messages == []  # aucun puits par défaut
+        agent2.enable_report_logs()
+        agent2.enable_report_logs()  # idempotent
+        agent.choose_action(referee.view(), action_mask=referee.action_mask())
+        agent2.disable_report_logs()
+        agent.choose_action(referee.view(), action_mask=referee.action_mask())
+    finally:
+        logger.remove(handler)
+        agent2.disable_report_logs()
+    assert len(messages) == 1 and messages[0].startswith("H: time split {")
+    print("test_report_logs_are_optional: Passed")
+
+
+if __name__ == "__main__":
+    test_rollout_weight_does_not_grow_with_simulations()
+    test_time_split_reaches_sinks()
+    test_report_logs_are_optional()
+    print("\nTous les tests agent hybride sont passés !")
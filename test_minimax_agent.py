@@ -0,0 +1,132 @@
+# test_minimax_agent.py
+# Tests du moteur bitboard (make/unmake) et du MinimaxAgent
+
+import random
+import time
+
+import numpy as np
+
+from bitboard import BitBoard, WIN_LINES
+from minimax_agent import MinimaxAgent
+
+ROWS, COLS, CHANNELS = 6, 7, 2
+
+FULL_MASK = [1] * COLS
+
+
+def make_board():
+    return np.zeros((ROWS, COLS, CHANNELS), dtype=int)
+
+
+# ==========================================================
+# BITBOARD
+# ==========================================================
+def test_win_lines_count():
+    assert len(WIN_LINES) == 69
+    print("test_win_lines_count: Passed")
+
+
+def test_play_undo_roundtrip():
+    rng = random.Random(0)
+    state = BitBoard()
+    snapshots = []
+    for _ in range(20):
+        moves = state.legal_moves()
+        snapshots.append((list(state.stones), list(state.heights)))
+        state.play(rng.choice(moves))
+    for stones, heights in reversed(snapshots):
+        state.undo()
+        assert state.stones == stones
+        assert state.heights == heights
+    assert state.ply == 0
+    print("test_play_undo_roundtrip: Passed")
+
+
+def test_last_move_wins():
+    state = BitBoard()
+    # Premier joueur : 0 1 2, second joueur : 0 1 2 (par-dessus)
+    for col in [0, 0, 1, 1, 2, 2]:
+        state.play(col)
+        assert not state.last_move_wins()
+    assert state.is_winning_move(3)
+    state.play(3)
+    assert state.last_move_wins()
+    print("test_last_move_wins: Passed")
+
+
+def test_from_observation():
+    board = make_board()
+    board[5, 3, 0] = 1  # joueur au trait
+    board[5, 2, 1] = 1
+    board[4, 3, 1] = 1
+    state = BitBoard.from_observation(board)
+    assert state.ply == 3
+    assert state.heights[3] == 3 * 7 + 2
+    assert state.current.bit_count() == 1
+    assert state.opponent.bit_count() == 2
+    print("test_from_observation: Passed")
+
+
+# ==========================================================
+# MINIMAX
+# ==========================================================
+def test_minimax_takes_win():
+    board = make_board()
+    board[5, 0:3, 0] = 1
+    board[4, 0:2, 1] = 1
+    board[5, 5, 1] = 1
+    agent = MinimaxAgent(depth=4)
+    assert agent.choose_action(board, action_mask=FULL_MASK) == 3
+    print("test_minimax_takes_win: Passed")
+
+
+def test_minimax_blocks_win():
+    board = make_board()
+    board[5, 0:3, 1] = 1
+    board[4, 0:2, 0] = 1
+    agent = MinimaxAgent(depth=4)
+    assert agent.choose_action(board, action_mask=FULL_MASK) == 3
+    print("test_minimax_blocks_win: Passed")
+
+
+def test_minimax_respects_time_limit():
+    board = make_board()
+    agent = MinimaxAgent(depth=42, time_limit=0.2)
+    start = time.time()
+    action = agent.choose_action(board, action_mask=FULL_MASK)
+    elapsed = time.time() - start
+    assert 0 <= action < COLS
+    assert elapsed < 0.5
+    print(f"test_minimax_respects_time_limit: Passed ({elapsed:.3f}s)")
+
+
+def test_minimax_does_not_mutate_board():
+    board = make_board()
+    board[5, 3, 1] = 1
+    before = board.copy()
+    MinimaxAgent(depth=3).choose_action(board, action_mask=FULL_MASK)
+    assert np.array_equal(board, before)
+    print("test_minimax_does_not_mutate_board: Passed")
+
+
+def test_minimax_stats_reset_on_forced_move():
+    agent = MinimaxAgent(depth=4, collect_stats=True)
+    agent.choose_action(make_board(), action_mask=FULL_MASK)
+    assert agent.get_stats()["nodes"] > 0
+    # Coup forcé : aucune recherche, les compteurs du coup précédent ne doivent pas rester
+    assert agent.choose_action(make_board(), action_mask=[0, 0, 0, 1, 0, 0, 0]) == 3
+    assert agent.get_stats()["nodes"] == 0 and agent.get_stats()["max_depth"] == 0
+    print("test_minimax_stats_reset_on_forced_move: Passed")
+
+
+if __name__ == "__main__":
+    test_win_lines_count()
+    test_play_undo_roundtrip()
+    test_last_move_wins()
+    test_from_observation()
+    test_minimax_takes_win()
+    test_minimax_blocks_win()
+    test_minimax_respects_time_limit()
+    test_minimax_does_not_mutate_board()
+    test_minimax_stats_reset_on_forced_move()
+    print("\nTous les tests MinimaxAgent sont passés !")
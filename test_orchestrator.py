@@ -0,0 +1,84 @@
+# test_orchestrator.py
+# Tests de l'orchestrateur en sous-processus (délais, crashs, redémarrage)
+
+import asyncio
+
+import orchestrator as orchestrator_module
+from orchestrator import RESTART_ATTEMPTS, Orchestrator, run_orchestrated
+
+
+def test_orchestrated_round_robin():
+    agents = {"smart": "smart", "random": "random"}
+    pair_results, orchestrator = asyncio.run(run_orchestrated(agents, games_per_match=4, move_timeout=5.0,
+                                                              processes_per_agent=1, concurrency=2))
+    assert sum(pair_results[("smart", "random")]) == 4
+    assert orchestrator.forfeits == {"smart": 0, "random": 0}
+    assert len(orchestrator.latency["smart"]) > 0
+    print("test_orchestrated_round_robin: Passed")
+
+
+def test_slow_agent_forfeits():
+    agents = {"slow": "search:time_limit=0.5", "random": "random"}
+    pair_results, orchestrator = asyncio.run(run_orchestrated(agents, games_per_match=2, move_timeout=0.1,
+                                                              processes_per_agent=1))
+    assert pair_results[("slow", "random")] == (0, 0, 2)
+    assert orchestrator.timeouts["slow"] == 2 and orchestrator.forfeits["slow"] == 2
+    print("test_slow_agent_forfeits: Passed")
+
+
+def test_crashed_agent_is_restarted():
+    async def main():
+        orchestrator = Orchestrator({"smart": "smart", "random": "random"}, move_timeout=5.0,
+                                    processes_per_agent=1)
+        await orchestrator.start()
+        try:
+            process = orchestrator.pools["smart"]._queue[0]
+            process.proc.kill()  # le sous-processus meurt avant son premier coup
+            await process.proc.wait()
+            results = await orchestrator.run(games_per_match=2)
+        finally:
+            await orchestrator.close()
+        return results, orchestrator, process
+
+    results, orchestrator, process = asyncio.run(main())
+    assert orchestrator.crashes["smart"] == 1 and process.restarts == 1
+    # Première partie perdue par forfait, la seconde est jouée normalement
+    assert results[("smart", "random")][2] >= 1
+    assert sum(results[("smart", "random")]) == 2
+    print("test_crashed_agent_is_restarted: Passed")
+
+
+def test_failed_restart_retires_process():
+    async def main():
+        orchestrator = Orchestrator({"smart": "smart", "random": "random"}, move_timeout=5.0,
+                                    processes_per_agent=1)
+        await orchestrator.start()
+        try:
+            process = orchestrator.pools["smart"]._queue[0]
+            process.spec = "no_such_agent"  # le sous-processus relancé ne démarre plus
+            process.proc.kill()
+            await process.proc.wait()
+            results = await orchestrator.run(games_per_match=4)
+        finally:
+            await orchestrator.close()
+        return results, orchestrator
+
+    backoff = orchestrator_module.RESTART_BACKOFF
+    orchestrator_module.RESTART_BACKOFF = 0.01
+    try:
+        results, orchestrator = asyncio.run(main())
+    finally:
+        orchestrator_module.RESTART_BACKOFF = backoff
+    # Le tournoi va au bout : toutes les parties de l'agent retiré sont perdues par forfait
+    assert results[("smart", "random")] == (0, 0, 4)
+    assert orchestrator.restart_failures["smart"] == RESTART_ATTEMPTS and orchestrator.live["smart"] == 0
+    assert orchestrator.forfeits["smart"] == 4 and orchestrator.crashes["smart"] == 1
+    print("test_failed_restart_retires_process: Passed")
+
+
+if __name__ == "__main__":
+    test_orchestrated_round_robin()
+    test_slow_agent_forfeits()
+    test_crashed_agent_is_restarted()
+    test_failed_restart_retires_process()
+    print("\nTous les tests orchestrator sont passés !")
@@ -0,0 +1,173 @@
+# test_performance.py
+# Tests de performance échantillonnés : latence p95 sur des centaines d'appels
+# et croissance mémoire (tracemalloc) sur plus de 1000 appels consécutifs.
+
+import gc
+import random
+import time
+import tracemalloc
+
+from agent import Agent
+from latency import LatencyHistogram, format_summary
+from minimax_agent import MinimaxAgent
+from random_agent import RandomAgent
+from referee import Referee
+from smart_agent import SmartAgent
+
+LATENCY_SAMPLES = 300
+LEAK_CALLS = 1200
+LEAK_WARMUP = 100
+# Croissance tolérée entre les deux instantanés (bruit de l'interpréteur)
+LEAK_BUDGET = 256 * 1024
+
+
+# ------------------------------------------------------------------
+# UTILS
+# ------------------------------------------------------------------
+
+def sample_positions(count, seed=0):
+    """
+    Non-terminal positions taken at random points of random games.
+
+    Returns:
+        list of (observation, action_mask)
+    """
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        referee = Referee()
+        stop = rng.randrange(0, 36)
+        while not referee.is_over() and referee.turn < stop:
+            referee.play(rng.choice([c for c, ok in enumerate(referee.action_mask()) if ok]))
+        if not referee.is_over():
+            positions.append((referee.observation().copy(), referee.action_mask()))
+    return positions
+
+
+def measure_latency(agent, positions):
+    histogram = LatencyHistogram()
+    for observation, mask in positions:
+        start = time.perf_counter()
+        agent.choose_action(observation.copy(), action_mask=mask)
+        histogram.record(time.perf_counter() - start)
+    return histogram.summary()
+
+
+def memory_growth(agent, positions, calls=LEAK_CALLS, warmup=LEAK_WARMUP):
+    """
+    Bytes still allocated after `calls` choose_action calls, compared with
+    the state reached after `warmup` calls (caches, imports and lazy tables
+    are filled during the warm-up).
+    """
+    def run(n, offset):
+        for i in range(n):
+            observation, mask = positions[(offset + i) % len(positions)]
+            agent.choose_action(observation.copy(), action_mask=mask)
+
+    tracemalloc.start()
+    try:
+        run(warmup, 0)
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        run(calls, warmup)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return sum(stat.size_diff for stat in stats), stats[:3]
+
+
+def search_agent(time_limit):
+    agent = Agent(env=None)
+    agent.time_limit = time_limit
+    return agent
+
+
+class LeakyAgent:
+    """Remembers every observation it sees: the leak check must catch it."""
+
+    def __init__(self):
+        self.inner = RandomAgent()
+        self.history = []
+
+    def choose_action(self, observation, action_mask=None):
+        self.history.append(observation)
+        return self.inner.choose_action(observation, action_mask=action_mask)
+
+
+# ------------------------------------------------------------------
+# LATENCE (p95)
+# ------------------------------------------------------------------
+
+def check_p95(name, agent, budget, samples=LATENCY_SAMPLES):
+    summary = measure_latency(agent, sample_positions(samples, seed=1))
+    assert summary["count"] == samples
+    assert summary["p95"] < budget, format_summary(name, summary)
+    print(f"{format_summary(name, summary)} (budget p95 {budget * 1000:.0f}ms)")
+
+
+def test_smart_agent_p95_latency():
+    check_p95("SmartAgent", SmartAgent(env=None), budget=0.1)
+
+
+def test_random_agent_p95_latency():
+    check_p95("RandomAgent", RandomAgent(), budget=0.01)
+
+
+def test_minimax_agent_p95_latency():
+    check_p95("MinimaxAgent(depth=3)", MinimaxAgent(depth=3), budget=0.1)
+
+
+def test_search_agent_respects_time_limit():
+    # Le budget du coup plus la marge d'une itération interrompue
+    time_limit = 0.01
+    check_p95("Agent(time_limit=0.01)", search_agent(time_limit), budget=time_limit + 0.05, samples=100)
+
+
+# ------------------------------------------------------------------
+# FUITES MÉMOIRE
+# ------------------------------------------------------------------
+
+def check_no_growth(name, agent, calls=LEAK_CALLS):
+    growth, top = memory_growth(agent, sample_positions(200, seed=2), calls=calls)
+    assert growth < LEAK_BUDGET, f"{name}: +{growth} bytes after {calls} calls, top: {top}"
+    print(f"{name}: {growth / 1024:+.1f} KB après {calls} appels")
+
+
+def test_leak_check_detects_growth():
+    growth, _ = memory_growth(LeakyAgent(), sample_positions(200, seed=2))
+    assert growth > LEAK_BUDGET
+    print(f"test_leak_check_detects_growth: Passed (+{growth / 1024:.0f} KB)")
+
+
+def test_smart_agent_no_memory_growth():
+    check_no_growth("SmartAgent", SmartAgent(env=None))
+
+
+def test_random_agent_no_memory_growth():
+    check_no_growth("RandomAgent", RandomAgent())
+
+
+def test_minimax_agent_no_memory_growth():
+    check_no_growth("MinimaxAgent(depth=2)", MinimaxAgent(depth=2))
+
+
+def test_search_agent_no_memory_growth():
+    # transposition_table est réinitialisée à chaque coup : elle ne doit pas s'accumuler
+    check_no_growth("Agent(time_limit=0.002)", search_agent(0.002))
+
+
+if __name__ == "__main__":
+    print("=== LATENCE ===")
+    test_smart_agent_p95_latency()
+    test_random_agent_p95_latency()
+    test_minimax_agent_p95_latency()
+    test_search_agent_respects_time_limit()
+    print("\n=== MÉMOIRE ===")
+    test_leak_check_detects_growth()
+    test_smart_agent_no_memory_growth()
+    test_random_agent_no_memory_growth()
+    test_minimax_agent_no_memory_growth()
+    test_search_agent_no_memory_growth()
+    print("\nTous les tests de performance sont passés !")
@@ -0,0 +1,71 @@
+# test_ratings.py
+# Tests des classements Elo / Bradley-Terry et du SPRT
+
+import math
+
+from ratings import SPRT, bradley_terry, elo_from_score, match_elo, score_from_elo, wilson_interval
+
+
+def test_elo_score_roundtrip():
+    for elo in [-400, -100, 0, 50, 300]:
+        assert abs(elo_from_score(score_from_elo(elo)) - elo) < 1e-9
+    assert elo_from_score(0.5) == 0
+    print("test_elo_score_roundtrip: Passed")
+
+
+def test_match_elo_counts_draws():
+    elo, low, high = match_elo(10, 20, 10)
+    assert elo == 0
+    assert low < 0 < high
+    elo, _, _ = match_elo(30, 10, 0)
+    assert elo > 0
+    print("test_match_elo_counts_draws: Passed")
+
+
+def test_wilson_interval_bounds():
+    score, low, high = wilson_interval(10, 0, 0)
+    assert score == 1 and 0.6 < low < 1 and abs(high - 1) < 1e-12
+    score, low, high = wilson_interval(10, 20, 10)
+    assert score == 0.5 and abs((0.5 - low) - (high - 0.5)) < 1e-12
+    assert wilson_interval(0, 0, 0) == (0.5, 0.0, 1.0)
+    print("test_wilson_interval_bounds: Passed")
+
+
+def test_bradley_terry_order():
+    results = {
+        ("A", "B"): (8, 0, 2),
+        ("B", "C"): (8, 0, 2),
+        ("A", "C"): (10, 0, 0),
+    }
+    ratings = bradley_terry(results)
+    assert ratings["A"][0] > ratings["B"][0] > ratings["C"][0]
+    assert abs(sum(r[0] for r in ratings.values())) < 1e-6
+    assert all(math.isfinite(r[0]) for r in ratings.values())
+    print("test_bradley_terry_order: Passed")
+
+
+def test_sprt_decides():
+    strong = SPRT(0, 50)
+    for _ in range(40):
+        strong.update(1)
+    assert strong.status() == "H1"
+
+    weak = SPRT(0, 50)
+    for _ in range(40):
+        weak.update(0)
+    assert weak.status() == "H0"
+
+    undecided = SPRT(0, 50)
+    undecided.update(1)
+    undecided.update(0)
+    assert undecided.status() is None
+    print("test_sprt_decides: Passed")
+
+
+if __name__ == "__main__":
+    test_elo_score_roundtrip()
+    test_match_elo_counts_draws()
+    test_wilson_interval_bounds()
+    test_bradley_terry_order()
+    test_sprt_decides()
+    print("\nTous les tests de classement sont passés !")
@@ -0,0 +1,88 @@
+# test_results_store.py
+# Tests du stockage persistant des résultats et de la reprise des tournois
+
+import os
+import random
+import tempfile
+
+from game_record import DRAW, FIRST_WINS, SECOND_WINS
+from minimax_agent import MinimaxAgent
+from random_agent import RandomAgent
+from results_store import ResultsStore, agent_version
+from smart_agent import SmartAgent
+from tournament import play_match, run_tournament
+
+
+class CountingAgent(RandomAgent):
+    def __init__(self, player_name):
+        super().__init__(player_name)
+        self.calls = 0
+
+    def choose_action(self, observation, **kwargs):
+        self.calls += 1
+        return super().choose_action(observation, **kwargs)
+
+
+def test_store_pair_results_and_invalidate():
+    with tempfile.TemporaryDirectory() as tmp:
+        with ResultsStore(os.path.join(tmp, "results.db")) as store:
+            store.add("A", "v1", "B", "v1", 0, [3, 3], FIRST_WINS)
+            store.add("B", "v1", "A", "v1", 0, [3], FIRST_WINS, forfeit=True)
+            store.add("A", "v1", "B", "v1", 1, [], DRAW)
+            store.add("A", "v0", "B", "v1", 0, [], SECOND_WINS)  # ancienne version de A
+            assert store.get("B", "v1", "A", "v1", 0) == (FIRST_WINS, True)
+            assert store.get("A", "v1", "B", "v1", 5) is None
+            assert store.pair_results({"A": "v1", "B": "v1"}) == {("A", "B"): (1, 1, 1)}
+            assert store.latest_versions() == {"A": "v0", "B": "v1"}
+            assert store.invalidate("A", "v0") == 1
+            assert store.invalidate("B") == 3
+            assert store.pair_results() == {}
+    print("test_store_pair_results_and_invalidate: Passed")
+
+
+def test_agent_version_tracks_settings():
+    assert agent_version(MinimaxAgent(depth=3)) == agent_version(MinimaxAgent(depth=3, player_name="x"))
+    assert agent_version(MinimaxAgent(depth=3)) != agent_version(MinimaxAgent(depth=4))
+    assert agent_version(RandomAgent()) != agent_version(SmartAgent(env=None))
+    print("test_agent_version_tracks_settings: Passed")
+
+
+def test_tournament_resumes_from_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.db")
+        agents = {"R1": CountingAgent("R1"), "R2": CountingAgent("R2")}
+        _, _, first_results = run_tournament(agents, games_per_match=4, return_ratings=True, results_path=path)
+        assert agents["R1"].calls > 0
+
+        # Même tournoi : rien à rejouer, mêmes résultats
+        agents = {"R1": CountingAgent("R1"), "R2": CountingAgent("R2")}
+        _, _, again = run_tournament(agents, games_per_match=4, return_ratings=True, results_path=path)
+        assert agents["R1"].calls == agents["R2"].calls == 0
+        assert again == first_results
+
+        # Un agent ajouté : seules ses paires sont jouées
+        agents["R3"] = CountingAgent("R3")
+        _, _, extended = run_tournament(agents, games_per_match=4, return_ratings=True, results_path=path)
+        assert agents["R1"].calls > 0 and agents["R3"].calls > 0
+        assert extended[("R1", "R2")] == first_results[("R1", "R2")]
+        assert sum(extended[("R1", "R3")]) == sum(extended[("R2", "R3")]) == 4
+    print("test_tournament_resumes_from_store: Passed")
+
+
+def test_seeded_games_leave_global_random_alone():
+    random.seed(7)
+    expected = random.getstate()
+    with tempfile.TemporaryDirectory() as tmp:
+        with ResultsStore(os.path.join(tmp, "results.db")) as store:
+            play_match(RandomAgent("R1"), RandomAgent("R2"), 4, store=store)
+    # Chaque partie est semée par sa clé, sans changer le flux du reste du processus
+    assert random.getstate() == expected
+    print("test_seeded_games_leave_global_random_alone: Passed")
+
+
+if __name__ == "__main__":
+    test_store_pair_results_and_invalidate()
+    test_agent_version_tracks_settings()
+    test_tournament_resumes_from_store()
+    test_seeded_games_leave_global_random_alone()
+    print("\nTous les tests results_store sont passés !")
@@ -0,0 +1,63 @@
+# test_schedulers.py
+# Tests des appariements suisses et du planificateur adaptatif
+
+import math
+
+from minimax_agent import MinimaxAgent
+from random_agent import RandomAgent
+from schedulers import misorder_probability, run_adaptive, run_swiss, swiss_pairings
+from smart_agent import SmartAgent
+
+
+def make_pool():
+    return {
+        "Random1": RandomAgent("Random1"),
+        "Random2": RandomAgent("Random2"),
+        "Smart": SmartAgent(env=None, player_name="Smart"),
+        "Minimax3": MinimaxAgent(depth=3, player_name="Minimax3"),
+        "Minimax5": MinimaxAgent(depth=5, player_name="Minimax5"),
+    }
+
+
+def test_swiss_pairings_avoid_rematches():
+    names = ["A", "B", "C", "D", "E"]
+    scores = {"A": 2, "B": 2, "C": 1, "D": 1, "E": 0}
+    pairs, bye = swiss_pairings(names, scores, played={frozenset("AB")}, byes={"E"})
+    assert bye == "D"
+    assert pairs == [("A", "C"), ("B", "E")]
+    print("test_swiss_pairings_avoid_rematches: Passed")
+
+
+def test_misorder_probability():
+    assert misorder_probability((0, -100, 100), (0, -100, 100)) == 0.5
+    assert misorder_probability((400, 350, 450), (0, -50, 50)) < 1e-6
+    assert misorder_probability((10, -math.inf, math.inf), (0, -50, 50)) == 0.5
+    print("test_misorder_probability: Passed")
+
+
+def test_swiss_plays_fewer_games_than_round_robin():
+    agents = make_pool()
+    scores, ratings, pair_results = run_swiss(agents, rounds=3, games_per_pairing=2)
+    games = sum(sum(r) for r in pair_results.values())
+    assert games == 3 * 2 * 2  # 2 paires par ronde (une exemption), 2 parties chacune
+    assert games < 2 * len(agents) * (len(agents) - 1) // 2
+    assert set(ratings) <= set(agents)
+    print("test_swiss_plays_fewer_games_than_round_robin: Passed")
+
+
+def test_adaptive_respects_budget_and_ranks():
+    agents = make_pool()
+    scores, ratings, pair_results = run_adaptive(agents, max_games=24, batch=2)
+    games = sum(sum(r) for r in pair_results.values())
+    assert games <= 24
+    assert set(ratings) == set(agents)
+    assert ratings["Minimax5"][0] > ratings["Random1"][0]
+    print("test_adaptive_respects_budget_and_ranks: Passed")
+
+
+if __name__ == "__main__":
+    test_swiss_pairings_avoid_rematches()
+    test_misorder_probability()
+    test_swiss_plays_fewer_games_than_round_robin()
+    test_adaptive_respects_budget_and_ranks()
+    print("\nTous les tests schedulers sont passés !")
@@ -0,0 +1,66 @@
+# test_scratch.py
+# Tests des vues en lecture seule du plateau et du pool de tampons
+
+import numpy as np
+import pytest
+
+from agent_registry import make_agent
+from referee import Referee
+from scratch import ScratchPool
+from smart_agent import SmartAgent
+from tournament import simulate_game
+
+
+def test_view_is_read_only_and_live():
+    referee = Referee()
+    view = referee.view()
+    with pytest.raises(ValueError):
+        view[5, 3, 0] = 1
+    referee.play(3)
+    # Au tour du second joueur, ses pions sont dans le canal 0
+    assert referee.view()[5, 3, 1] == 1 and referee.view()[5, 3, 0] == 0
+    assert view[5, 3, 0] == 1  # l'ancienne vue suit le plateau, sans copie
+    assert np.array_equal(referee.view(), referee.observation())
+    print("test_view_is_read_only_and_live: Passed")
+
+
+def test_pool_reuses_buffers():
+    pool = ScratchPool()
+    board = Referee().view()
+    for _ in range(10):
+        with pool.borrow(board) as scratch:
+            scratch[5, 3, 0] = 1
+    assert pool.allocated == 1
+    # Emprunts imbriqués : un second tampon, rendu ensuite
+    with pool.borrow(board) as outer, pool.borrow(board) as inner:
+        assert outer is not inner and not outer.any()
+    assert pool.allocated == 2
+    print("test_pool_reuses_buffers: Passed")
+
+
+def test_smart_agent_leaves_view_untouched():
+    referee = Referee()
+    for col in (3, 3, 4, 4, 5):
+        referee.play(col)
+    before = referee.board.copy()
+    agent = SmartAgent(env=None)
+    assert agent.choose_action(referee.view(), action_mask=referee.action_mask()) in (2, 6)  # bloque
+    assert np.array_equal(referee.board, before)
+    print("test_smart_agent_leaves_view_untouched: Passed")
+
+
+def test_every_agent_plays_on_views():
+    specs = ["random", "smart", "minimax:depth=2", "search:time_limit=0.01",
+             "mcts:time_limit=0.01", "hybrid:time_limit=0.01"]
+    for spec in specs:
+        winner = simulate_game(make_agent(spec), make_agent("smart"))
+        assert winner is None or isinstance(winner, str)
+    print("test_every_agent_plays_on_views: Passed")
+
+
+if __name__ == "__main__":
+    test_view_is_read_only_and_live()
+    test_pool_reuses_buffers()
+    test_smart_agent_leaves_view_untouched()
+    test_every_agent_plays_on_views()
+    print("\nTous les tests scratch sont passés !")
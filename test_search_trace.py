@@ -0,0 +1,79 @@
+# test_search_trace.py
+# Tests du traceur échantillonné de l'arbre de recherche
+
+import json
+import os
+import tempfile
+
+from agent import Agent
+from agent_registry import make_agent
+from minimax_agent import MinimaxAgent
+from referee import Referee
+from search_trace import SearchTracer, summarize, to_folded
+
+
+def midgame():
+    referee = Referee()
+    for col in (3, 3, 2, 4, 4, 2):
+        referee.play(col)
+    return referee
+
+
+def test_minimax_trace_matches_stats():
+    tracer = SearchTracer(sample_rate=1.0)
+    agent = MinimaxAgent(depth=4, collect_stats=True, tracer=tracer)
+    referee = midgame()
+    agent.choose_action(referee.view(), action_mask=referee.action_mask())
+    (trace,) = tracer.traces
+    assert trace.ply == 6 and [it["depth"] for it in trace.iterations] == [1, 2, 3, 4]
+    last = trace.iterations[-1]
+    assert last["completed"] and [p["ply"] for p in last["plies"]] == [0, 1, 2, 3, 4]
+    assert last["plies"][0]["nodes"] == 1 and last["plies"][0]["branching"] == 7
+    # Les noeuds internes tracés sont ceux que compte SearchStats (la racine en plus)
+    traced = sum(it["nodes"] - 1 for it in trace.iterations)
+    assert traced == agent.get_stats()["nodes"]
+    cutoffs = sum(sum(p["cutoffs"]) for it in trace.iterations for p in it["plies"])
+    assert cutoffs == agent.get_stats()["beta_cutoffs"]
+    print("test_minimax_trace_matches_stats: Passed")
+
+
+def test_timed_search_marks_unfinished_iteration():
+    tracer = SearchTracer(sample_rate=1.0)
+    agent = Agent(env=None, tracer=tracer)
+    agent.time_limit = 0.05
+    referee = midgame()
+    agent.choose_action(referee.view(), action_mask=referee.action_mask())
+    iterations = tracer.traces[0].iterations
+    assert all(it["completed"] for it in iterations[:-1])
+    assert not iterations[-1]["completed"]
+    assert all(it["elapsed"] >= 0 for it in iterations)
+    print("test_timed_search_marks_unfinished_iteration: Passed")
+
+
+def test_sampling_and_export():
+    tracer = SearchTracer(sample_rate=0.25, seed=1, max_traces=3)
+    agent = make_agent("minimax:depth=2", tracer=tracer)
+    referee = midgame()
+    for _ in range(40):
+        agent.choose_action(referee.view(), action_mask=referee.action_mask())
+    assert tracer.moves_seen == 40 and len(tracer.traces) == 3
+    # SmartAgent n'a pas de recherche : le traceur est ignoré
+    make_agent("smart", tracer=tracer)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.json")
+        tracer.dump(path)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    folded = to_folded(data)
+    assert folded[0] == "minimax:depth=2;depth 1;ply 0 3"
+    assert "minimax:depth=2;depth 2;ply 0;ply 1;ply 2" in [line.rsplit(" ", 1)[0] for line in folded]
+    assert summarize(data)[("minimax:depth=2", 2)]["iterations"] == 3
+    print("test_sampling_and_export: Passed")
+
+
+if __name__ == "__main__":
+    test_minimax_trace_matches_stats()
+    test_timed_search_marks_unfinished_iteration()
+    test_sampling_and_export()
+    print("\nTous les tests search_trace sont passés !")
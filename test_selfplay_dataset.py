@@ -0,0 +1,38 @@
+# test_selfplay_dataset.py
+# Génération de positions en self-play : croissance par blocs et reprise
+
+import os
+import tempfile
+
+import numpy as np
+
+from referee import Referee
+from selfplay_dataset import generate, open_dataset
+
+
+def test_generate_and_resume():
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "data")
+        first = generate(out, 200, workers=2, chunk=128, commit_every=8)
+        assert first >= 200
+        # Reprise : on complète le même dossier jusqu'à une cible plus grande
+        second = generate(out, 500, workers=2, chunk=128, commit_every=8)
+        assert second >= 500
+        data = open_dataset(out)
+        assert len(data["move"]) == second
+        assert set(np.unique(data["result"])) <= {-1, 0, 1}
+        # Le premier coup de chaque partie part d'un plateau vide
+        starts = np.flatnonzero((data["stones"][:, 0] == 0) & (data["stones"][:, 1] == 0))
+        assert len(starts) > 0 and starts[0] == 0
+        # Rejouer une partie : chaque coup doit donner la position suivante
+        end = starts[1]
+        referee = Referee()
+        for i in range(end):
+            assert referee.stones == [int(data["stones"][i, 0]), int(data["stones"][i, 1])]
+            assert referee.seat == data["side"][i]
+            referee.play(int(data["move"][i]))
+    print("test_generate_and_resume: Passed")
+
+
+if __name__ == "__main__":
+    test_generate_and_resume()
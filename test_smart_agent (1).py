@@ -5,6 +5,7 @@
 import numpy as np
 import random as _random
 from smart_agent import SmartAgent
+from referee import Referee
 from loguru import logger as _logger
 
 ROWS, COLS, CHANNELS = 6, 7, 2
@@ -115,21 +116,16 @@ def is_full(board):
     return all(board[0, c, 0] != 0 or board[0, c, 1] != 0 for c in range(COLS))
 
 def simulate_game(agent1, agent2, max_moves=42):
-    board = np.zeros((ROWS, COLS, CHANNELS), dtype=int)
-    turn = 0
+    # L'arbitre décide seul des victoires, sans passer par les agents
+    referee = Referee()
     winner = None
 
-    while not is_full(board) and turn < max_moves and winner is None:
-        current_agent = agent1 if turn % 2 == 0 else agent2
-        channel = 0 if turn % 2 == 0 else 1
-        action_mask = [(1 if board[0, c, 0] == 0 and board[0, c, 1] == 0 else 0) for c in range(COLS)]
-        action = current_agent.choose_action(board.copy(), action_mask=action_mask)
-        row = current_agent._get_next_row(board, action)
-        board[row, action, channel] = 1
-        if hasattr(current_agent, '_check_win_from_position'):
-            if current_agent._check_win_from_position(board, row, action, channel):
-                winner = current_agent.player_name
-        turn += 1
+    while not referee.is_over() and referee.turn < max_moves:
+        current_agent = agent1 if referee.seat == 0 else agent2
+        action = current_agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+        _, won = referee.play(action)
+        if won:
+            winner = current_agent.player_name
 
     return winner
 
@@ -139,23 +135,18 @@ def simulate_game(agent1, agent2, max_moves=42):
 def example_smartagent_vs_smartagent():
     agent1 = SmartAgent(env=None, player_name='Agent1')
     agent2 = SmartAgent(env=None, player_name='Agent2')
-    board = np.zeros((ROWS, COLS, CHANNELS), dtype=int)
-    turn = 0
+    referee = Referee()
     winner = None
 
     print('--- Exemple : partie complète SmartAgent vs SmartAgent ---')
-    while not is_full(board) and winner is None:
-        current_agent = agent1 if turn % 2 == 0 else agent2
-        channel = 0 if turn % 2 == 0 else 1
-        action_mask = [(1 if board[0, c, 0] == 0 and board[0, c, 1] == 0 else 0) for c in range(COLS)]
-        action = current_agent.choose_action(board.copy(), action_mask=action_mask)
-        row = current_agent._get_next_row(board, action)
-        board[row, action, channel] = 1
+    while not referee.is_over():
+        current_agent = agent1 if referee.seat == 0 else agent2
+        action = current_agent.choose_action(referee.observation().copy(), action_mask=referee.action_mask())
+        _, won = referee.play(action)
         print(f"{current_agent.player_name} joue en colonne {action}")
-        print_board(board)
-        if current_agent._check_win_from_position(board, row, action, channel):
+        print_board(referee.board)
+        if won:
             winner = current_agent.player_name
-        turn += 1
 
     if winner:
         print(f"{winner} a gagné la partie !")
@@ -0,0 +1,61 @@
+# test_solved_corpus.py
+# Tests du solveur de référence et des jeux de positions résolues
+
+import os
+import tempfile
+
+from agent2 import Agent as HybridAgent
+from referee import Referee
+from solved_corpus import ReferenceSolver, read_set, set_path, write_set
+
+
+def _moves(text):
+    return [int(ch) - 1 for ch in text]
+
+
+def test_reference_solver_known_scores():
+    # Positions de fin de partie des jeux de test classiques
+    solver = ReferenceSolver()
+    assert solver.solve(_moves("2252576253462244111563365343671351441")) == -1
+    assert solver.solve(_moves("7422341735647741166133573473242566")) == 1
+    print("test_reference_solver_known_scores: Passed")
+
+
+def test_write_read_roundtrip():
+    solved = [([3, 3, 4], 2, 0.0), ([0, 6], -1, 0.0), ([], 1, 0.0)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "set.txt")
+        write_set(path, solved)
+        assert list(read_set(path)) == [(moves, score) for moves, score, _ in solved]
+    print("test_write_read_roundtrip: Passed")
+
+
+def test_committed_end_set_is_consistent():
+    positions = list(read_set(set_path("end")))
+    assert positions
+    solver = ReferenceSolver()
+    for moves, score in positions[:5]:
+        assert solver.solve(moves) == score
+    print("test_committed_end_set_is_consistent: Passed")
+
+
+def test_hybrid_agent_keeps_the_draw():
+    # Fin de partie : la recherche atteint le plateau plein, qui doit valoir un nul
+    for text in ("67335264745362457655266752231244771431", "12172156341155235421422465464636737563"):
+        moves = _moves(text)
+        referee = Referee()
+        for col in moves:
+            referee.play(col)
+        assert ReferenceSolver().solve(moves + [2]) == 0
+        for _ in range(3):
+            action = HybridAgent(env=None).choose_action(referee.view(), action_mask=referee.action_mask())
+            assert action == 2, (text, action)
+    print("test_hybrid_agent_keeps_the_draw: Passed")
+
+
+if __name__ == "__main__":
+    test_reference_solver_known_scores()
+    test_write_read_roundtrip()
+    test_committed_end_set_is_consistent()
+    test_hybrid_agent_keeps_the_draw()
+    print("\nTous les tests solved_corpus sont passés !")
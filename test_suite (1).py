@@ -1,9 +1,10 @@
 import numpy as np
 import time
-import tracemalloc
 import random
 from smart_agent import SmartAgent
 from random_agent import RandomAgent
+from tournament import simulate_game, check_win
+from referee import Referee
 
 ROWS, COLS, CHANNELS = 6, 7, 2
 
@@ -106,48 +107,75 @@ def test_scenario_6_create_double_threat():
 
 # ------------------------------------------------------------------
 # TESTS DE PERFORMANCE
+# Latence p95 et fuites mémoire échantillonnées : voir test_performance.py
 # ------------------------------------------------------------------
 
-def test_time_per_move():
-    board = make_board()
-    agent = SmartAgent(env=None)
-    start = time.time()
-    play_and_get_action(agent, board)
-    elapsed = time.time() - start
-    assert elapsed < 0.1
-    print(f"test_time_per_move: Passed ({elapsed:.5f}s)")
-
-def test_memory_usage():
-    board = make_board()
-    agent = SmartAgent(env=None)
-    tracemalloc.start()
-    play_and_get_action(agent, board)
-    current, peak = tracemalloc.get_traced_memory()
-    tracemalloc.stop()
-    assert peak < 10_000_000  # < 10 MB
-    print(f"test_memory_usage: Passed (peak={peak/1e6:.2f} MB)")
+def test_referee_matches_full_scan():
+    # L'arbitre incrémental doit donner le même verdict que check_win sur tout le plateau
+    rng = random.Random(0)
+    for _ in range(200):
+        referee = Referee()
+        while not referee.is_over():
+            seat = referee.seat
+            col = rng.choice([c for c, ok in enumerate(referee.action_mask()) if ok])
+            _, won = referee.play(col)
+            assert won == check_win(referee.board, seat)
+    print("test_referee_matches_full_scan: Passed")
+
+def test_referee_observation_perspective():
+    referee = Referee()
+    referee.play(3)
+    obs = referee.observation()
+    assert obs[5, 3, 1] == 1 and obs[5, 3, 0] == 0  # le second joueur voit le pion adverse en channel 1
+    print("test_referee_observation_perspective: Passed")
+
+class SlowAgent(RandomAgent):
+    def choose_action(self, observation, **kwargs):
+        time.sleep(0.02)
+        return super().choose_action(observation, **kwargs)
+
+def test_move_timeout_forfeit():
+    slow = SlowAgent(player_name="SlowAgent")
+    smart = SmartAgent(env=None, player_name="SmartAgent")
+    winner, details = simulate_game(slow, smart, move_timeout=0.01, on_timeout="forfeit", return_details=True)
+    assert winner == "SmartAgent"
+    assert details["forfeit"] == "SlowAgent"
+    assert details["timeouts"] == [1, 0]
+    assert details["latency"][0].summary()["max"] >= 0.02
+    print("test_move_timeout_forfeit: Passed")
+
+def test_latency_kept_per_seat_with_shared_names():
+    # Auto-jeu : deux agents de même nom ne doivent pas fusionner leurs mesures
+    slow = SlowAgent(player_name="Agent")
+    fast = RandomAgent(player_name="Agent")
+    _, details = simulate_game(slow, fast, move_timeout=0.01, return_details=True)
+    assert details["timeouts"][0] == len(details["latency"][0]) > 0
+    assert details["timeouts"][1] == 0
+    assert details["latency"][1].summary()["max"] < 0.01
+    print("test_latency_kept_per_seat_with_shared_names: Passed")
+
+class StubbornAgent(RandomAgent):
+    def __init__(self, player_name, column):
+        super().__init__(player_name=player_name)
+        self.column = column
+
+    def choose_action(self, observation, **kwargs):
+        return self.column  # ignore le masque
+
+def test_illegal_move_forfeits():
+    # Colonne pleine : l'agent déterministe redemanderait le même coup indéfiniment
+    winner, details = simulate_game(StubbornAgent("A", 3), StubbornAgent("B", 3), return_details=True)
+    assert winner == "B" and details["forfeit"] == "A"
+    assert details["moves"] == [3] * 6 and details["illegal"] == [1, 0]
+    # Colonne hors du plateau
+    winner, details = simulate_game(RandomAgent(player_name="R"), StubbornAgent("C", 7), return_details=True)
+    assert winner == "R" and details["illegal"] == [0, 1] and len(details["moves"]) == 1
+    print("test_illegal_move_forfeits: Passed")
 
 # ------------------------------------------------------------------
 # TESTS CONTRE AGENT ALÉATOIRE
 # ------------------------------------------------------------------
 
-def simulate_game(agent1, agent2):
-    board = make_board()
-    turn = 0
-    while True:
-        current_agent = agent1 if turn % 2 == 0 else agent2
-        channel = 0 if turn % 2 == 0 else 1
-        action_mask = [(1 if board[0, c, 0] == 0 and board[0, c, 1] == 0 else 0) for c in range(COLS)]
-        if sum(action_mask) == 0:
-            return None
-        action = current_agent.choose_action(board.copy(), action_mask=action_mask)
-        row = 5 - list(reversed(board[:, action, 0] + board[:, action, 1])).index(0)
-        board[row, action, channel] = 1
-        if hasattr(current_agent, "_check_win_from_position"):
-            if current_agent._check_win_from_position(board, row, action, channel):
-                return current_agent.player_name
-        turn += 1
-
 def test_smart_vs_random(num_games=10):
     smart = SmartAgent(env=None, player_name="SmartAgent")
     rnd = RandomAgent(player_name="RandomAgent")
@@ -177,8 +205,11 @@ if __name__ == "__main__":
     test_scenario_5_avoid_losing_move()
     test_scenario_6_create_double_threat()
     print("\n=== TESTS DE PERFORMANCE ===")
-    test_time_per_move()
-    test_memory_usage()
+    test_move_timeout_forfeit()
+    test_latency_kept_per_seat_with_shared_names()
+    test_illegal_move_forfeits()
+    test_referee_matches_full_scan()
+    test_referee_observation_perspective()
     print("\n=== TESTS CONTRE AGENT ALÉATOIRE ===")
     test_smart_vs_random(num_games=10)
     print("\nTous les tests SmartAgent sont passés !")
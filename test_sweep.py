@@ -0,0 +1,42 @@
+# test_sweep.py
+# Tests du balayage de paramètres (agrégation et exécution en pool)
+
+import math
+
+from sweep import config_specs, run_sweep, summarize
+
+
+def test_config_specs():
+    specs = config_specs("minimax", ("depth", [2, 4]), fixed={"time_limit": 0.5})
+    assert specs == ["minimax:time_limit=0.5,depth=2", "minimax:time_limit=0.5,depth=4"]
+    print("test_config_specs: Passed")
+
+
+def test_summarize_branching_factor():
+    games = [
+        {"score": 1.0, "latency": [0.01, 0.02], "timeouts": 0, "searches": [(100, 2), (1000, 3)]},
+        {"score": 0.5, "latency": [0.03], "timeouts": 1, "searches": [(10000, 4)]},
+        {"score": 0.0, "latency": [0.04], "timeouts": 0, "searches": []},
+    ]
+    row = summarize("minimax:depth=4", games)
+    assert (row["wins"], row["draws"], row["losses"]) == (1, 1, 1)
+    assert row["score"] == 0.5 and row["score_low"] < 0.5 < row["score_high"]
+    assert row["timeouts"] == 1 and row["move_max"] == 0.04
+    assert math.isclose(row["branching_factor"], 10.0)
+    assert row["depth_mean"] == 3
+    print("test_summarize_branching_factor: Passed")
+
+
+def test_run_sweep_small_pool():
+    rows = run_sweep("minimax", ("depth", [1, 2]), opponent="random", games=4, workers=2)
+    assert [row["games"] for row in rows] == [4, 4]
+    for row in rows:
+        assert row["nodes_per_move"] > 0 and row["move_p95"] > 0
+    print("test_run_sweep_small_pool: Passed")
+
+
+if __name__ == "__main__":
+    test_config_specs()
+    test_summarize_branching_factor()
+    test_run_sweep_small_pool()
+    print("\nTous les tests sweep sont passés !")
@@ -0,0 +1,110 @@
+# test_variants.py
+# Tests des variantes : taille de plateau et nombre de pions à aligner
+
+import random
+
+import numpy as np
+import pytest
+
+import connect_four_env
+from agent_registry import make_agent
+from bitboard import STANDARD, BitBoard, board_geometry
+from referee import Referee
+from tournament import check_win, simulate_game
+
+VARIANTS = [(6, 7, 4), (7, 8, 4), (6, 7, 5), (8, 9, 5)]
+
+
+def expected_lines(rows, cols, n):
+    return ((cols - n + 1) * rows + (rows - n + 1) * cols
+            + 2 * max(0, rows - n + 1) * max(0, cols - n + 1))
+
+
+def test_geometry_tables():
+    assert STANDARD.win_steps == ((1, 2), (7, 14), (6, 12), (8, 16))
+    assert STANDARD.line_weights == (0, 1, 4, 32, 0)
+    assert STANDARD.center_order == (3, 2, 4, 1, 5, 0, 6)
+    for rows, cols, n in VARIANTS:
+        geometry = board_geometry(rows, cols, n)
+        assert geometry is board_geometry(rows, cols, n)  # tables partagées
+        assert len(geometry.win_lines) == expected_lines(rows, cols, n)
+        assert len(geometry.line_weights) == n + 1
+    assert board_geometry(7, 8, 4).center_order[:2] == (3, 4)
+    with pytest.raises(ValueError):
+        board_geometry(4, 4, 5)
+    print("test_geometry_tables: Passed")
+
+
+def test_has_won_matches_board_scan():
+    # 8 x 9 : 81 bits, au-delà d'un mot de 64 bits
+    rng = random.Random(5)
+    for rows, cols, n in VARIANTS:
+        geometry = board_geometry(rows, cols, n)
+        for _ in range(200):
+            referee = Referee(rows, cols, n)
+            while not referee.is_over():
+                referee.play(rng.choice([c for c, ok in enumerate(referee.action_mask()) if ok]))
+            for seat in (0, 1):
+                scanned = check_win(referee.board, seat, connect=n)
+                assert geometry.has_won(referee.stones[seat]) == scanned
+                assert (referee.winner == seat) <= scanned
+    print("test_has_won_matches_board_scan: Passed")
+
+
+def test_referee_and_bitboard_on_variant():
+    referee = Referee(rows=7, cols=8, connect=5)
+    assert referee.view().shape == (7, 8, 2) and len(referee.action_mask()) == 8
+    for col in (7, 0, 7, 0, 7, 0, 7, 0):
+        assert not referee.play(col)[1]  # quatre pions ne suffisent pas
+    state = BitBoard.from_observation(referee.view(), connect=5)
+    assert state.geometry is referee.geometry and state.ply == 8
+    assert state.is_winning_move(7) and not state.is_winning_move(3)
+    row, won = referee.play(7)
+    assert won and row == 2 and referee.winner == 0
+    print("test_referee_and_bitboard_on_variant: Passed")
+
+
+def test_agents_take_immediate_win_on_variant():
+    referee = Referee(rows=7, cols=8, connect=5)
+    for col in (1, 1, 2, 2, 3, 3, 4, 4):
+        referee.play(col)
+    for spec in ("smart", "minimax:depth=3", "search:time_limit=0.05", "hybrid", "mcts:time_limit=0.05"):
+        agent = make_agent(spec, connect=5)
+        action = agent.choose_action(referee.view(), action_mask=referee.action_mask())
+        assert action in (0, 5), (spec, action)
+    print("test_agents_take_immediate_win_on_variant: Passed")
+
+
+def test_full_games_on_variants():
+    for rows, cols, n in [(7, 8, 4), (6, 7, 5)]:
+        for spec in ("random", "smart", "minimax:depth=2", "search:time_limit=0.005",
+                     "hybrid:time_limit=0.005", "mcts:time_limit=0.005"):
+            first, second = make_agent(spec, connect=n), make_agent("smart", connect=n, player_name="S")
+            winner, details = simulate_game(first, second, rows=rows, cols=cols, connect=n, return_details=True)
+            referee = Referee(rows, cols, n)
+            for col in details["moves"]:
+                assert referee.is_legal(col)
+                referee.play(col)
+            assert (winner is None) == (referee.winner is None)
+    print("test_full_games_on_variants: Passed")
+
+
+def test_env_and_records_on_variant():
+    env = connect_four_env.env(rows=7, cols=8, connect=5)
+    env.reset()
+    obs, _, _, _, _ = env.last()
+    assert obs["observation"].shape == (7, 8, 2) and obs["action_mask"].dtype == np.int8
+    assert len(obs["action_mask"]) == 8
+    with pytest.raises(ValueError):
+        simulate_game(make_agent("random"), make_agent("random"), rows=7, cols=8, record_writer=object())
+    print("test_env_and_records_on_variant: Passed")
+
+
+if __name__ == "__main__":
+    test_geometry_tables()
+    test_has_won_matches_board_scan()
+    test_referee_and_bitboard_on_variant()
+    test_agents_take_immediate_win_on_variant()
+    test_full_games_on_variants()
+    test_env_and_records_on_variant()
+    print("\nTous les tests variantes sont passés !")
@@ -4,142 +4,349 @@ Tournament module for Connect 4
 This module allows to run a round-robin tournament between multiple agents.
 It includes:
 - simulate_game: simulate a single game between two agents
+- play_match: play a match between two agents with alternating colors
 - run_tournament: run multiple matches between all pairs of agents
 """
 
-import numpy as np
 import random
+import time
+from game_record import FIRST_WINS, SECOND_WINS, GameRecordWriter, result_code
+from latency import LatencyHistogram, format_summary
+from ratings import SPRT, bradley_terry, match_elo
+from referee import Referee
+from results_store import ResultsStore, agent_version
 from smart_agent import SmartAgent
 from random_agent import RandomAgent
 from minimax_agent import MinimaxAgent
 
 ROWS, COLS, CHANNELS = 6, 7, 2
+CONNECT = 4
 
 def get_next_row(board, col):
     """
     Find which row a piece would land in if dropped in column col.
 
     Parameters:
-        board: numpy array (6, 7, 2)
-        col: column index (0-6)
+        board: numpy array (rows, cols, 2), (6, 7, 2) for the standard game
+        col: column index
 
     Returns:
-        row index (0-5) if space available, None if column full
+        row index if space available, None if column full
     """
-    for row in range(5, -1, -1):  # commencer par le bas
+    for row in range(board.shape[0] - 1, -1, -1):  # commencer par le bas
         if board[row, col, 0] == 0 and board[row, col, 1] == 0:
             return row
     return None  # colonne pleine
 
-def check_win(board, channel):
+def check_win(board, channel, connect=CONNECT):
     """
-    Check if the given player has won (4 in a row/col/diagonal).
+    Check if the given player has won (`connect` in a row/col/diagonal).
 
     Parameters:
-        board: numpy array (6, 7, 2)
+        board: numpy array (rows, cols, 2)
         channel: 0 or 1 (player index)
+        connect: pieces to align
 
     Returns:
-        True if player has 4 connected pieces, False otherwise
+        True if player has `connect` connected pieces, False otherwise
     """
+    rows, cols = board.shape[0], board.shape[1]
     directions = [(0,1),(1,0),(1,1),(-1,1)]  # horizontal, vertical, diagonal
-    for r in range(ROWS):
-        for c in range(COLS):
+    for r in range(rows):
+        for c in range(cols):
             if board[r, c, channel] == 1:
                 for dr, dc in directions:
                     count = 1
                     # Vérifier dans le sens positif
                     rr, cc = r+dr, c+dc
-                    while 0<=rr<ROWS and 0<=cc<COLS and board[rr,cc,channel]==1:
+                    while 0<=rr<rows and 0<=cc<cols and board[rr,cc,channel]==1:
                         count += 1
                         rr += dr
                         cc += dc
                     # Vérifier dans le sens négatif
                     rr, cc = r-dr, c-dc
-                    while 0<=rr<ROWS and 0<=cc<COLS and board[rr,cc,channel]==1:
+                    while 0<=rr<rows and 0<=cc<cols and board[rr,cc,channel]==1:
                         count += 1
                         rr -= dr
                         cc -= dc
-                    if count >= 4:
+                    if count >= connect:
                         return True
     return False
 
-def simulate_game(agent1, agent2, verbose=False):
+def simulate_game(agent1, agent2, verbose=False, move_timeout=None, on_timeout="fallback", return_details=False,
+                  record_writer=None, rows=ROWS, cols=COLS, connect=CONNECT):
     """
     Simulate a single Connect 4 game between two agents.
 
     Parameters:
         agent1, agent2: agent instances
         verbose: whether to print moves
+        move_timeout: deadline in seconds for one choose_action call (None = no limit).
+            The call cannot be interrupted in-process, so the deadline is
+            enforced on the result: a late move is replaced or forfeited.
+        on_timeout: "fallback" plays a random legal move instead of the late one,
+            "forfeit" gives the game to the opponent
+            (an illegal move, full or nonexistent column, always forfeits)
+        return_details: also return the per-move latency data
+        record_writer: optional game_record.GameRecordWriter; the game is
+            appended to it as a packed record when it ends (standard board only)
+        rows, cols, connect: board size and alignment length of the variant
+            played; the agents must be built with the same connect
 
     Returns:
-        winner's name (str) if there is a winner, None for a draw
+        winner's name (str) if there is a winner, None for a draw.
+        With return_details=True, (winner, details) where details holds
+        "latency" [LatencyHistogram per seat], "timeouts" [count per seat],
+        "illegal" [count per seat] (indexed by seat, 0 = agent1, so two
+        agents sharing a name stay apart),
+        "forfeit" (name of the agent that forfeited or None) and "moves".
     """
-    board = np.zeros((ROWS, COLS, CHANNELS), dtype=int)
-    turn = 0
+    if on_timeout not in ("fallback", "forfeit"):
+        raise ValueError(f"on_timeout must be 'fallback' or 'forfeit', not {on_timeout!r}")
+    if record_writer is not None and (rows, cols, connect) != (ROWS, COLS, CONNECT):
+        raise ValueError("Game records only hold standard 6 x 7 games")
+    referee = Referee(rows, cols, connect)
     winner = None
+    latency = [LatencyHistogram(), LatencyHistogram()]  # par siège
+    timeouts = [0, 0]
+    illegal = [0, 0]
+    forfeit = None
+    moves = []
 
     while True:
-        current_agent = agent1 if turn % 2 == 0 else agent2
-        channel = 0 if turn % 2 == 0 else 1
+        current_agent = agent1 if referee.seat == 0 else agent2
 
         # Créer le masque des colonnes valides
-        action_mask = [1 if board[0, c, 0] == 0 and board[0, c, 1] == 0 else 0 for c in range(COLS)]
+        action_mask = referee.action_mask()
         if sum(action_mask) == 0:
             break  # match nul
 
-        # Choisir l'action via l'agent
-        action = current_agent.choose_action(board.copy(), action_mask=action_mask)
+        # Choisir l'action via l'agent (chronométré), plateau vu du joueur au trait
+        start = time.perf_counter()
+        action = current_agent.choose_action(referee.view(), action_mask=action_mask)
+        elapsed = time.perf_counter() - start
+        latency[referee.seat].record(elapsed)
 
-        # Trouver la ligne où placer le pion
-        row = get_next_row(board, action)
-        if row is None:
-            continue  # colonne pleine, ignorer le coup
-        board[row, action, channel] = 1
+        if move_timeout is not None and elapsed > move_timeout:
+            timeouts[referee.seat] += 1
+            if verbose:
+                print(f"{current_agent.player_name} dépasse le temps ({elapsed:.3f}s > {move_timeout:.3f}s)")
+            if on_timeout == "forfeit":
+                forfeit = current_agent.player_name
+                winner = (agent2 if current_agent is agent1 else agent1).player_name
+                break
+            action = random.choice([c for c in range(cols) if action_mask[c] == 1])
+
+        if not referee.is_legal(action):
+            # Redemander le coup bouclerait avec un agent déterministe : forfait
+            illegal[referee.seat] += 1
+            if verbose:
+                print(f"{current_agent.player_name} joue un coup illégal ({action}) et perd par forfait")
+            forfeit = current_agent.player_name
+            winner = (agent2 if current_agent is agent1 else agent1).player_name
+            break
+        _, won = referee.play(action)
+        moves.append(action)
 
         if verbose:
             print(f"{current_agent.player_name} joue colonne {action}")
 
-        # Vérifier la victoire
-        if check_win(board, channel):
+        # Vérifier la victoire (seules les lignes passant par le pion posé)
+        if won:
             winner = current_agent.player_name
             break
 
-        turn += 1
+    if record_writer is not None:
+        # Un forfait est enregistré comme une victoire de l'adversaire (le joueur au trait a abandonné)
+        winner_seat = referee.seat ^ 1 if forfeit is not None else referee.winner
+        record_writer.write(moves, result_code(winner_seat))
 
+    if return_details:
+        details = {"latency": latency, "timeouts": timeouts, "illegal": illegal, "forfeit": forfeit,
+                   "moves": moves}
+        return winner, details
     return winner
 
-def run_tournament(agents_dict, games_per_match=3, verbose=False):
+def play_match(A, B, games, verbose=False, move_timeout=None, on_timeout="fallback",
+               sprt=None, max_games=None, latency=None, timeouts=None, record_writer=None, store=None,
+               first_game=0):
+    """
+    Play games between A and B, alternating who moves first.
+
+    Parameters:
+        A, B: agent instances
+        games: number of games (minimum number when sprt is given)
+        sprt: optional (elo0, elo1) margin; the match then continues up to
+            max_games until both "A stronger" and "B stronger" SPRTs are decided
+        latency, timeouts: optional dicts {player_name: ...} to accumulate into
+        record_writer: optional GameRecordWriter receiving every game
+        store: optional results_store.ResultsStore; games already stored for
+            the same agents, versions, colours and seed are not replayed,
+            new games are stored as soon as they end
+        first_game: index of the first game; a later call with first_game =
+            previous number of games continues the same series (colours and
+            stored seeds) instead of repeating it
+
+    Returns:
+        (wins_A, draws, wins_B)
+    """
+    wins_a = draws = wins_b = 0
+    tests = None
+    if sprt is not None:
+        elo0, elo1 = sprt
+        tests = (SPRT(elo0, elo1), SPRT(elo0, elo1))  # A > B, B > A
+    limit = games if sprt is None else max(games, max_games or 10 * games)
+    versions = {A.player_name: agent_version(A), B.player_name: agent_version(B)} if store is not None else None
+
+    for g in range(first_game, first_game + limit):
+        # Alterner les couleurs pour neutraliser l'avantage du premier joueur
+        first, second = (A, B) if g % 2 == 0 else (B, A)
+        stored = None
+        if store is not None:
+            # Une graine par paire de parties : chaque graine est jouée avec les deux couleurs
+            key = (first.player_name, versions[first.player_name],
+                   second.player_name, versions[second.player_name], g // 2)
+            stored = store.get(*key)
+        if stored is not None:
+            result, _ = stored
+            winner = (first.player_name if result == FIRST_WINS
+                      else second.player_name if result == SECOND_WINS else None)
+            details = None
+        else:
+            outer_state = None
+            if store is not None:
+                # Les agents tirent dans le module random : graine de la partie, puis état d'origine rendu
+                outer_state = random.getstate()
+                random.seed(repr(key))
+            try:
+                winner, details = simulate_game(first, second, verbose=verbose, move_timeout=move_timeout,
+                                                on_timeout=on_timeout, return_details=True,
+                                                record_writer=record_writer)
+            finally:
+                if outer_state is not None:
+                    random.setstate(outer_state)
+            if store is not None:
+                seat = None if winner is None else (0 if winner == first.player_name else 1)
+                store.add(*key, details["moves"], result_code(seat), forfeit=details["forfeit"] is not None)
+        if winner == A.player_name:
+            wins_a += 1
+            score_a = 1.0
+        elif winner == B.player_name:
+            wins_b += 1
+            score_a = 0.0
+        else:
+            draws += 1
+            score_a = 0.5
+        for seat, agent in (enumerate((first, second)) if details is not None else ()):
+            if latency is not None:
+                latency[agent.player_name].merge(details["latency"][seat])
+            if timeouts is not None:
+                timeouts[agent.player_name] += details["timeouts"][seat]
+
+        if tests is not None:
+            tests[0].update(score_a)
+            tests[1].update(1.0 - score_a)
+            # Arrêter sur un nombre pair de parties pour garder l'équilibre des couleurs
+            played = g + 1 - first_game
+            if played >= games and played % 2 == 0 and tests[0].status() and tests[1].status():
+                break
+
+    return wins_a, draws, wins_b
+
+def print_report(scores, ratings, latency, timeouts, move_timeout=None):
+    """
+    Print final scores, the Bradley-Terry ranking and per-move latency.
+    """
+    print("\n===== Résultats finaux =====")
+    for name, score in scores.items():
+        print(f"{name}: {score} points")
+
+    print("\n===== Classement Elo (Bradley-Terry, IC 95%) =====")
+    for name in sorted(ratings, key=lambda n: ratings[n][0], reverse=True):
+        elo, low, high = ratings[name]
+        print(f"{name}: {elo:+.0f} [{low:+.0f}, {high:+.0f}]")
+
+    print("\n===== Temps par coup =====")
+    for player_name, histogram in latency.items():
+        line = format_summary(player_name, histogram.summary())
+        if move_timeout is not None:
+            line += f", {timeouts[player_name]} dépassement(s)"
+        print(line)
+
+def run_tournament(agents_dict, games_per_match=3, verbose=False, move_timeout=None, on_timeout="fallback",
+                   sprt=None, max_games_per_match=None, return_ratings=False, record_path=None,
+                   results_path=None):
     """
     Run a round-robin tournament between all agents.
 
     Parameters:
         agents_dict: dict {agent_name: agent_instance}
-        games_per_match: number of games per match
+        games_per_match: number of games per match (minimum when sprt is set)
         verbose: whether to print game moves
+        move_timeout, on_timeout: per-move deadline, see simulate_game
+        sprt: optional (elo0, elo1) Elo margin to stop a match once settled, see play_match
+        max_games_per_match: game cap per match when sprt is set (default 10 * games_per_match)
+        return_ratings: also return the Bradley-Terry ratings
+        record_path: optional file to which every game is appended as a
+            packed record (see game_record)
+        results_path: optional SQLite results store (see results_store); only
+            the games missing from it are played, so an interrupted or
+            extended tournament resumes instead of starting over, and the
+            standings are recomputed from every stored game of these agents
 
     Returns:
-        dict of scores {agent_name: points}
+        dict of scores {agent_name: points} (win = 1, draw = 0.5).
+        With return_ratings=True, (scores, ratings, pair_results) where
+        ratings is {agent_name: (elo, low, high)} and pair_results is
+        {(name_a, name_b): (wins_a, draws, wins_b)}.
     """
     scores = {name: 0 for name in agents_dict.keys()}
     names = list(agents_dict.keys())
+    latency = {agent.player_name: LatencyHistogram() for agent in agents_dict.values()}
+    timeouts = {agent.player_name: 0 for agent in agents_dict.values()}
+    pair_results = {}
+    record_writer = GameRecordWriter(record_path) if record_path is not None else None
+    store = ResultsStore(results_path) if results_path is not None else None
 
     # Chaque paire d'agents s'affronte
-    for i in range(len(names)):
-        for j in range(i + 1, len(names)):
-            A = agents_dict[names[i]]
-            B = agents_dict[names[j]]
+    try:
+        for i in range(len(names)):
+            for j in range(i + 1, len(names)):
+                A = agents_dict[names[i]]
+                B = agents_dict[names[j]]
 
-            print(f"\n===== Match {names[i]} vs {names[j]} =====")
-            for g in range(games_per_match):
-                winner = simulate_game(A, B, verbose=verbose)
-                if winner:
-                    scores[winner] += 1
+                print(f"\n===== Match {names[i]} vs {names[j]} =====")
+                wins_a, draws, wins_b = play_match(A, B, games_per_match, verbose=verbose, move_timeout=move_timeout,
+                                                   on_timeout=on_timeout, sprt=sprt, max_games=max_games_per_match,
+                                                   latency=latency, timeouts=timeouts, record_writer=record_writer,
+                                                   store=store)
+                pair_results[(names[i], names[j])] = (wins_a, draws, wins_b)
+                scores[names[i]] += wins_a + 0.5 * draws
+                scores[names[j]] += wins_b + 0.5 * draws
+                elo, low, high = match_elo(wins_a, draws, wins_b)
+                print(f"{wins_a + draws + wins_b} parties : +{wins_a} ={draws} -{wins_b}, "
+                      f"Elo {names[i]} - {names[j]} = {elo:.0f} [{low:.0f}, {high:.0f}]")
+        if store is not None:
+            # Classement recalculé sur toutes les parties stockées (runs précédents compris)
+            versions = {agent.player_name: agent_version(agent) for agent in agents_dict.values()}
+            key_of = {agent.player_name: name for name, agent in agents_dict.items()}
+            stored = {(key_of[a], key_of[b]): result for (a, b), result in store.pair_results(versions).items()}
+            pair_results = {pair: stored.get(pair, result) for pair, result in pair_results.items()}
+            scores = {name: 0 for name in names}
+            for (a, b), (wins_a, draws, wins_b) in pair_results.items():
+                scores[a] += wins_a + 0.5 * draws
+                scores[b] += wins_b + 0.5 * draws
+    finally:
+        if record_writer is not None:
+            record_writer.close()
+        if store is not None:
+            store.close()
 
-    print("\n===== Résultats finaux =====")
-    for name, score in scores.items():
-        print(f"{name}: {score} points")
+    ratings = bradley_terry(pair_results)
+    print_report(scores, ratings, latency, timeouts, move_timeout)
 
+    if return_ratings:
+        return scores, ratings, pair_results
     return scores
 
 if __name__ == "__main__":